@@ -0,0 +1,50 @@
+"""Searching an archive of saved cause lists for one case: decode and parse every file vs the
+byte-level prefilter of search-archive.
+
+    python benchmarks/bench_archive_search.py [FILES] [ROWS_PER_LIST]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ecourts_scraper.archivesearch import search_archives  # noqa: E402
+from ecourts_scraper.scraper import parse_cause_list_rows, row_matches  # noqa: E402
+
+
+def _list(n, seed):
+    rows = ''.join(f'<tr><td>{i}</td><td>Cr. {seed * n + i}/2024</td><td>Party {seed}-{i} vs State</td>'
+                   f'<td>Court No. {i % 12}</td></tr>' for i in range(1, n + 1))
+    return f'<table><tr><th>S.No</th><th>Case</th><th>Parties</th><th>Court</th></tr>{rows}</table>'.encode()
+
+
+def full_parse(paths, query):
+    found = 0
+    for path in paths:
+        with open(path, 'rb') as f:
+            found += sum(row_matches(query, r.cols) for r in parse_cause_list_rows(f.read()))
+    return found
+
+
+if __name__ == '__main__':
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(files):
+            paths.append(os.path.join(tmp, f'causelist_{i}.html'))
+            with open(paths[-1], 'wb') as f:
+                f.write(_list(rows, i))
+        size = sum(os.path.getsize(p) for p in paths)
+        query = f'Cr. {(files // 2) * rows + 7}/2024'
+        t = time.perf_counter()
+        expected = full_parse(paths, query)
+        t_parse = time.perf_counter() - t
+        t = time.perf_counter()
+        found = sum(len(r['rows']) for r in search_archives(paths, query, workers=0))
+        t_scan = time.perf_counter() - t
+        assert found == expected == 1
+    print(f'{files} lists ({size / 1e6:.0f} MB), one process: parse everything {t_parse:.2f}s vs '
+          f'prefilter {t_scan:.2f}s ({t_parse / t_scan:.0f}x)')
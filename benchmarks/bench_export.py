@@ -0,0 +1,68 @@
+"""Cases per court per day over a month of stored cause lists: re-parsing the HTML in Python
+loops vs one group_by over the columnar export (requires pyarrow).
+
+    python benchmarks/bench_export.py [LISTS_PER_DAY] [ROWS_PER_LIST]
+"""
+import collections
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ecourts_scraper.export import ColumnarExport, read_export, store_sources  # noqa: E402
+from ecourts_scraper.scraper import parse_cause_list_rows  # noqa: E402
+from ecourts_scraper.store import CauseListStore  # noqa: E402
+from ecourts_scraper.utils import open_archive, read_archive  # noqa: E402
+
+
+def _list(n, seed):
+    rows = ''.join(f'<tr><td>{i}</td><td>Cr. {seed * n + i}/2024</td><td>State vs Accused {i}</td>'
+                   f'<td>Court No. {i % 12}</td></tr>' for i in range(1, n + 1))
+    return f'<table><tr><th>S.No</th><th>Case</th><th>Parties</th><th>Court</th></tr>{rows}</table>'.encode()
+
+
+def build_store(root, days, per_day, rows):
+    store = CauseListStore(root)
+    start = datetime.date(2025, 10, 1)
+    for d in range(days):
+        for c in range(per_day):
+            path = store.path_for(start + datetime.timedelta(days=d), '8', '26', str(c))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open_archive(path, 'wb') as f:
+                f.write(_list(rows, d * per_day + c))
+    return store
+
+
+def reparse(store):
+    counts = collections.Counter()
+    for date, _, path in store.entries():
+        for row in parse_cause_list_rows(read_archive(path)):
+            counts[(date, row.court)] += 1
+    return counts
+
+
+def columnar(out):
+    table = read_export(out, columns=['date', 'court', 'serial'])
+    return table.group_by(['date', 'court']).aggregate([('serial', 'count')])
+
+
+if __name__ == '__main__':
+    per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        store = build_store(os.path.join(tmp, 'store'), 30, per_day, rows)
+        total = 30 * per_day * rows
+        t = time.perf_counter()
+        ColumnarExport(os.path.join(tmp, 'out')).add(store_sources(store))
+        t_export = time.perf_counter() - t
+        t = time.perf_counter()
+        groups = len(reparse(store))
+        t_reparse = time.perf_counter() - t
+        t = time.perf_counter()
+        assert columnar(os.path.join(tmp, 'out')).num_rows == groups
+        t_columnar = time.perf_counter() - t
+    print(f'{total} rows in {30 * per_day} lists: one-off export {t_export:.2f}s; per query: '
+          f're-parse {t_reparse:.2f}s vs columnar {t_columnar:.3f}s ({t_reparse / t_columnar:.0f}x)')
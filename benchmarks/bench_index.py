@@ -0,0 +1,86 @@
+"""Fuzzy party-name search over a year of stored cause lists: a linear scan that re-parses every
+list (what search-causelist does per file) vs the trigram index.
+
+    python benchmarks/bench_index.py [LISTS_PER_DAY] [ROWS_PER_LIST]
+"""
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ecourts_scraper.export import store_sources  # noqa: E402
+from ecourts_scraper.index import CauseListIndex, words, similarity  # noqa: E402
+from ecourts_scraper.scraper import parse_cause_list_rows  # noqa: E402
+from ecourts_scraper.store import CauseListStore  # noqa: E402
+from ecourts_scraper.utils import open_archive, read_archive  # noqa: E402
+
+FIRST = ['Ramesh', 'Suresh', 'Anita', 'Sunita', 'Mohammad', 'Rajendra', 'Pooja', 'Vikram', 'Lakshmi', 'Arjun',
+         'Kavita', 'Manoj', 'Priya', 'Sanjay', 'Deepak', 'Geeta', 'Harish', 'Imran', 'Jyoti', 'Naveen']
+LAST = ['Kumar', 'Sharma', 'Singh', 'Yadav', 'Gupta', 'Verma', 'Khan', 'Prasad', 'Mishra', 'Choudhary',
+        'Pandey', 'Tiwari', 'Reddy', 'Nair', 'Iyer', 'Das', 'Ansari', 'Jha', 'Thakur', 'Mehta']
+
+
+def _name(rng):
+    # a few thousand distinct surnames, as in a real district's lists
+    return f'{rng.choice(FIRST)} {rng.choice(LAST)}{rng.choice(["", "a", "i", "wal", "ji"])}{rng.randrange(150) or ""}'
+
+
+def _list(n, rng):
+    rows = ''.join(f'<tr><td>{i}</td><td>Cr. {rng.randrange(99999)}/2024</td><td>{_name(rng)} vs {_name(rng)}</td>'
+                   f'<td>Adv. {_name(rng)}</td><td>Court No. {i % 12}</td></tr>' for i in range(1, n + 1))
+    return (f'<table><tr><th>S.No</th><th>Case</th><th>Parties</th><th>Advocate</th><th>Court</th></tr>'
+            f'{rows}</table>').encode()
+
+
+def build_store(root, days, per_day, rows):
+    rng = random.Random(1)
+    store = CauseListStore(root)
+    start = datetime.date(2025, 1, 1)
+    for d in range(days):
+        for c in range(per_day):
+            path = store.path_for(start + datetime.timedelta(days=d), '8', '26', str(c))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open_archive(path, 'wb') as f:
+                f.write(_list(rows, rng))
+    return store
+
+
+def scan(store, query):
+    qwords = words(query)
+    hits = 0
+    for _, _, path in store.entries():
+        for row in parse_cause_list_rows(read_archive(path)):
+            rw = words(' '.join(row.cols))
+            if all(any(similarity(q, w) >= 0.35 for w in rw) for q in qwords):
+                hits += 1
+    return hits
+
+
+if __name__ == '__main__':
+    per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    with tempfile.TemporaryDirectory() as tmp:
+        store = build_store(os.path.join(tmp, 'store'), 365, per_day, rows)
+        index = CauseListIndex(os.path.join(tmp, 'index.db'))
+        t = time.perf_counter()
+        index.add(store_sources(store))
+        t_index = time.perf_counter() - t
+        queries = ['Rmesh Kumaar', 'sunita yadv', 'imraan ansari', 'lakshmi iyer']
+        t = time.perf_counter()
+        for q in queries:
+            index.search(q, limit=20)
+        t_query = (time.perf_counter() - t) / len(queries)
+        t = time.perf_counter()
+        index.search('Rmesh Kumaar', date_from='2025-06-01', date_to='2025-06-30', limit=20)
+        t_filtered = time.perf_counter() - t
+        t = time.perf_counter()
+        scan(store, queries[0])
+        t_scan = time.perf_counter() - t
+        stats = index.stats()
+    print(f"{stats['rows']} rows in {stats['sources']} lists, {stats['terms']} distinct words: one-off index "
+          f"{t_index:.1f}s; per query: scan {t_scan:.2f}s vs index {t_query * 1000:.0f} ms "
+          f"({t_filtered * 1000:.0f} ms for one month)")
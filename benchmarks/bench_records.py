@@ -0,0 +1,50 @@
+"""Memory of N parsed cause-list rows as dicts (old representation) vs CauseListRow records.
+
+    python benchmarks/bench_records.py [N]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ecourts_scraper.models import CauseListRow  # noqa: E402
+
+
+def _cells(i):
+    # court names and serial numbers repeat across lists; case numbers and parties don't
+    return [str(i % 300 + 1), f'Court No. {i % 40} - Addl. Sessions Judge', f'Cr. {i}/2024',
+            f'State vs Accused {i}']
+
+
+def measure(build, n):
+    tracemalloc.start()
+    rows = build(n)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return current
+
+
+def as_dicts(n):
+    out = []
+    for i in range(n):
+        cols = _cells(i)
+        out.append({'cols': cols, 'serial': cols[0], 'court': cols[1], 'pdf': None, 'links': []})
+    return out
+
+
+def as_records(n):
+    out = []
+    for i in range(n):
+        cols = _cells(i)
+        out.append(CauseListRow.make(cols, cols[0], cols[1], None, ()))
+    return out
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    d = measure(as_dicts, n)
+    r = measure(as_records, n)
+    print(f'{n} rows: dicts {d / 1e6:.1f} MB, records {r / 1e6:.1f} MB '
+          f'({(1 - r / d) * 100:.0f}% less, {d / n:.0f} -> {r / n:.0f} bytes/row)')
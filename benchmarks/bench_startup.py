@@ -0,0 +1,34 @@
+"""Cold-start time of the CLI, the web API module and a parse worker, in fresh interpreters.
+
+    python benchmarks/bench_startup.py [RUNS]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+CASES = [
+    ('interpreter', ['-c', 'pass']),
+    ('cli --help', ['-m', 'ecourts_scraper.cli', '--help']),
+    ('import webapi', ['-c', 'import ecourts_scraper.webapi']),
+    ('parse worker', ['-c', 'import ecourts_scraper.pipeline']),
+]
+
+
+def measure(args, runs):
+    times = []
+    for _ in range(runs):
+        t = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, stdout=subprocess.DEVNULL, check=True,
+                       env=dict(os.environ, ECOURTS_NO_DAEMON='1'))
+        times.append(time.perf_counter() - t)
+    return statistics.median(times)
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for name, args in CASES:
+        print(f'{name:<16} {measure(args, runs) * 1000:7.1f} ms (median of {runs})')
@@ -0,0 +1,212 @@
+"""Search archived cause lists with a byte-level prefilter before any parsing.
+
+Most archived lists don't contain the query at all, so parsing every one of them is wasted
+work. Instead each file is memory-mapped (compressed archives are decompressed first) and
+scanned for the query's fragments. These are the lower-cased words of the query, also split at
+the characters HTML may hold as entities (& < > " ') and at non-ASCII letters with case forms.
+The scan ignores ASCII case and lowers one chunk at a time. A file missing any fragment is
+rejected without being decoded. In the rest, only the table rows around each occurrence of the
+longest fragment (with the header row before them) are decoded and parsed, then checked with
+the same matching rule as search-causelist.
+
+Scans run in the parse process pool. Every worker maps the files read-only, so they share the
+page cache instead of copying file contents into each process, and only matching rows are
+sent back.
+"""
+import contextlib
+import mmap
+import os
+import re
+from concurrent.futures import as_completed
+from typing import Optional, Dict, Any, Iterable, Iterator, List
+
+from .pipeline import parse_pool
+from .scraper import parse_cause_list_rows, row_matches
+from .utils import read_archive
+
+CHUNK = 1 << 20
+# how far from an occurrence to look for the start/end of its table row
+ROW_WINDOW = 16 * 1024
+# above this many rows to decode, parsing the whole list is cheaper
+MAX_REGIONS = 256
+_SPLIT = re.compile(r'[\s&<>"\']+')
+_ARCHIVE_NAME = re.compile(r'\.html?(\.gz|\.zst)?$', re.I)
+
+
+def _caseless(ch: str) -> str:
+    # the scan only lowers ASCII, so letters with other case forms can't be looked for as bytes
+    return ch if ch < '\x80' or ch.lower() == ch.upper() else ' '
+
+
+def query_pieces(query: str) -> List[bytes]:
+    """Lower-cased UTF-8 fragments any file matching query must contain, longest first.
+
+    Non-ASCII letters that have case forms ('É', 'ß') split the query instead of being part of
+    a fragment: the file may hold them in another case, and the scan only folds ASCII.
+    """
+    parts = [p for p in _SPLIT.split(''.join(map(_caseless, query.lower()))) if p]
+    longer = [p for p in parts if len(p) > 1]
+    return sorted({p.encode('utf-8') for p in (longer or parts)}, key=lambda p: (-len(p), p))
+
+
+def ifind_all(buf, needle: bytes) -> Iterator[int]:
+    """Offsets of lower-case needle in buf (bytes or mmap), ignoring ASCII case."""
+    overlap = max(0, len(needle) - 1)
+    for pos in range(0, len(buf), CHUNK):
+        chunk = buf[pos:pos + CHUNK + overlap].lower()
+        i = chunk.find(needle)
+        # occurrences starting in the overlap are found again in the next chunk
+        while i != -1 and i < CHUNK:
+            yield pos + i
+            i = chunk.find(needle, i + 1)
+
+
+def _contains(buf, needle: bytes) -> bool:
+    return next(ifind_all(buf, needle), None) is not None
+
+
+def _tag_at(text: bytes, i: int, tag: bytes) -> bool:
+    """True if text[i:] starts the tag (not a longer name: '<tr' but not '<track')."""
+    nxt = text[i + len(tag):i + len(tag) + 1]
+    return text.startswith(tag, i) and (not nxt or nxt in b' \t\r\n>/')
+
+
+def _rfind_tag(text: bytes, tag: bytes, end: Optional[int]=None) -> int:
+    i = text.rfind(tag, 0, end)
+    while i != -1 and not _tag_at(text, i, tag):
+        i = text.rfind(tag, 0, i)
+    return i
+
+
+def row_region(buf, pos: int):
+    """(start, end) of the table row holding offset pos, or None if pos is outside any row.
+
+    A row longer than ROW_WINDOW makes the region the whole of buf.
+    """
+    lo = max(0, pos - ROW_WINDOW)
+    before = buf[lo:pos].lower()
+    start = _rfind_tag(before, b'<tr')
+    if start == -1:
+        return (0, len(buf)) if lo else None
+    if max(_rfind_tag(before, b'</tr'), _rfind_tag(before, b'</table')) > start:
+        return None
+    after = buf[pos:pos + ROW_WINDOW].lower()
+    ends = [i for i in (after.find(b'</tr'), after.find(b'<tr'), after.find(b'</table')) if i != -1]
+    if not ends:
+        return (0, len(buf)) if pos + len(after) < len(buf) else (lo + start, len(buf))
+    return lo + start, pos + min(ends)
+
+
+def _header(buf, start: int) -> bytes:
+    """The last header (<th>) row before offset start, or b''."""
+    th = max(buf.rfind(b'<th', 0, start), buf.rfind(b'<TH', 0, start))
+    while th != -1 and buf[th + 3:th + 4] not in (b' ', b'>', b'\t', b'\r', b'\n'):  # <thead>
+        th = max(buf.rfind(b'<th', 0, th), buf.rfind(b'<TH', 0, th))
+    if th == -1:
+        return b''
+    lo = max(0, th - ROW_WINDOW)
+    tr = _rfind_tag(buf[lo:th].lower(), b'<tr')
+    end = buf[th:start].lower().find(b'</tr')
+    return buf[lo + tr if tr != -1 else th:th + end if end != -1 else start]
+
+
+def scan(buf, query: str, pieces: Optional[List[bytes]]=None) -> Dict[str, Any]:
+    """Rows of buf (raw cause-list bytes or an mmap of them) matching query.
+
+    Returns {'candidate': bool, 'regions': rows decoded, 'rows': [CauseListRow],
+    'text_match': bool}. text_match is set for a page without a table that contains the query
+    (the plain-text fallback of search-causelist).
+    """
+    pieces = query_pieces(query) if pieces is None else pieces
+    out = {'candidate': False, 'regions': 0, 'rows': [], 'text_match': False}
+    if not all(_contains(buf, p) for p in pieces):
+        return out
+    out['candidate'] = True
+    regions = {}
+    for pos in ifind_all(buf, pieces[0]) if pieces else ():
+        region = row_region(buf, pos)
+        if region is not None and region[0] not in regions:
+            regions[region[0]] = region[1]
+        if len(regions) > MAX_REGIONS or region == (0, len(buf)):
+            break
+    if not pieces or len(regions) > MAX_REGIONS or regions.get(0) == len(buf):
+        # nothing to anchor on, or matches everywhere: parse the whole list once
+        regions = {0: len(buf)}
+    if not regions:
+        if not _contains(buf, b'<tr'):
+            text = buf[:].decode('utf-8', errors='replace')
+            out['text_match'] = query in text or query.lower() in text.lower()
+        return out
+    for start, end in sorted(regions.items()):
+        out['regions'] += 1
+        head = _header(buf, start) if start else b''
+        for row in parse_cause_list_rows(head + buf[start:end]):
+            if row_matches(query, row.cols):
+                out['rows'].append(row)
+    return out
+
+
+@contextlib.contextmanager
+def mapped(path: str):
+    """The content of an archived file: raw files are memory-mapped, compressed ones decompressed."""
+    with open(path, 'rb') as f:
+        head = f.read(4)
+        if not os.fstat(f.fileno()).st_size:
+            yield b''
+        elif head[:2] == b'\x1f\x8b' or head == b'\x28\xb5\x2f\xfd':  # gzip / zstd
+            yield read_archive(path)
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                yield buf
+
+
+def scan_file(path: str, query: str) -> Dict[str, Any]:
+    with mapped(path) as buf:
+        res = scan(buf, query)
+    res.update(path=path, bytes=os.path.getsize(path))
+    return res
+
+
+def scan_files(paths: List[str], query: str) -> List[Dict[str, Any]]:
+    """Worker-process task: scan_file() for a batch of paths (errors are returned, not raised)."""
+    out = []
+    for path in paths:
+        try:
+            out.append(scan_file(path, query))
+        except Exception as e:
+            out.append({'path': path, 'error': str(e)})
+    return out
+
+
+def file_may_contain(path: str, query: str) -> bool:
+    """False only if the file cannot contain a match for query (so it needn't be parsed)."""
+    with mapped(path) as buf:
+        return all(_contains(buf, p) for p in query_pieces(query))
+
+
+def archive_files(paths: Iterable[str]) -> Iterator[str]:
+    """Files to search: paths as given, and the saved .html(.gz/.zst) lists under directories."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if _ARCHIVE_NAME.search(name):
+                    yield os.path.join(root, name)
+
+
+def search_archives(paths: Iterable[str], query: str, workers: Optional[int]=None,
+                    batch: int = 64) -> Iterator[Dict[str, Any]]:
+    """Yield scan results ({'path', 'rows', ...} or {'path', 'error'}) for every file, in
+    completion order. workers=0 scans inline; otherwise batches of files go to the parse pool."""
+    paths = list(paths)
+    if workers == 0:
+        for i in range(0, len(paths), batch):
+            yield from scan_files(paths[i:i + batch], query)
+        return
+    pool = parse_pool(workers)
+    futures = [pool.submit(scan_files, paths[i:i + batch], query) for i in range(0, len(paths), batch)]
+    for fut in as_completed(futures):
+        yield from fut.result()
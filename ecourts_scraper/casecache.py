@@ -0,0 +1,140 @@
+"""On-disk cache of case status lookups with freshness derived from the listing itself.
+
+A case's status only changes around its hearings, so each cached result gets a TTL from what it
+says: minutes when the next hearing is today or tomorrow (or has just passed), hours when it is
+within a week, up to a day for later hearings (expiring before the run-up to the hearing) and a
+week for disposed cases. Past the TTL an entry may still be served for as long again while it is
+refreshed in the background (stale-while-revalidate).
+"""
+import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Optional, Dict, Any
+
+from .models import CaseListing
+from .utils import json_default
+
+MINUTE, HOUR, DAY = 60, 3600, 86400
+
+_NEXT_KEY = re.compile(r'next.*(date|hearing)|(date|hearing).*next', re.I)
+_NEXT_TEXT = re.compile(r'next\s*(hearing\s*)?(date|hearing)?\s*[:\-]?\s*(.{6,30})', re.I)
+_DISPOSED = re.compile(r'\bdisposed\b|\bcase\s+(closed|decided)\b', re.I)
+_NUMERIC_DATE = re.compile(r'(\d{1,2})[-/.](\d{1,2})[-/.](\d{4})|(\d{4})-(\d{2})-(\d{2})')
+_WORD_DATE = re.compile(r'(\d{1,2})(?:st|nd|rd|th)?\s+([A-Za-z]{3,9}),?\s+(\d{4})')
+
+
+def parse_date(text: str) -> Optional[datetime.date]:
+    """First date in text: dd-mm-yyyy (also / or .), yyyy-mm-dd or '20th October 2025'."""
+    m = _NUMERIC_DATE.search(text)
+    try:
+        if m and m.group(1):
+            return datetime.date(int(m.group(3)), int(m.group(2)), int(m.group(1)))
+        if m:
+            return datetime.date(int(m.group(4)), int(m.group(5)), int(m.group(6)))
+    except ValueError:
+        return None
+    m = _WORD_DATE.search(text)
+    if m:
+        for fmt in ('%d %B %Y', '%d %b %Y'):
+            try:
+                return datetime.datetime.strptime(f'{m.group(1)} {m.group(2)} {m.group(3)}', fmt).date()
+            except ValueError:
+                continue
+    return None
+
+
+def _texts(listing):
+    raw = listing.raw if isinstance(listing.raw, dict) else {}
+    for k, v in raw.items():
+        yield str(k), str(v)
+    for row in listing.rows or ():
+        yield '', ' '.join(row)
+    for line in listing.text_rows or ():
+        yield '', line
+
+
+def hearing_info(listing) -> Dict[str, Any]:
+    """{'next_hearing': date or None, 'disposed': bool} read from a CaseListing."""
+    nxt, disposed = None, False
+    for key, text in _texts(listing):
+        if _DISPOSED.search(text) or (key and _DISPOSED.search(key)):
+            disposed = True
+        if nxt is None:
+            if key and _NEXT_KEY.search(key):
+                nxt = parse_date(text)
+            else:
+                m = _NEXT_TEXT.search(text)
+                nxt = parse_date(m.group(3)) if m else None
+    return {'next_hearing': nxt, 'disposed': disposed}
+
+
+def case_ttl(listing, today: Optional[datetime.date]=None) -> float:
+    """Seconds a lookup result stays fresh."""
+    info = hearing_info(listing)
+    if info['disposed']:
+        return 7 * DAY
+    nxt = info['next_hearing']
+    if nxt is None:
+        return HOUR
+    days = (nxt - (today or datetime.date.today())).days
+    if days <= 1:
+        # hearing today/tomorrow, or just held and the outcome not published yet
+        return 15 * MINUTE
+    if days <= 7:
+        return 2 * HOUR
+    # refresh at least daily, and in time for the run-up to the hearing
+    return min(DAY, (days - 2) * DAY)
+
+
+def case_key(cnr: Optional[str]=None, case_type=None, number=None, year=None) -> str:
+    if cnr:
+        return 'cnr/' + re.sub(r'[\s-]', '', str(cnr)).upper()
+    return f'details/{str(case_type).strip().upper()}/{int(number)}/{int(year)}'
+
+
+class CaseCache:
+    """Results stored as JSON under <root>/<hash[:2]>/<hash>.json; the root defaults to
+    $ECOURTS_CASE_CACHE."""
+
+    def __init__(self, root: Optional[str]=None, stale_factor: float = 1.0):
+        self.root = root or os.environ.get('ECOURTS_CASE_CACHE') or '.ecourts_cases'
+        self.stale_factor = stale_factor
+
+    def path_for(self, key: str) -> str:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.root, digest[:2], digest + '.json')
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """{'key', 'fetched', 'ttl', 'result': CaseListing} or None."""
+        try:
+            with open(self.path_for(key), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        result = entry['result']
+        if result.get('rows'):
+            result['rows'] = [tuple(r) for r in result['rows']]
+        entry['result'] = CaseListing.make(**result)
+        return entry
+
+    def put(self, key: str, result, ttl: float):
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {'key': key, 'fetched': time.time(), 'ttl': ttl, 'result': result}
+        # one temporary name per writer: threads and processes may refresh the same case at once
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.part'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, default=json_default, ensure_ascii=False)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def stale_window(self, ttl: float) -> float:
+        return ttl * self.stale_factor
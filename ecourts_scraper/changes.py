@@ -0,0 +1,96 @@
+"""Per-row fingerprints and snapshot diffs for repeatedly fetched cause lists.
+
+A snapshot records the hash of the raw list plus, per row, a stable key (the row without its
+serial/court cells), the serial, the court and a fingerprint of the full row. Comparing two
+snapshots yields cases that were added, removed or moved (same case, new serial or court).
+"""
+import hashlib
+import os
+from typing import Dict, Any, Iterable, Optional
+
+from .utils import open_archive, load_json, save_json
+
+SNAPSHOT_VERSION = 1
+
+
+def _digest(parts) -> str:
+    return hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=12).hexdigest()
+
+
+def file_hash(path: str, chunk_size: int = 1024*64) -> str:
+    """Hash of the (decompressed) content of an archived cause list."""
+    h = hashlib.blake2b(digest_size=16)
+    with open_archive(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def row_key(row: Dict[str, Any]) -> str:
+    """Identity of the listed case: the row's cells minus its serial and court cells."""
+    cols = list(row['cols'])
+    for field in ('serial', 'court'):
+        value = row.get(field)
+        if value is not None and value in cols:
+            cols.remove(value)
+    return _digest(cols)
+
+
+def row_fingerprint(row: Dict[str, Any]) -> str:
+    return _digest(row['cols'])
+
+
+def build_snapshot(rows: Iterable[Dict[str, Any]], list_hash: Optional[str]=None) -> Dict[str, Any]:
+    """Snapshot of parsed rows: {'version', 'list_hash', 'rows': {key: {...}}}.
+
+    Repeated keys (the same case listed twice) get an occurrence suffix so both are tracked.
+    """
+    entries = {}
+    for row in rows:
+        base = row_key(row)
+        key = base
+        n = 1
+        while key in entries:
+            n += 1
+            key = f'{base}#{n}'
+        entries[key] = {'serial': row.get('serial'), 'court': row.get('court'),
+                        'fp': row_fingerprint(row), 'cols': row['cols']}
+    return {'version': SNAPSHOT_VERSION, 'list_hash': list_hash, 'rows': entries}
+
+
+def diff_snapshots(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Compare two snapshots. Returns {'added': [...], 'removed': [...], 'moved': [...], 'changed': [...]}."""
+    old_rows = (old or {}).get('rows', {})
+    new_rows = new.get('rows', {})
+    added = [dict(v, key=k) for k, v in new_rows.items() if k not in old_rows]
+    removed = [dict(v, key=k) for k, v in old_rows.items() if k not in new_rows]
+    moved = []
+    changed = []
+    for k, v in new_rows.items():
+        prev = old_rows.get(k)
+        if prev is None or prev['fp'] == v['fp']:
+            continue
+        if (prev['serial'], prev['court']) != (v['serial'], v['court']):
+            moved.append({'key': k, 'cols': v['cols'],
+                          'from': {'serial': prev['serial'], 'court': prev['court']},
+                          'to': {'serial': v['serial'], 'court': v['court']}})
+        else:
+            changed.append(dict(v, key=k))
+    return {'added': added, 'removed': removed, 'moved': moved, 'changed': changed}
+
+
+def load_snapshot(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    snap = load_json(path)
+    if snap.get('version') != SNAPSHOT_VERSION:
+        return None
+    return snap
+
+
+def save_snapshot(snapshot: Dict[str, Any], path: str) -> str:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = path + '.part'
+    save_json(snapshot, tmp)
+    os.replace(tmp, path)
+    return path
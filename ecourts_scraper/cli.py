@@ -115,8 +115,52 @@ import json
 import datetime
 import click
 import os
-from .scraper import ECourtsScraper
-from .utils import save_json
+import time
+from .utils import save_json, json_default, archive_path, read_archive_text, compress_archive, train_archive_dictionary, \
+    RecordWriter, RECORD_FORMATS, record_format
+
+
+def _parse_date(value):
+    """Accept 'today', 'tomorrow' or YYYY-MM-DD."""
+    if value in (None, 'today'):
+        return datetime.date.today()
+    if value == 'tomorrow':
+        return datetime.date.today() + datetime.timedelta(days=1)
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise click.BadParameter(f'{value!r} is not today, tomorrow or YYYY-MM-DD')
+
+
+def _duration(value):
+    """Seconds from '90', '15m', '2h' or '1d'."""
+    if value is None:
+        return None
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    try:
+        if value[-1:].lower() in units:
+            return float(value[:-1]) * units[value[-1].lower()]
+        return float(value)
+    except ValueError:
+        raise click.BadParameter(f'{value!r} is not a duration like 90, 15m, 2h or 1d')
+
+
+def _scraper():
+    """The warm daemon's client when `ecourts-scraper serve` is running, else a local scraper."""
+    from .daemon import connect
+    client = connect()
+    if client:
+        return client
+    from .scraper import ECourtsScraper
+    return ECourtsScraper()
+
+
+def _record_writer(output, fmt=None):
+    """Streaming writer for --output (None without one); jsonl/csv append to existing files."""
+    if not output:
+        return None
+    fmt = fmt or record_format(output)
+    return RecordWriter(output, fmt, append=fmt != 'json')
 
 
 @click.group()
@@ -133,19 +177,30 @@ def cli():
 @click.option('--download-pdf', is_flag=True, help='Download case PDF if available')
 @click.option('--today', is_flag=True, help='Check if case is listed today')
 @click.option('--tomorrow', is_flag=True, help='Check if case is listed tomorrow')
-def check(cnr, case_type, number, year, download_pdf, today, tomorrow):
+@click.option('--format', 'fmt', type=click.Choice(RECORD_FORMATS), default='json',
+              help='json: one file per date (default); jsonl/csv: append a line to --output')
+@click.option('--output', help='Output file (default: result_<date>.json or results.jsonl/.csv)')
+@click.option('--max-age', help='Use a cached result up to this old (90, 15m, 2h, 1d; 0 = always fetch). '
+                                'Default: freshness from the next hearing date')
+def check(cnr, case_type, number, year, download_pdf, today, tomorrow, fmt, output, max_age):
     """Check case status and retrieve case information.
     
     Examples:
         ecourts-scraper check --cnr "DLHC01-123456-2024"
         ecourts-scraper check --type CRL --number 12345 --year 2024
+        ecourts-scraper check --cnr "DLHC01-123456-2024" --max-age 30m
     """
     
     if today and tomorrow:
         click.echo('❌ Error: --today and --tomorrow are mutually exclusive', err=True)
         return
+    max_age = _duration(max_age)
     
-    scraper = ECourtsScraper()
+    scraper = _scraper()
+    if hasattr(scraper, 'case_cache') and scraper.case_cache is None:
+        # monitors call check many times a day: answer from the case cache while it is fresh
+        from .casecache import CaseCache
+        scraper.case_cache = CaseCache()
     
     # Determine target date
     target_date = datetime.date.today()
@@ -157,12 +212,13 @@ def check(cnr, case_type, number, year, download_pdf, today, tomorrow):
     
     # Fetch case information using direct API
     if cnr:
+        query = cnr
         click.echo(f'   Searching by CNR: {cnr}')
-        res = scraper.check_by_cnr(cnr, download_pdf=download_pdf)
+        res = scraper.check_by_cnr(cnr, download_pdf=download_pdf, max_age=max_age)
     elif case_type and number and year:
         query = f"{case_type} {number}/{year}"
         click.echo(f'   Searching by case details: {query}')
-        res = scraper.check_by_details(case_type, number, year, download_pdf=download_pdf)
+        res = scraper.check_by_details(case_type, number, year, download_pdf=download_pdf, max_age=max_age)
     else:
         click.echo('❌ Error: Provide either --cnr OR all of --type/--number/--year', err=True)
         click.echo('\nExamples:')
@@ -208,12 +264,21 @@ def check(cnr, case_type, number, year, download_pdf, today, tomorrow):
         
         # Full JSON output
         click.echo('\n📝 Full Response:')
-        click.echo(json.dumps(res, indent=2, ensure_ascii=False))
+        click.echo(json.dumps(res, indent=2, ensure_ascii=False, default=json_default))
         
         output_file = f'result_{target_date.isoformat()}.json'
     
-    # Save results
-    save_json(res, output_file)
+    # Save results: jsonl/csv append one record per check instead of overwriting the day's file
+    if fmt == 'json':
+        output_file = output or output_file
+        save_json(res, output_file)
+    else:
+        output_file = output or f'results.{fmt}'
+        record = dict(res.to_dict() if hasattr(res, 'to_dict') else res, query=query,
+                      date=target_date.isoformat())
+        with RecordWriter(output_file, fmt, append=True,
+                          fields=('date', 'query', 'serial', 'court', 'pdf', 'error')) as out:
+            out.write(record)
     click.echo(f'\n💾 Results saved to: {output_file}')
     click.echo('='*60)
 
@@ -225,7 +290,10 @@ def check(cnr, case_type, number, year, download_pdf, today, tomorrow):
 @click.option('--district', required=True, help='District code')
 @click.option('--complex', 'complex_code', help='Court complex code (optional)')
 @click.option('--date', type=click.Choice(['today', 'tomorrow']), default='today', help='Date to search')
-def search_causelist(cnr, query, state, district, complex_code, date):
+@click.option('--compress', type=click.Choice(['gz', 'zst']), help='Store the archived HTML compressed')
+@click.option('--output', help='Also write matching rows to this file (appended unless --format json)')
+@click.option('--format', 'fmt', type=click.Choice(RECORD_FORMATS), help='Output format (default: from --output extension, else jsonl)')
+def search_causelist(cnr, query, state, district, complex_code, date, compress, output, fmt):
     """Search for a case in the cause list for a specific court.
     
     Examples:
@@ -233,7 +301,7 @@ def search_causelist(cnr, query, state, district, complex_code, date):
         ecourts-scraper search-causelist --query "12345/2024" --state 8 --district 26
     """
     
-    scraper = ECourtsScraper()
+    scraper = _scraper()
     
     # Determine target date
     target_date = datetime.date.today() if date == 'today' else datetime.date.today() + datetime.timedelta(days=1)
@@ -250,34 +318,58 @@ def search_causelist(cnr, query, state, district, complex_code, date):
         click.echo(f'   Complex: {complex_code}')
     click.echo(f'   Searching for: {search_term}\n')
     
-    # Download cause list
-    fname_or_err = scraper.download_cause_list(
-        target_date, 
-        state=state, 
-        district=district, 
-        complex_code=complex_code
-    )
-    
-    if isinstance(fname_or_err, dict) and 'error' in fname_or_err:
-        click.echo(f"❌ Error downloading cause list: {fname_or_err['error']}")
-        return
-    
-    # Search in the downloaded file
-    if not os.path.exists(fname_or_err):
-        click.echo(f'❌ File not found: {fname_or_err}')
-        return
-    
-    html = open(fname_or_err, 'r', encoding='utf-8').read()
-    
+    # Stream the cause list and report matches as rows arrive; the raw HTML is archived alongside
+    # (with $ECOURTS_STORE set, prefetched lists are read from the local store instead)
+    fname = archive_path(f'causelist_{target_date.isoformat()}.html', compress)
+    if scraper.store:
+        fname = scraper.stored_cause_list(target_date, state, district, complex_code) or \
+            scraper.store.path_for(target_date, state, district, complex_code)
+    matches = 0
+    rows_seen = 0
+    failed = False
+    out = _record_writer(output, fmt)
     click.echo('='*60)
-    if search_term.lower() in html.lower():
+    for row in scraper.iter_cause_list_rows(
+        target_date,
+        state=state,
+        district=district,
+        complex_code=complex_code,
+        archive_path=None if scraper.store else fname
+    ):
+        if 'error' in row:
+            click.echo(f"❌ Error downloading cause list: {row['error']}")
+            failed = True
+            break
+        rows_seen += 1
+        if scraper._row_matches(search_term, row['cols']):
+            matches += 1
+            if out:
+                out.write(row)
+            click.echo(f"✅ FOUND: {' | '.join(row['cols'])}")
+            if row.get('serial'):
+                click.echo(f"   📋 Serial: {row['serial']}")
+            if row.get('court'):
+                click.echo(f"   ⚖️  Court: {row['court']}")
+
+    if out:
+        out.close()
+        click.echo(f'💾 {out.count} matching row(s) written to: {output}')
+    if failed:
+        return
+
+    # Pages without a table: fall back to a plain text check of the archived copy
+    if not rows_seen and os.path.exists(fname):
+        if search_term.lower() in read_archive_text(fname).lower():
+            matches += 1
+
+    if matches:
         click.echo(f'✅ FOUND in cause list!')
         click.echo(f'   Search term: {search_term}')
     else:
         click.echo(f'❌ NOT FOUND in cause list')
         click.echo(f'   Search term: {search_term}')
     
-    click.echo(f'\n📄 Full cause list saved to: {fname_or_err}')
+    click.echo(f'\n📄 Full cause list saved to: {fname}')
     click.echo('='*60)
 
 
@@ -288,13 +380,16 @@ def search_causelist(cnr, query, state, district, complex_code, date):
 @click.option('--complex', 'complex_code', help='Court complex code (from causelist-options)')
 @click.option('--est', 'est_code', help='Court establishment code (from causelist-options)')
 @click.option('--court-no', 'court_no', help='Court number (from causelist-options)')
-def causelist(date, state, district, complex_code, est_code, court_no):
+@click.option('--compress', type=click.Choice(['gz', 'zst']), help='Store the HTML compressed')
+@click.option('--output', help='Also write the parsed rows to this file (appended unless --format json)')
+@click.option('--format', 'fmt', type=click.Choice(RECORD_FORMATS), help='Output format (default: from --output extension, else jsonl)')
+def causelist(date, state, district, complex_code, est_code, court_no, compress, output, fmt):
     """Download full cause list for given date and court parameters.
     
     Example:
         ecourts-scraper causelist --state 8 --district 26 --date today
     """
-    scraper = ECourtsScraper()
+    scraper = _scraper()
     dt = datetime.date.today() if date == 'today' else datetime.date.today() + datetime.timedelta(days=1)
     
     click.echo(f'📥 Downloading cause list for {dt.strftime("%d %B %Y")}')
@@ -308,13 +403,18 @@ def causelist(date, state, district, complex_code, est_code, court_no):
         district=district, 
         complex_code=complex_code, 
         est_code=est_code, 
-        court_no=court_no
+        court_no=court_no,
+        compress=compress
     )
     
     if isinstance(res, dict) and 'error' in res:
         click.echo(f'\n❌ Error: {res["error"]}')
     else:
         click.echo(f'\n✅ Saved cause list to: {res}')
+        if output:
+            with _record_writer(output, fmt) as out:
+                out.write_many(row for row in scraper.iter_rows_from_file(res) if 'error' not in row)
+            click.echo(f'💾 {out.count} row(s) written to: {output}')
 
 
 @cli.command('causelist-options')
@@ -328,7 +428,7 @@ def causelist_options(state, district):
         ecourts-scraper causelist-options --state 8          # List districts for state 8
         ecourts-scraper causelist-options --state 8 --district 26  # List complexes
     """
-    scraper = ECourtsScraper()
+    scraper = _scraper()
     
     if state and district:
         # Get complexes
@@ -387,13 +487,15 @@ def causelist_options(state, district):
 @click.option('--court-no', 'court_no', help='Court number')
 @click.option('--date', required=True, help='Date in YYYY-MM-DD format')
 @click.option('--all-judges', is_flag=True, help='Download PDFs for all judges')
-def causelist_download(state, district, complex_code, est_code, court_no, date, all_judges):
+@click.option('--compress', type=click.Choice(['gz', 'zst']), help='Store the HTML and PDFs compressed')
+@click.option('--search', 'search_term', help='Search the downloaded PDFs for a case number, party name, etc.')
+def causelist_download(state, district, complex_code, est_code, court_no, date, all_judges, compress, search_term):
     """Download cause list PDFs for a specific court complex and date.
     
     Example:
         ecourts-scraper causelist-download --state 8 --district 26 --complex 1 --date 2025-10-20
     """
-    scraper = ECourtsScraper()
+    scraper = _scraper()
     
     try:
         dt = datetime.datetime.fromisoformat(date).date()
@@ -404,31 +506,38 @@ def causelist_download(state, district, complex_code, est_code, court_no, date,
     click.echo(f'📥 Downloading cause list for {dt.strftime("%d %B %Y")}')
     click.echo(f'   Complex: {complex_code}')
     
-    page = scraper.download_cause_list(
+    # Stream rows and collect PDF links on the fly; the HTML is archived as a side output
+    page = archive_path(f'causelist_{dt.isoformat()}.html', compress)
+    selectors = (state, district, complex_code, est_code, court_no)
+    if scraper.store:
+        page = scraper.stored_cause_list(dt, *selectors) or scraper.store.path_for(dt, *selectors)
+    urls = []
+    rows_seen = 0
+    for row in scraper.iter_cause_list_rows(
         dt, 
         state=state, 
         district=district, 
         complex_code=complex_code, 
         est_code=est_code, 
-        court_no=court_no
-    )
-    
-    if isinstance(page, dict) and 'error' in page:
-        click.echo(f"\n❌ Error: {page['error']}")
-        return
-    
-    if not os.path.exists(page):
-        click.echo(f'\n❌ Error: File not found: {page}')
-        return
-    
-    html = open(page, 'r', encoding='utf-8').read()
-    links = scraper.find_cause_list_links(html, complex_value=complex_code, date=dt)
-    
-    if 'error' in links:
-        click.echo(f"\n❌ Error: {links['error']}")
-        return
+        court_no=court_no,
+        archive_path=None if scraper.store else page
+    ):
+        if 'error' in row:
+            click.echo(f"\n❌ Error: {row['error']}")
+            return
+        rows_seen += 1
+        for href in row.get('links', []):
+            if href.lower().endswith('.pdf') and href not in urls:
+                urls.append(href)
     
-    urls = links.get('links', [])
+    # Links outside table rows (or date-named links) need the full page; only then re-read the archive
+    if not urls and os.path.exists(page):
+        links = scraper.find_cause_list_links(read_archive_text(page), complex_value=complex_code, date=dt)
+        if 'error' in links:
+            click.echo(f"\n❌ Error: {links['error']}")
+            return
+        urls = links.get('links', [])
+
     if not urls:
         click.echo('\n⚠️  No PDF links found for provided complex/date')
         click.echo(f'   HTML saved to: {page}')
@@ -439,7 +548,7 @@ def causelist_download(state, district, complex_code, est_code, court_no, date,
     to_download = urls if all_judges else urls[:1]
     click.echo(f'📥 Downloading {len(to_download)} PDF(s)...')
     
-    saved = scraper.download_urls(to_download)
+    saved = scraper.download_urls(to_download, compress=compress)
     
     click.echo('\n📄 Download Results:')
     for item in saved.get('saved', []):
@@ -448,6 +557,474 @@ def causelist_download(state, district, complex_code, est_code, court_no, date,
         elif 'error' in item:
             click.echo(f"   ❌ {item['url']}: {item['error']}")
 
+    if search_term:
+        _echo_pdf_matches([item['path'] for item in saved.get('saved', []) if 'path' in item], search_term)
+
+
+def _echo_pdf_matches(paths, query, workers=None):
+    from .pdftext import search_pdfs
+    click.echo(f'\n🔍 Searching {len(paths)} PDF(s) for: {query}')
+    found = 0
+    for row in search_pdfs(paths, query, workers=workers):
+        if 'error' in row:
+            click.echo(f"   ❌ {row['pdf']}: {row['error']}")
+            continue
+        found += 1
+        click.echo(f"   ✅ {os.path.basename(row['pdf'])}: {' | '.join(row['cols'])}")
+        if row.get('court'):
+            click.echo(f"      ⚖️  {row['court']}")
+    if not found:
+        click.echo('   ❌ NOT FOUND in the downloaded PDFs')
+    return found
+
+
+@cli.command('search-pdfs')
+@click.argument('files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--query', required=True, help='Case number, party name, etc.')
+@click.option('--workers', type=int, help='Extraction processes (default: CPU count)')
+def search_pdfs_command(files, query, workers):
+    """Search cause-list PDFs already on disk (text is cached, so repeat searches are instant).
+
+    Needs the pdftotext tool (poppler-utils) or `pip install pypdf`.
+    """
+    _echo_pdf_matches(list(files), query, workers=workers)
+
+
+@cli.command('search-archive')
+@click.argument('paths', nargs=-1, type=click.Path(exists=True))
+@click.option('--query', required=True, help='Case number, CNR, party or advocate name')
+@click.option('--store', 'store_path', help='Search this store when no PATHS are given '
+                                            '(default: $ECOURTS_STORE or .ecourts_store)')
+@click.option('--workers', type=int, help='Scan processes (default: CPU count; 0 = in this process)')
+@click.option('--output', help='Also write matching rows to this file (appended unless --format json)')
+@click.option('--format', 'fmt', type=click.Choice(RECORD_FORMATS), help='Output format (default: from --output extension, else jsonl)')
+def search_archive(paths, query, store_path, workers, output, fmt):
+    """Search many saved cause lists, parsing only the files and rows that can match.
+
+    PATHS are cause-list files or directories of them (.html, .html.gz, .html.zst).
+
+    Examples:
+        ecourts-scraper search-archive --query "12345/2024" archive/
+        ecourts-scraper search-archive --query "ramesh kumar" --store .ecourts_store
+    """
+    from .archivesearch import archive_files, search_archives
+    from .store import CauseListStore
+    files = list(archive_files(paths or [CauseListStore(store_path).root]))
+    click.echo(f'🔍 Searching {len(files)} cause list(s) for: {query}')
+    start = time.monotonic()
+    totals = {'bytes': 0, 'candidate': 0, 'regions': 0, 'found': 0}
+    out = _record_writer(output, fmt)
+    for res in search_archives(files, query, workers=workers):
+        if 'error' in res:
+            click.echo(f"   ❌ {res['path']}: {res['error']}")
+            continue
+        totals['bytes'] += res['bytes']
+        totals['candidate'] += res['candidate']
+        totals['regions'] += res['regions']
+        if res['text_match']:
+            totals['found'] += 1
+            click.echo(f"   ✅ {res['path']}: found in the page text (no table)")
+        for row in res['rows']:
+            totals['found'] += 1
+            if out:
+                out.write(dict(row.to_dict(), file=res['path']))
+            click.echo(f"   ✅ {res['path']}: {' | '.join(row.cols)}")
+            if row.court:
+                click.echo(f"      ⚖️  {row.court}")
+    if out:
+        out.close()
+        click.echo(f'💾 {out.count} matching row(s) written to: {output}')
+    if not totals['found']:
+        click.echo('   ❌ NOT FOUND in the archived cause lists')
+    click.echo(f"📊 Scanned {totals['bytes'] / 1e6:.1f} MB in {time.monotonic() - start:.2f}s; parsed "
+               f"{totals['regions']} row region(s) in {totals['candidate']} candidate file(s)")
+
+
+@cli.command('causelist-diff')
+@click.option('--state', required=True, help='State code')
+@click.option('--district', required=True, help='District code')
+@click.option('--complex', 'complex_code', help='Court complex code')
+@click.option('--est', 'est_code', help='Court establishment code')
+@click.option('--court-no', 'court_no', help='Court number')
+@click.option('--date', default='today', help='today, tomorrow or YYYY-MM-DD')
+@click.option('--snapshot', 'snapshot_path', help='Snapshot file (default: next to the saved list)')
+@click.option('--json', 'as_json', is_flag=True, help='Print the diff as JSON')
+def causelist_diff(state, district, complex_code, est_code, court_no, date, snapshot_path, as_json):
+    """Re-fetch a cause list and show only cases added, removed or moved since the last run.
+
+    Example:
+        ecourts-scraper causelist-diff --state 8 --district 26 --complex 1 --date tomorrow
+    """
+    scraper = _scraper()
+    dt = _parse_date(date)
+    res = scraper.cause_list_changes(dt, state, district, complex_code, est_code, court_no,
+                                     snapshot_path=snapshot_path)
+    if 'error' in res:
+        click.echo(f"❌ Error: {res['error']}", err=True)
+        return
+    if as_json:
+        click.echo(json.dumps(res, indent=2, ensure_ascii=False, default=json_default))
+        return
+    if res['unchanged']:
+        click.echo(f'✅ No changes since last fetch ({dt.isoformat()})')
+        return
+    if res.get('first_fetch'):
+        click.echo(f"📋 First snapshot recorded: {res['rows']} rows")
+        return
+    click.echo(f"🔄 {len(res['added'])} added, {len(res['removed'])} removed, "
+               f"{len(res['moved'])} moved, {len(res['changed'])} changed")
+    for row in res['added']:
+        click.echo(f"   + {' | '.join(row['cols'])}")
+    for row in res['removed']:
+        click.echo(f"   - {' | '.join(row['cols'])}")
+    for row in res['moved']:
+        click.echo(f"   ~ {' | '.join(row['cols'])}  ({row['from']['serial']}/{row['from']['court']} -> "
+                   f"{row['to']['serial']}/{row['to']['court']})")
+    for row in res['changed']:
+        click.echo(f"   * {' | '.join(row['cols'])}")
+
+
+@cli.command()
+@click.option('--config', 'config_path', required=True, type=click.Path(exists=True, dir_okay=False),
+              help='JSON file with targets, window, concurrency and store')
+@click.option('--once', is_flag=True, help='Prefetch once and exit instead of running as a daemon')
+@click.option('--date', help='Date to prefetch with --once (YYYY-MM-DD, default tomorrow)')
+def prefetch(config_path, once, date):
+    """Prefetch cause lists into the local store during an off-peak window.
+
+    Example config:
+        {"targets": [{"state": "8", "district": "26", "complex": "1", "court_no": "3"}],
+         "window": "01:00-05:00", "concurrency": 2, "store": "/var/lib/ecourts"}
+
+    Point lookups at the same store with ECOURTS_STORE=/var/lib/ecourts.
+    """
+    from .prefetch import Prefetcher
+    prefetcher = Prefetcher.from_config(config_path)
+    click.echo(f'📦 Store: {prefetcher.store.root}  Targets: {len(prefetcher.targets)}')
+    if once:
+        dt = datetime.date.fromisoformat(date) if date else None
+        stats = prefetcher.run_once(dt)
+        click.echo(f"✅ fetched {stats['fetched']}, already stored {stats['cached']}, "
+                   f"retried {stats['retried']}, failed {stats['failed']}")
+        for job in prefetcher.failures:
+            click.echo(f"❌ {job['date']} {job['target']}: {job['last_error']}", err=True)
+        return
+    window = prefetcher.window
+    if window:
+        click.echo(f"⏰ Prefetching between {window[0].strftime('%H:%M')} and {window[1].strftime('%H:%M')}")
+    prefetcher.run_forever()
+
+
+@cli.command()
+@click.option('--socket', 'socket_path', help='Unix socket path (default: $ECOURTS_SOCKET or a per-user socket)')
+@click.option('--warm-browser', is_flag=True, help='Start the headless browser up front')
+def serve(socket_path, warm_browser):
+    """Run a warm scraper daemon that other commands use automatically.
+
+    While it runs, commands reuse its HTTP sessions, option caches and browser instead of
+    starting cold. Set ECOURTS_NO_DAEMON=1 to bypass it for a single command.
+    """
+    from .daemon import serve as run_daemon, default_socket_path, DaemonError
+    path = socket_path or default_socket_path()
+    click.echo(f'🔌 Listening on {path} (Ctrl+C to stop)')
+    try:
+        run_daemon(path=path, warm_browser=warm_browser)
+    except DaemonError as e:
+        click.echo(f'❌ Error: {e}', err=True)
+    except KeyboardInterrupt:
+        pass
+
+
+@cli.command('sweep')
+@click.option('--state', required=True, help='State code')
+@click.option('--district', 'districts', multiple=True, help='District code (repeatable; default: every district)')
+@click.option('--complex', 'complexes', multiple=True,
+              help='Court complex code (repeatable, needs one --district; default: every complex)')
+@click.option('--per-court', is_flag=True, help='One unit per court instead of per complex')
+@click.option('--from', 'date_from', default='today', help='First date: today, tomorrow or YYYY-MM-DD')
+@click.option('--to', 'date_to', help='Last date (default: the first date)')
+@click.option('--workers', type=int, default=4, help='Parallel fetches')
+@click.option('--db', 'db_path', help='Progress database (default: $ECOURTS_QUEUE or ecourts_queue.db)')
+@click.option('--name', help='Sweep name (default: derived from the scope and dates)')
+@click.option('--store', 'store_path', help='Cause-list store directory (default: $ECOURTS_STORE or .ecourts_store)')
+@click.option('--dry-run', is_flag=True, help='Only list the units the scope expands to')
+@click.option('--index', 'update_index', is_flag=True,
+              help='Then add the fetched lists to the search index ($ECOURTS_INDEX or ecourts_index.db)')
+def sweep(state, districts, complexes, per_court, date_from, date_to, workers, db_path, name, store_path, dry_run,
+          update_index):
+    """Fetch every cause list of a state, districts or complexes over a range of dates.
+
+    Re-running the same sweep skips the units already fetched and retries failed ones.
+
+    Examples:
+        ecourts-scraper sweep --state 8 --district 26 --from 2025-10-20 --to 2025-10-24
+        ecourts-scraper sweep --state 8 --district 26 --complex 1 --complex 2 --from tomorrow
+    """
+    from .coordinator import WorkQueue
+    from .scraper import ECourtsScraper
+    from .store import CauseListStore
+    from .sweep import date_range, expand_scope, run_sweep
+    if complexes and len(districts) != 1:
+        click.echo('❌ Error: --complex needs exactly one --district', err=True)
+        return
+    try:
+        dates = date_range(_parse_date(date_from), _parse_date(date_to) if date_to else None)
+    except ValueError as e:
+        click.echo(f'❌ Error: {e}', err=True)
+        return
+    scraper = ECourtsScraper(store=CauseListStore(store_path) if store_path else None)
+    with scraper.priority('bulk'):
+        click.echo(f'🔎 Expanding state {state}...')
+        targets = expand_scope(scraper, state, districts or None, complexes or None, per_court=per_court,
+                               workers=workers)
+    click.echo(f'   {len(targets)} target(s) x {len(dates)} date(s) = {len(targets) * len(dates)} unit(s)')
+    if dry_run:
+        for t in targets:
+            click.echo('   ' + ' '.join(f'{k}={v}' for k, v in t.items() if v is not None))
+        return
+    name = name or '/'.join([state, '+'.join(districts) or '*', '+'.join(complexes) or '*',
+                             'courts' if per_court else 'lists', f'{dates[0]}..{dates[-1]}'])
+
+    def progress(p):
+        click.echo(f"\r   {p['done'] + p['failed']}/{p['total']} ({p['failed']} failed)", nl=False)
+
+    with scraper.priority('bulk'):
+        summary = run_sweep(targets, dates, scraper=scraper, queue=WorkQueue(db_path), name=name,
+                            workers=workers, on_progress=progress)
+    click.echo('')
+    click.echo(f"✅ Sweep {summary['sweep']}: {summary['done']} fetched, {summary['skipped']} already done, "
+               f"{summary['failed']} failed, {summary['remaining']} left")
+    click.echo(f"📊 {summary['elapsed']:.1f}s with {summary['workers']} worker(s): "
+               f"{summary['units_per_minute']:.1f} units/min, {summary['rows']} rows "
+               f"({summary['rows_per_second']:.0f}/s), {summary['bytes'] / 1e6:.1f} MB")
+    if summary['failed']:
+        click.echo(f"   See failures with: ecourts-scraper queue-status --sweep '{summary['sweep']}' --failures")
+    if update_index:
+        from .export import store_sources
+        from .index import CauseListIndex
+        indexed = CauseListIndex().add(store_sources(scraper.store, {d.isoformat() for d in dates}))
+        click.echo(f"🔎 Indexed {indexed['rows']} rows from {indexed['sources']} new/changed list(s)")
+
+
+@cli.command('export')
+@click.argument('files', nargs=-1, type=click.Path(exists=True, dir_okay=False))
+@click.option('--store', 'store_path', help='Cause-list store to export (default: $ECOURTS_STORE or .ecourts_store)')
+@click.option('--out', 'out_dir', default='causelist_export', help='Export directory')
+@click.option('--format', 'fmt', type=click.Choice(['parquet', 'arrow']), default='parquet', help='File format')
+@click.option('--date', 'dates', multiple=True, help='Only export these dates (YYYY-MM-DD, repeatable)')
+@click.option('--workers', type=int, help='Parse processes (default: one per CPU)')
+def export(files, store_path, out_dir, fmt, dates, workers):
+    """Export parsed cause-list rows to date-partitioned Parquet/Arrow files (requires pyarrow).
+
+    Exports the local store, or the causelist_YYYY-MM-DD.html FILES given. Re-running only
+    adds new or changed lists.
+
+    Example:
+        ecourts-scraper export --store .ecourts_store --out causelist_export
+    """
+    from .export import ColumnarExport, file_sources, store_sources
+    from .store import CauseListStore
+    try:
+        sources = file_sources(files) if files else \
+            store_sources(CauseListStore(store_path), set(dates) if dates else None)
+        summary = ColumnarExport(out_dir, fmt).add(sources, workers=workers)
+    except (RuntimeError, ValueError) as e:
+        click.echo(f'❌ Error: {e}', err=True)
+        return
+    click.echo(f"✅ Exported {summary['rows']} rows from {summary['sources']} new/changed list(s) "
+               f"into {len(summary['dates'])} date partition(s) of {out_dir}")
+    for err in summary['errors']:
+        click.echo(f"   ❌ {err['path']}: {err['error']}")
+
+
+@cli.command('index-update')
+@click.argument('files', nargs=-1, type=click.Path(exists=True, dir_okay=False))
+@click.option('--store', 'store_path', help='Cause-list store to index (default: $ECOURTS_STORE or .ecourts_store)')
+@click.option('--db', 'db_path', help='Index database (default: $ECOURTS_INDEX or ecourts_index.db)')
+@click.option('--date', 'dates', multiple=True, help='Only index these dates (YYYY-MM-DD, repeatable)')
+@click.option('--workers', type=int, help='Parse processes (default: one per CPU)')
+def index_update(files, store_path, db_path, dates, workers):
+    """Add new or changed cause lists to the fuzzy search index.
+
+    Indexes the local store, or the causelist_YYYY-MM-DD.html FILES given. Unchanged lists are
+    skipped, so run it after every sweep or prefetch.
+
+    Example:
+        ecourts-scraper index-update --store .ecourts_store
+    """
+    from .export import file_sources, store_sources
+    from .index import CauseListIndex
+    from .store import CauseListStore
+    index = CauseListIndex(db_path)
+    try:
+        sources = file_sources(files) if files else \
+            store_sources(CauseListStore(store_path), set(dates) if dates else None)
+        summary = index.add(sources, workers=workers)
+    except ValueError as e:
+        click.echo(f'❌ Error: {e}', err=True)
+        return
+    stats = index.stats()
+    click.echo(f"✅ Indexed {summary['rows']} rows from {summary['sources']} new/changed list(s); "
+               f"{stats['rows']} rows from {stats['sources']} list(s) in {index.path}")
+    for err in summary['errors']:
+        click.echo(f"   ❌ {err['path']}: {err['error']}")
+
+
+@cli.command('index-search')
+@click.argument('query')
+@click.option('--db', 'db_path', help='Index database (default: $ECOURTS_INDEX or ecourts_index.db)')
+@click.option('--from', 'date_from', help='First date: today, tomorrow or YYYY-MM-DD')
+@click.option('--to', 'date_to', help='Last date: today, tomorrow or YYYY-MM-DD')
+@click.option('--state', help='State code')
+@click.option('--district', help='District code')
+@click.option('--complex', 'complex_code', help='Court complex code')
+@click.option('--est', 'est_code', help='Court establishment code')
+@click.option('--court', help='Court number or name')
+@click.option('--limit', type=int, default=20, help='Maximum results')
+@click.option('--json', 'as_json', is_flag=True, help='Print results as JSON lines')
+def index_search(query, db_path, date_from, date_to, state, district, complex_code, est_code, court,
+                 limit, as_json):
+    """Fuzzy search for party or advocate names across every indexed cause list.
+
+    Misspellings are tolerated ('Rmesh Kumaar' finds 'Ramesh Kumar'); results are ranked by
+    how closely each word matched.
+
+    Examples:
+        ecourts-scraper index-search "ramesh kumar"
+        ecourts-scraper index-search "sharma" --district 26 --from 2025-10-01 --to 2025-10-31
+    """
+    from .index import CauseListIndex
+    index = CauseListIndex(db_path)
+    start = time.perf_counter()
+    results = index.search(query, date_from=_parse_date(date_from) if date_from else None,
+                           date_to=_parse_date(date_to) if date_to else None, limit=limit,
+                           state=state, district=district, complex=complex_code, est=est_code, court=court)
+    elapsed = time.perf_counter() - start
+    if as_json:
+        for res in results:
+            click.echo(json.dumps(res, ensure_ascii=False))
+        return
+    click.echo(f'🔍 {len(results)} result(s) for {query!r} in {elapsed * 1000:.0f} ms')
+    for res in results:
+        click.echo(f"   {res['score']:.2f}  {res['date']}  #{res['serial'] or '-'}  {res['court'] or ''}")
+        click.echo(f"         {res['text'][:120]}")
+
+
+@cli.command('queue-add')
+@click.option('--db', 'db_path', help='Queue database (default: $ECOURTS_QUEUE or ecourts_queue.db)')
+@click.option('--sweep', default='default', help='Sweep name')
+@click.option('--date', 'dates', multiple=True, help='today, tomorrow or YYYY-MM-DD (repeatable)')
+@click.option('--targets', 'targets_path', type=click.Path(exists=True, dir_okay=False),
+              help='JSON list of targets (or a prefetch config with "targets")')
+@click.option('--state', help='State code (single target)')
+@click.option('--district', help='District code')
+@click.option('--complex', 'complex_code', help='Court complex code')
+@click.option('--est', 'est_code', help='Court establishment code')
+@click.option('--court-no', 'court_no', help='Court number')
+def queue_add(db_path, sweep, dates, targets_path, state, district, complex_code, est_code, court_no):
+    """Split a sweep into work units (one per date and court) in the shared queue.
+
+    Example:
+        ecourts-scraper queue-add --db /shared/sweep.db --date tomorrow --targets courts.json
+    """
+    from .coordinator import WorkQueue, sweep_units
+    from .utils import load_json
+    if targets_path:
+        targets = load_json(targets_path)
+        targets = targets.get('targets', []) if isinstance(targets, dict) else targets
+    elif state:
+        targets = [{'state': state, 'district': district, 'complex_code': complex_code,
+                    'est_code': est_code, 'court_no': court_no}]
+    else:
+        click.echo('❌ Error: Provide --targets or --state/--district/...', err=True)
+        return
+    units = sweep_units([_parse_date(d) for d in dates or ['today']], targets)
+    queue = WorkQueue(db_path)
+    added = queue.add(units, sweep=sweep)
+    click.echo(f'✅ Queued {added} new unit(s) ({len(units) - added} already queued) in {queue.path}')
+
+
+@cli.command('queue-worker')
+@click.option('--db', 'db_path', help='Queue database (default: $ECOURTS_QUEUE or ecourts_queue.db)')
+@click.option('--sweep', help='Only work on this sweep')
+@click.option('--lease', 'lease_seconds', type=float, default=120, help='Lease length in seconds')
+@click.option('--forever', is_flag=True, help='Keep polling for new units instead of exiting when done')
+@click.option('--store', 'store_path', help='Cause-list store directory (default: $ECOURTS_STORE or .ecourts_store)')
+def queue_worker(db_path, sweep, lease_seconds, forever, store_path):
+    """Lease and fetch work units until the queue is drained. Run one per process/node."""
+    from .coordinator import WorkQueue, Worker
+    from .scraper import ECourtsScraper
+    from .sessionstore import SessionStore
+    from .store import CauseListStore
+    scraper = ECourtsScraper(store=CauseListStore(store_path), session_store=SessionStore())
+    worker = Worker(WorkQueue(db_path, lease_seconds=lease_seconds), scraper, sweep=sweep)
+    click.echo(f'⚙️  Worker {worker.worker_id} on {worker.queue.path}')
+    stats = worker.run(stop_when_empty=not forever)
+    click.echo(f"✅ done {stats['done']}, failed {stats['failed']}, lost leases {stats['lost']}")
+
+
+@cli.command('queue-status')
+@click.option('--db', 'db_path', help='Queue database (default: $ECOURTS_QUEUE or ecourts_queue.db)')
+@click.option('--sweep', help='Only count this sweep')
+@click.option('--watch', type=float, help='Refresh every N seconds until the sweep finishes')
+@click.option('--failures', is_flag=True, help='List failed units')
+def queue_status(db_path, sweep, watch, failures):
+    """Show sweep progress: units per status (done, failed, running, pending), active workers and throughput."""
+    from .coordinator import WorkQueue
+    queue = WorkQueue(db_path)
+    while True:
+        p = queue.progress(sweep)
+        finished = p['done'] + p['failed']
+        pct = 100.0 * finished / p['total'] if p['total'] else 100.0
+        eta = f", ~{(p['pending'] + p['leased']) / p['per_minute']:.0f} min left" if p['per_minute'] else ''
+        click.echo(f"📊 {finished}/{p['total']} ({pct:.0f}%): {p['done']} done, {p['failed']} failed, "
+                   f"{p['leased']} running, {p['pending']} pending | {p['workers']} worker(s), "
+                   f"{p['per_minute']:.1f}/min{eta}")
+        if not watch or not (p['pending'] or p['leased']):
+            break
+        time.sleep(watch)
+    if failures:
+        for item in queue.results(sweep, status='failed'):
+            click.echo(f"   ❌ {item['unit']}: {item['error']}")
+
+
+@cli.command('archive-compress')
+@click.argument('files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['gz', 'zst']), default='zst', help='Archive format')
+@click.option('--keep', is_flag=True, help='Keep the original files')
+def archive_compress(files, fmt, keep):
+    """Compress saved cause lists / PDFs (readers decompress transparently).
+
+    Set ECOURTS_ZSTD_DICT to a dictionary from archive-train-dict for much better ratios on HTML.
+    """
+    before = after = 0
+    for path in files:
+        if path.endswith(('.gz', '.zst')):
+            continue
+        size_before = os.path.getsize(path)
+        dest = compress_archive(path, fmt, remove=not keep)
+        size = os.path.getsize(dest)
+        before += size_before
+        after += size
+        click.echo(f'   ✅ {dest} ({size_before} -> {size} bytes)')
+    if after:
+        click.echo(f'\n📦 {before} -> {after} bytes ({before / after:.1f}x)')
+
+
+@cli.command('archive-train-dict')
+@click.argument('files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--out', 'out_path', default='causelist.zdict', help='Dictionary output path')
+@click.option('--size', type=int, default=112640, help='Dictionary size in bytes')
+def archive_train_dict(files, out_path, size):
+    """Train a shared zstd dictionary from sample cause-list files (requires zstandard)."""
+    try:
+        train_archive_dictionary(files, out_path, size=size)
+    except Exception as e:
+        click.echo(f'❌ Error: {e}', err=True)
+        return
+    click.echo(f'✅ Dictionary written to: {out_path}')
+    click.echo(f'   Use it with: export ECOURTS_ZSTD_DICT={out_path}')
+
 
 if __name__ == '__main__':
     cli()
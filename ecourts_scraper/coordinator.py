@@ -0,0 +1,233 @@
+"""Leased work queue for sweeps spread over several workers or machines.
+
+A sweep is split into work units, one per (date, state, district, complex, establishment, court),
+stored in a SQLite database that every worker opens (WAL mode, so one coordinator file can be
+shared by processes on a host or by nodes on a filesystem with working locks). Workers lease
+units, heartbeat while they work and report a result or an error. A unit whose lease expires
+(its worker died or hung) becomes available again, up to max_attempts.
+"""
+import contextlib
+import datetime
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional, Dict, Any, List, Iterable, Callable
+
+from .store import selector_key
+
+UNIT_KEYS = ('state', 'district', 'complex_code', 'est_code', 'court_no')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY,
+    sweep TEXT NOT NULL,
+    key TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated REAL NOT NULL,
+    UNIQUE (sweep, key)
+);
+CREATE INDEX IF NOT EXISTS units_status ON units (sweep, status, lease_expires);
+"""
+
+
+def unit_key(unit: Dict[str, Any]) -> str:
+    return f"{unit['date']}/{selector_key(*(unit.get(k) for k in UNIT_KEYS))}"
+
+
+def sweep_units(dates: Iterable[datetime.date], targets: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One unit per date and target. Targets use the scraper's argument names or the short
+    config names (complex, est, court) used by prefetch configs."""
+    aliases = {'complex': 'complex_code', 'est': 'est_code', 'court': 'court_no'}
+    targets = [{aliases.get(k, k): v for k, v in t.items()} for t in targets]
+    return [dict({k: t.get(k) for k in UNIT_KEYS}, date=d.isoformat()) for d in dates for t in targets]
+
+
+class WorkQueue:
+    def __init__(self, path: Optional[str]=None, lease_seconds: float = 120, max_attempts: int = 5):
+        self.path = path or os.environ.get('ECOURTS_QUEUE') or 'ecourts_queue.db'
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def _tx(self, fn):
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers can't lease the same unit
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                out = fn(self._db)
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+            self._db.execute('COMMIT')
+            return out
+
+    def add(self, units: Iterable[Dict[str, Any]], sweep: str = 'default') -> int:
+        """Queue units (already queued ones are skipped); returns the number added."""
+        now = time.time()
+        rows = [(sweep, unit_key(u), json.dumps(u), now) for u in units]
+        return self._tx(lambda db: db.executemany(
+            'INSERT OR IGNORE INTO units (sweep, key, unit, updated) VALUES (?, ?, ?, ?)', rows).rowcount)
+
+    def lease(self, worker: str, n: int = 1, sweep: Optional[str]=None) -> List[Dict[str, Any]]:
+        """Lease up to n pending (or expired) units: [{'id', 'sweep', 'unit', 'attempts'}]."""
+        def take(db):
+            now = time.time()
+            # expired leases with no attempts left won't be leased again
+            db.execute("UPDATE units SET status = 'failed', error = COALESCE(error, 'lease expired'), updated = ? "
+                       "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?", (now, now, self.max_attempts))
+            rows = db.execute(
+                "SELECT id, sweep, unit, attempts FROM units WHERE (status = 'pending' OR "
+                "(status = 'leased' AND lease_expires < ?)) AND attempts < ? AND (? IS NULL OR sweep = ?) "
+                "ORDER BY attempts, id LIMIT ?", (now, self.max_attempts, sweep, sweep, n)).fetchall()
+            for r in rows:
+                db.execute("UPDATE units SET status = 'leased', worker = ?, attempts = attempts + 1, "
+                           "lease_expires = ?, updated = ? WHERE id = ?",
+                           (worker, now + self.lease_seconds, now, r['id']))
+            return [{'id': r['id'], 'sweep': r['sweep'], 'unit': json.loads(r['unit']),
+                     'attempts': r['attempts'] + 1} for r in rows]
+        return self._tx(take)
+
+    def _update_leased(self, unit_id: int, worker: str, sql: str, params=()) -> bool:
+        """Apply an update to a unit only while this worker still holds its lease."""
+        return self._tx(lambda db: db.execute(
+            sql + " WHERE id = ? AND worker = ? AND status = 'leased'", (*params, unit_id, worker)).rowcount == 1)
+
+    def heartbeat(self, unit_id: int, worker: str) -> bool:
+        """Extend the lease; False if it was lost (expired and taken by another worker)."""
+        now = time.time()
+        return self._update_leased(unit_id, worker, 'UPDATE units SET lease_expires = ?, updated = ?',
+                                   (now + self.lease_seconds, now))
+
+    def complete(self, unit_id: int, worker: str, result: Any = None) -> bool:
+        return self._update_leased(unit_id, worker, "UPDATE units SET status = 'done', result = ?, "
+                                   "error = NULL, updated = ?", (json.dumps(result), time.time()))
+
+    def fail(self, unit_id: int, worker: str, error: str, retry: bool = True) -> bool:
+        """Record an error; the unit is retried later unless retry=False or attempts are used up."""
+        return self._update_leased(
+            unit_id, worker, "UPDATE units SET status = CASE WHEN ? AND attempts < ? THEN 'pending' "
+            "ELSE 'failed' END, error = ?, lease_expires = NULL, updated = ?",
+            (retry, self.max_attempts, error, time.time()))
+
+    def retry_failed(self, sweep: Optional[str]=None) -> int:
+        """Give failed units a fresh set of attempts; returns how many were reset."""
+        return self._tx(lambda db: db.execute(
+            "UPDATE units SET status = 'pending', attempts = 0, worker = NULL, lease_expires = NULL, updated = ? "
+            "WHERE status = 'failed' AND (? IS NULL OR sweep = ?)", (time.time(), sweep, sweep)).rowcount)
+
+    def progress(self, sweep: Optional[str]=None, window: float = 60) -> Dict[str, Any]:
+        """Counts per status (expired leases count as pending), active workers and the recent
+        completion rate in units per minute."""
+        now = time.time()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT CASE WHEN status = 'leased' AND lease_expires < ? THEN 'pending' ELSE status END AS s, "
+                "COUNT(*) AS n FROM units WHERE (? IS NULL OR sweep = ?) GROUP BY s", (now, sweep, sweep)).fetchall()
+            workers = self._db.execute(
+                "SELECT COUNT(DISTINCT worker) FROM units WHERE status = 'leased' AND lease_expires >= ? "
+                "AND (? IS NULL OR sweep = ?)", (now, sweep, sweep)).fetchone()[0]
+            recent = self._db.execute(
+                "SELECT COUNT(*) FROM units WHERE status = 'done' AND updated >= ? AND (? IS NULL OR sweep = ?)",
+                (now - window, sweep, sweep)).fetchone()[0]
+        out = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        out.update({r['s']: r['n'] for r in rows})
+        out['total'] = sum(out.values())
+        out['workers'] = workers
+        out['per_minute'] = recent * 60.0 / window
+        return out
+
+    def results(self, sweep: Optional[str]=None, status: str = 'done') -> Iterable[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT sweep, unit, attempts, result, error FROM units WHERE status = ? AND (? IS NULL OR sweep = ?) '
+                'ORDER BY id', (status, sweep, sweep)).fetchall()
+        for r in rows:
+            yield {'sweep': r['sweep'], 'unit': json.loads(r['unit']), 'attempts': r['attempts'],
+                   'result': json.loads(r['result']) if r['result'] else None, 'error': r['error']}
+
+
+def fetch_unit(scraper, unit: Dict[str, Any]) -> Dict[str, Any]:
+    """Default worker task: download the unit's cause list and count its rows."""
+    date = datetime.date.fromisoformat(unit['date'])
+    res = scraper.download_cause_list(date, *(unit.get(k) for k in UNIT_KEYS))
+    if isinstance(res, dict) and 'error' in res:
+        raise RuntimeError(res['error'])
+    rows = sum(1 for row in scraper.iter_rows_from_file(res) if 'error' not in row)
+    return {'file': res, 'rows': rows, 'bytes': os.path.getsize(res)}
+
+
+class Worker:
+    """Leases units from a WorkQueue and runs them one at a time under the 'bulk' priority."""
+
+    def __init__(self, queue: WorkQueue, scraper=None, worker_id: Optional[str]=None,
+                 task: Callable[[Any, Dict[str, Any]], Any] = fetch_unit, sweep: Optional[str]=None,
+                 heartbeat: Optional[float]=None):
+        if scraper is None:
+            from .scraper import ECourtsScraper
+            from .sessionstore import SessionStore
+            from .store import CauseListStore
+            # units of the same date must not share a file name, so lists go to the store; worker
+            # processes on a host start from (and refresh) one shared session
+            scraper = ECourtsScraper(store=CauseListStore(), session_store=SessionStore())
+        self.queue = queue
+        self.scraper = scraper
+        self.worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}'
+        self.task = task
+        self.sweep = sweep
+        self.heartbeat = heartbeat or queue.lease_seconds / 3
+        self.stats = {'done': 0, 'failed': 0, 'lost': 0}
+
+    def _keep_alive(self, unit_id: int, stop: threading.Event):
+        while not stop.wait(self.heartbeat):
+            if not self.queue.heartbeat(unit_id, self.worker_id):
+                return  # lease lost; complete()/fail() will report it
+
+    def run_one(self) -> bool:
+        """Lease and run a single unit; False if nothing was available."""
+        leased = self.queue.lease(self.worker_id, sweep=self.sweep)
+        if not leased:
+            return False
+        item = leased[0]
+        stop = threading.Event()
+        beat = threading.Thread(target=self._keep_alive, args=(item['id'], stop), daemon=True)
+        beat.start()
+        priority = getattr(self.scraper, 'priority', None)
+        try:
+            with priority('bulk') if priority else contextlib.nullcontext():
+                result = self.task(self.scraper, item['unit'])
+        except Exception as e:
+            ok = self.queue.fail(item['id'], self.worker_id, str(e))
+            self.stats['failed' if ok else 'lost'] += 1
+        else:
+            ok = self.queue.complete(item['id'], self.worker_id, result)
+            self.stats['done' if ok else 'lost'] += 1
+        finally:
+            stop.set()
+            beat.join()
+        return True
+
+    def run(self, stop_when_empty: bool = True, poll: float = 5.0):
+        """Work until the queue has nothing left to lease (or forever, polling, if stop_when_empty=False)."""
+        while True:
+            if self.run_one():
+                continue
+            if stop_when_empty and not self.queue.progress(self.sweep)['leased']:
+                return self.stats
+            time.sleep(poll)
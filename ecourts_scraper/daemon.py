@@ -0,0 +1,251 @@
+"""Warm scraper daemon and its thin client.
+
+``ecourts-scraper serve`` keeps one ECourtsScraper (HTTP sessions, option caches, the request
+scheduler and optionally a Chromium instance) alive behind a Unix socket. CLI commands call
+``connect()`` first and, when a daemon is listening, run their scraper calls through a
+DaemonClient instead of building a cold scraper in every process.
+
+The protocol is JSON lines: one request {"method": .., "args": [..], "kwargs": {..}, "cwd": ..}
+per line (calls run with the client's working directory for relative default paths),
+answered with {"result": ..}, a stream of {"item": ..} lines ended by {"end": true} for
+generator methods, or {"exception": .., "type": ..} if the call raised.
+"""
+import contextlib
+import datetime
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import types
+from typing import Optional, Dict, Any
+
+from .models import CauseListRow
+from .store import CauseListStore
+from .utils import json_default
+
+# scraper methods callable over the socket
+EXPOSED = frozenset({
+    'check_by_cnr', 'check_by_details', 'download_cause_list', 'stored_cause_list',
+    'iter_cause_list_rows', 'iter_rows_from_file', 'iter_cause_list_matches', 'cause_list_changes',
+    'search_case_in_cause_list', 'get_cause_list_page', 'get_dependent_options',
+    'find_cause_list_links', 'parse_cause_list_form', 'download_urls',
+})
+STREAMING = frozenset({'iter_cause_list_rows', 'iter_rows_from_file', 'iter_cause_list_matches'})
+
+# arguments naming local files: the client makes them absolute, since the daemon runs elsewhere
+# (defaults are resolved by the daemon against the "cwd" sent with the request)
+PATH_ARGS = {
+    'download_cause_list': ('dest_dir',),
+    'download_urls': ('dest_dir',),
+    'iter_cause_list_rows': ('archive_path',),
+    'iter_rows_from_file': ('path',),
+    'cause_list_changes': ('snapshot_path',),
+}
+
+
+class DaemonError(RuntimeError):
+    pass
+
+
+def default_socket_path() -> str:
+    """$ECOURTS_SOCKET, else a per-user socket in $XDG_RUNTIME_DIR or the temp directory."""
+    if os.environ.get('ECOURTS_SOCKET'):
+        return os.environ['ECOURTS_SOCKET']
+    base = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(base, f'ecourts-scraper-{os.getuid()}.sock')
+
+
+def _encode(obj):
+    if isinstance(obj, datetime.date):
+        return {'$date': obj.isoformat()}
+    if isinstance(obj, dict):
+        return {k: _encode(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_encode(v) for v in obj]
+    if hasattr(obj, 'to_dict'):
+        return _encode(obj.to_dict())
+    return obj
+
+
+def _decode(obj):
+    if isinstance(obj, dict):
+        if set(obj) == {'$date'}:
+            return datetime.date.fromisoformat(obj['$date'])
+        return {k: _decode(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_decode(v) for v in obj]
+    return obj
+
+
+def _send(wfile, msg):
+    wfile.write(json.dumps(msg, ensure_ascii=False, default=json_default).encode('utf-8') + b'\n')
+    wfile.flush()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                self._call(json.loads(line))
+            except (BrokenPipeError, ConnectionResetError):
+                return
+
+    def _call(self, req):
+        method = req.get('method')
+        if method == 'info':
+            _send(self.wfile, {'result': self.server.info()})
+            return
+        if method not in EXPOSED:
+            _send(self.wfile, {'exception': f'method not allowed: {method}', 'type': 'ValueError'})
+            return
+        scraper = self.server.scraper
+        cwd = req.get('cwd')
+        try:
+            with scraper.working_dir(cwd) if cwd and hasattr(scraper, 'working_dir') else contextlib.nullcontext():
+                result = getattr(scraper, method)(*_decode(req.get('args', [])), **_decode(req.get('kwargs', {})))
+                if isinstance(result, types.GeneratorType):
+                    for item in result:
+                        _send(self.wfile, {'item': _encode(item)})
+                    _send(self.wfile, {'end': True})
+                else:
+                    _send(self.wfile, {'result': _encode(result)})
+        except (BrokenPipeError, ConnectionResetError):
+            raise
+        except Exception as e:
+            _send(self.wfile, {'exception': str(e), 'type': type(e).__name__})
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, scraper, path: Optional[str]=None):
+        self.scraper = scraper
+        self.path = path or default_socket_path()
+        if os.path.exists(self.path):
+            if _alive(self.path):
+                raise DaemonError(f'a daemon is already listening on {self.path}')
+            os.unlink(self.path)  # stale socket from a crashed daemon
+        # owner-only from the start: no window in which others could connect
+        umask = os.umask(0o177)
+        try:
+            super().__init__(self.path, _Handler)
+        finally:
+            os.umask(umask)
+
+    def info(self) -> Dict[str, Any]:
+        store = self.scraper.store
+        return {'pid': os.getpid(), 'cwd': os.getcwd(),
+                'store': os.path.abspath(store.root) if store else None, 'compress': store.compress if store else None}
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def serve(scraper=None, path: Optional[str]=None, warm_browser: bool = False):
+    """Run the daemon in the foreground until interrupted."""
+    from .casecache import CaseCache
+    from .scraper import ECourtsScraper, _start_playwright_browser
+    from .sessionstore import SessionStore
+    # the daemon answers CLI commands, and `check` caches case status by default; its session is
+    # shared with workers on this host
+    server = DaemonServer(scraper or ECourtsScraper(case_cache=CaseCache(), session_store=SessionStore()), path)
+    if warm_browser:
+        _start_playwright_browser()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def _alive(path: str, timeout: float = 0.5) -> bool:
+    s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    s.settimeout(timeout)
+    try:
+        s.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        s.close()
+
+
+class DaemonClient:
+    """Drop-in stand-in for ECourtsScraper that forwards the EXPOSED methods to a daemon."""
+
+    def __init__(self, path: Optional[str]=None, timeout: Optional[float]=None):
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+        self.info = self._request({'method': 'info'})
+        self.store = CauseListStore(self.info['store'], compress=self.info['compress']) \
+            if self.info.get('store') else None
+
+    def _open(self):
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.settimeout(self.timeout)
+        s.connect(self.path)
+        return s
+
+    @staticmethod
+    def _reply(f):
+        line = f.readline()
+        if not line:
+            raise DaemonError('daemon closed the connection')
+        msg = json.loads(line)
+        if 'exception' in msg:
+            raise DaemonError(f"{msg.get('type')}: {msg['exception']}")
+        return msg
+
+    def _request(self, req):
+        with self._open() as s, s.makefile('rwb') as f:
+            f.write(json.dumps(req, default=json_default).encode('utf-8') + b'\n')
+            f.flush()
+            return _decode(self._reply(f)['result'])
+
+    def _stream(self, req):
+        with self._open() as s, s.makefile('rwb') as f:
+            f.write(json.dumps(req, default=json_default).encode('utf-8') + b'\n')
+            f.flush()
+            while True:
+                msg = self._reply(f)
+                if msg.get('end'):
+                    return
+                item = _decode(msg['item'])
+                yield CauseListRow.make(**item) if isinstance(item, dict) and 'cols' in item else item
+
+    def call(self, method: str, *args, **kwargs):
+        if method not in EXPOSED:
+            raise AttributeError(method)
+        for name in PATH_ARGS.get(method, ()):
+            if kwargs.get(name):
+                kwargs[name] = os.path.abspath(kwargs[name])
+        req = {'method': method, 'args': _encode(list(args)), 'kwargs': _encode(kwargs), 'cwd': os.getcwd()}
+        return self._stream(req) if method in STREAMING else self._request(req)
+
+    def __getattr__(self, name):
+        if name not in EXPOSED:
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+    def _row_matches(self, query: str, cols) -> bool:
+        from .scraper import row_matches
+        return row_matches(query, cols)
+
+
+def connect(path: Optional[str]=None) -> Optional[DaemonClient]:
+    """A client for the running daemon, or None if none is listening (or ECOURTS_NO_DAEMON is set)."""
+    if os.environ.get('ECOURTS_NO_DAEMON') or not hasattr(socket, 'AF_UNIX'):
+        return None
+    path = path or default_socket_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        return DaemonClient(path)
+    except (OSError, ValueError, DaemonError):
+        return None
@@ -0,0 +1,202 @@
+"""Columnar export of parsed cause lists for analytics.
+
+Stored cause lists are parsed in the parse process pool and written as Parquet (or Arrow IPC)
+files, partitioned by date (<out>/date=YYYY-MM-DD/part-0.parquet). The court selectors and the
+source file are dictionary-encoded string columns. The result can be aggregated with pyarrow,
+pandas, polars or DuckDB without re-parsing any HTML.
+
+<out>/_manifest.json records the size, mtime and content hash of every exported source file.
+A later export only parses new or changed lists: it writes partitions for new days and rewrites
+a day only when one of its lists changed. Requires pyarrow (pip install pyarrow).
+"""
+import json
+import os
+import re
+from typing import Optional, Dict, Any, Iterable, Iterator, List
+
+from .changes import file_hash
+from .pipeline import run_pipeline
+from .scraper import parse_cause_list_rows
+from .store import CauseListStore
+from .utils import read_archive
+
+MANIFEST = '_manifest.json'
+EXPORT_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+# low-cardinality columns, stored dictionary-encoded
+DICT_COLUMNS = ('state', 'district', 'complex', 'est', 'court', 'source')
+COLUMNS = DICT_COLUMNS[:-1] + ('serial', 'case_no', 'cnr', 'parties', 'source')
+
+_CNR = re.compile(r'\b([A-Z]{4}\d{12})\b', re.I)
+# "Cr. 124/2024", "CRL/123/2024", "MACT 45/2023", "12345/2024"
+_CASE_NO = re.compile(r'(?:\b[A-Z][A-Za-z.()]*(?:[ -][A-Za-z.()]+){0,3}\s*[./-]?\s*)?\b\d{1,7}\s*/\s*(?:19|20)\d{2}\b')
+_PARTIES = re.compile(r'\b(vs?\.?|versus)\s|\bv/s\b', re.I)
+_CAUSELIST_FILE = re.compile(r'causelist_(\d{4}-\d{2}-\d{2})\.html')
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError('Columnar export needs pyarrow (pip install pyarrow)')
+    return pyarrow
+
+
+def row_fields(cols) -> tuple:
+    """(case_no, cnr, parties) found in a row's cells; None where absent."""
+    case_no = cnr = parties = None
+    for cell in cols:
+        if cnr is None:
+            m = _CNR.search(cell)
+            if m:
+                cnr = m.group(1).upper()
+        if case_no is None:
+            m = _CASE_NO.search(cell)
+            if m:
+                case_no = m.group(0).strip()
+        if parties is None and _PARTIES.search(cell):
+            parties = cell
+    return case_no, cnr, parties
+
+
+def export_rows(data: bytes) -> List[tuple]:
+    """Parse stage (runs in the worker processes): (serial, court, case_no, cnr, parties) per row."""
+    return [(r.serial, r.court) + row_fields(r.cols) for r in parse_cause_list_rows(data)]
+
+
+def store_sources(store: Optional[CauseListStore]=None, dates=None) -> Iterator[Dict[str, Any]]:
+    """Export sources for the lists in a store; `source` is the entry's store-relative name."""
+    store = store or CauseListStore()
+    for date, selectors, path in store.entries(dates):
+        name = os.path.basename(path).partition('.html')[0]
+        yield dict(zip(DICT_COLUMNS[:5], selectors), date=date.isoformat(), path=path,
+                   source=f'{date.isoformat()}/{name}')
+
+
+def file_sources(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Export sources for loose causelist_<date>.html files (selectors unknown)."""
+    for path in paths:
+        m = _CAUSELIST_FILE.search(os.path.basename(path))
+        if not m:
+            raise ValueError(f'cannot tell the date of {path} (expected causelist_YYYY-MM-DD.html)')
+        yield {'date': m.group(1), 'path': path, 'source': os.path.abspath(path)}
+
+
+class ColumnarExport:
+    def __init__(self, out: str, fmt: str = 'parquet'):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f'unknown export format: {fmt} (expected one of {", ".join(EXPORT_FORMATS)})')
+        self.out = out
+        self.fmt = fmt
+        self.manifest_path = os.path.join(out, MANIFEST)
+        self.manifest = {'format': fmt, 'sources': {}}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+            if self.manifest.get('format') != fmt:
+                raise ValueError(f"{out} holds a {self.manifest.get('format')} export")
+
+    def part_path(self, date: str) -> str:
+        return os.path.join(self.out, f'date={date}', 'part-0' + EXPORT_FORMATS[self.fmt])
+
+    def _changed(self, src: Dict[str, Any]) -> bool:
+        """True if the source is new or its content changed; fills in src['hash']."""
+        st = os.stat(src['path'])
+        src['size'], src['mtime'] = st.st_size, st.st_mtime
+        seen = self.manifest['sources'].get(src['source'])
+        if seen and (seen['size'], seen['mtime']) == (src['size'], src['mtime']):
+            return False
+        src['hash'] = file_hash(src['path'])
+        if seen and seen['hash'] == src['hash']:
+            seen.update(size=src['size'], mtime=src['mtime'])
+            return False
+        return True
+
+    def _table(self, srcs_rows):
+        pa = _pyarrow()
+        columns = {c: [] for c in COLUMNS}
+        for src, rows in srcs_rows:
+            if not rows:
+                continue
+            for c in ('state', 'district', 'complex', 'est', 'source'):
+                columns[c].extend([src.get(c)] * len(rows))
+            serial, court, case_no, cnr, parties = zip(*rows)
+            # a list fetched for a single court has no court column of its own
+            columns['court'].extend(c or src.get('court') for c in court)
+            columns['serial'].extend(serial)
+            columns['case_no'].extend(case_no)
+            columns['cnr'].extend(cnr)
+            columns['parties'].extend(parties)
+        arrays = [pa.array(columns[c], pa.string()) for c in COLUMNS]
+        arrays = [a.dictionary_encode() if c in DICT_COLUMNS else a for c, a in zip(COLUMNS, arrays)]
+        return pa.table(dict(zip(COLUMNS, arrays)))
+
+    def _read(self, path):
+        pa = _pyarrow()
+        if self.fmt == 'parquet':
+            return pa.parquet.read_table(path)
+        return pa.feather.read_table(path)
+
+    def _write(self, table, path):
+        pa = _pyarrow()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.part'
+        if self.fmt == 'parquet':
+            pa.parquet.write_table(table, tmp, compression='zstd')
+        else:
+            pa.feather.write_feather(table, tmp, compression='zstd')
+        os.replace(tmp, path)
+
+    def _save_manifest(self):
+        os.makedirs(self.out, exist_ok=True)
+        with open(self.manifest_path + '.part', 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+        os.replace(self.manifest_path + '.part', self.manifest_path)
+
+    def add(self, sources: Iterable[Dict[str, Any]], workers: Optional[int]=None) -> Dict[str, Any]:
+        """Export new or changed sources; returns counts and per-source errors."""
+        pa = _pyarrow()
+        todo = [src for src in sources if self._changed(src)]
+        summary = {'sources': len(todo), 'rows': 0, 'dates': [], 'errors': []}
+        by_date: Dict[str, list] = {}
+        for src, rows in run_pipeline(todo, lambda s: read_archive(s['path']), export_rows, parse_workers=workers):
+            if isinstance(rows, dict):
+                summary['errors'].append({'path': src['path'], 'error': rows.get('error')})
+                continue
+            by_date.setdefault(src['date'], []).append((src, rows))
+
+        for date, srcs_rows in sorted(by_date.items()):
+            table = self._table(srcs_rows)
+            path = self.part_path(date)
+            if os.path.exists(path):
+                # keep the day's other lists; drop the old rows of the lists being replaced
+                old = self._read(path)
+                replaced = pa.array([src['source'] for src, _ in srcs_rows], pa.string())
+                keep = pa.compute.invert(pa.compute.is_in(old['source'].cast(pa.string()), value_set=replaced))
+                table = pa.concat_tables([old.filter(keep), table]).unify_dictionaries().combine_chunks()
+            self._write(table, path)
+            for src, rows in srcs_rows:
+                self.manifest['sources'][src['source']] = {'hash': src['hash'], 'size': src['size'],
+                                                           'mtime': src['mtime'], 'date': date, 'rows': len(rows)}
+                summary['rows'] += len(rows)
+            summary['dates'].append(date)
+        self._save_manifest()
+        return summary
+
+
+def read_export(out: str, columns: Optional[List[str]]=None, filter=None):
+    """The export as one pyarrow Table, with `date` (date32) from the partition names.
+
+    filter is a pyarrow.dataset expression, e.g. ds.field('date') >= datetime.date(2025, 10, 1).
+    """
+    pa = _pyarrow()
+    import pyarrow.dataset as ds
+    with open(os.path.join(out, MANIFEST), encoding='utf-8') as f:
+        fmt = json.load(f).get('format', 'parquet')
+    partitioning = ds.partitioning(pa.schema([('date', pa.date32())]), flavor='hive')
+    dataset = ds.dataset(out, format='ipc' if fmt == 'arrow' else 'parquet', partitioning=partitioning,
+                         exclude_invalid_files=True, ignore_prefixes=['_', '.'])
+    # each file has its own dictionaries; one shared dictionary per column lets group_by/joins run on codes
+    return dataset.to_table(columns=columns, filter=filter).unify_dictionaries()
@@ -0,0 +1,264 @@
+"""Persistent trigram index for fuzzy search across stored cause lists.
+
+Every parsed row is split into words. The index (a SQLite file, $ECOURTS_INDEX or
+ecourts_index.db) keeps the distinct words (the vocabulary), the trigrams of each word and, per
+word, the rows it occurs in. A query word is matched against the vocabulary by trigram
+similarity (shared / total distinct trigrams, as in PostgreSQL's pg_trgm), so 'ramesh kumar'
+also finds 'Ramesh Kumaar' and 'Rmesh Kumar'. Rows containing a match for every query word are
+ranked by their mean similarity. Only the vocabulary is searched fuzzily, and it stays small
+however many lists are indexed, so a query over a year of lists takes milliseconds rather
+than a scan of every file.
+
+Sources are re-indexed only when new or changed (size, mtime, then content hash, like the
+columnar export), so `index-update` can run after every sweep or prefetch.
+"""
+import os
+import re
+import sqlite3
+import threading
+from typing import Optional, Dict, Any, Iterable, List, Set
+
+from .changes import file_hash
+from .export import row_fields
+from .pipeline import run_pipeline
+from .scraper import parse_cause_list_rows
+from .utils import read_archive
+
+HIERARCHY = ('state', 'district', 'complex', 'est', 'court')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    date TEXT NOT NULL,
+    state TEXT, district TEXT, complex TEXT, est TEXT, court TEXT,
+    size INTEGER, mtime REAL, hash TEXT
+);
+CREATE TABLE IF NOT EXISTS rows (
+    id INTEGER PRIMARY KEY,
+    source_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    serial TEXT, court TEXT, case_no TEXT, cnr TEXT,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rows_source ON rows (source_id);
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE,
+    grams INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS term_grams (
+    gram TEXT NOT NULL,
+    term_id INTEGER NOT NULL,
+    PRIMARY KEY (gram, term_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS postings (
+    term_id INTEGER NOT NULL,
+    row_id INTEGER NOT NULL,
+    PRIMARY KEY (term_id, row_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_row ON postings (row_id);
+"""
+
+_WORD = re.compile(r'[^\W_]{2,}')
+
+
+def words(text: str) -> Set[str]:
+    """Distinct lower-cased words (letters/digits, two or more) of text."""
+    return set(_WORD.findall(text.lower()))
+
+
+def trigrams(word: str) -> Set[str]:
+    """Trigrams of a word padded with two leading blanks and one trailing blank (as pg_trgm)."""
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    ga, gb = trigrams(a), trigrams(b)
+    return len(ga & gb) / len(ga | gb)
+
+
+def index_rows(data: bytes) -> List[tuple]:
+    """Parse stage (runs in the worker processes): (serial, court, case_no, cnr, text, words) per row."""
+    out = []
+    for r in parse_cause_list_rows(data):
+        text = ' '.join(c for c in r.cols if c)
+        case_no, cnr, _ = row_fields(r.cols)
+        out.append((r.serial, r.court, case_no, cnr, text, tuple(words(text))))
+    return out
+
+
+class CauseListIndex:
+    def __init__(self, path: Optional[str]=None, threshold: float = 0.35, max_terms: int = 32):
+        self.path = path or os.environ.get('ECOURTS_INDEX') or 'ecourts_index.db'
+        self.threshold = threshold  # minimum word similarity
+        self.max_terms = max_terms  # vocabulary matches kept per query word
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def _changed(self, src: Dict[str, Any]) -> bool:
+        """True if the source is new or its content changed; fills in src['hash']."""
+        st = os.stat(src['path'])
+        src['size'], src['mtime'] = st.st_size, st.st_mtime
+        seen = self._db.execute('SELECT id, size, mtime, hash FROM sources WHERE source = ?',
+                                (src['source'],)).fetchone()
+        if seen and (seen['size'], seen['mtime']) == (src['size'], src['mtime']):
+            return False
+        src['hash'] = file_hash(src['path'])
+        if seen and seen['hash'] == src['hash']:
+            self._db.execute('UPDATE sources SET size = ?, mtime = ? WHERE id = ?',
+                             (src['size'], src['mtime'], seen['id']))
+            return False
+        return True
+
+    def _term_ids(self, db, vocab: Dict[str, int], new: Iterable[str]) -> None:
+        for term in new:
+            if term in vocab:
+                continue
+            grams = trigrams(term)
+            term_id = db.execute('INSERT INTO terms (term, grams) VALUES (?, ?)', (term, len(grams))).lastrowid
+            db.executemany('INSERT INTO term_grams (gram, term_id) VALUES (?, ?)', [(g, term_id) for g in grams])
+            vocab[term] = term_id
+
+    def _replace(self, db, vocab: Dict[str, int], src: Dict[str, Any], rows: List[tuple]):
+        old = db.execute('SELECT id FROM sources WHERE source = ?', (src['source'],)).fetchone()
+        if old:
+            db.execute('DELETE FROM postings WHERE row_id IN (SELECT id FROM rows WHERE source_id = ?)', (old['id'],))
+            db.execute('DELETE FROM rows WHERE source_id = ?', (old['id'],))
+            db.execute('DELETE FROM sources WHERE id = ?', (old['id'],))
+        source_id = db.execute(
+            'INSERT INTO sources (source, path, date, state, district, complex, est, court, size, mtime, hash) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (src['source'], src['path'], src['date'], *(src.get(k) for k in HIERARCHY),
+             src['size'], src['mtime'], src['hash'])).lastrowid
+        postings = []
+        for serial, court, case_no, cnr, text, row_words in rows:
+            row_id = db.execute('INSERT INTO rows (source_id, date, serial, court, case_no, cnr, text) '
+                                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                (source_id, src['date'], serial, court, case_no, cnr, text)).lastrowid
+            self._term_ids(db, vocab, row_words)
+            postings.extend((vocab[w], row_id) for w in row_words)
+        db.executemany('INSERT OR IGNORE INTO postings (term_id, row_id) VALUES (?, ?)', postings)
+
+    def add(self, sources: Iterable[Dict[str, Any]], workers: Optional[int]=None) -> Dict[str, Any]:
+        """Index new or changed sources (see export.store_sources/file_sources); returns counts
+        and per-source errors."""
+        with self._lock:
+            todo = [src for src in sources if self._changed(src)]
+        summary = {'sources': len(todo), 'rows': 0, 'errors': []}
+        vocab = None
+        for src, rows in run_pipeline(todo, lambda s: read_archive(s['path']), index_rows, parse_workers=workers):
+            if isinstance(rows, dict):
+                summary['errors'].append({'path': src['path'], 'error': rows.get('error')})
+                continue
+            with self._lock:
+                if vocab is None:
+                    vocab = dict(self._db.execute('SELECT term, id FROM terms').fetchall())
+                # one transaction per list: readers never see a half-indexed list
+                self._db.execute('BEGIN IMMEDIATE')
+                try:
+                    self._replace(self._db, vocab, src, rows)
+                except BaseException:
+                    self._db.execute('ROLLBACK')
+                    vocab = None  # may hold ids of terms that were rolled back
+                    raise
+                self._db.execute('COMMIT')
+            summary['rows'] += len(rows)
+        return summary
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {t: self._db.execute(f'SELECT COUNT(*) FROM {t}').fetchone()[0]
+                    for t in ('sources', 'rows', 'terms')}
+
+    def _similar(self, word: str) -> List[tuple]:
+        grams = sorted(trigrams(word))
+        with self._lock:
+            found = self._db.execute(
+                f"SELECT t.id, t.term, t.grams, COUNT(*) AS shared FROM term_grams g JOIN terms t ON t.id = g.term_id "
+                f"WHERE g.gram IN ({','.join('?' * len(grams))}) GROUP BY g.term_id", grams).fetchall()
+        scored = [(r['id'], r['term'], r['shared'] / (len(grams) + r['grams'] - r['shared'])) for r in found]
+        scored = [t for t in scored if t[2] >= self.threshold]
+        scored.sort(key=lambda t: (-t[2], t[1]))
+        return scored[:self.max_terms]
+
+    def similar_terms(self, word: str) -> List[tuple]:
+        """[(term, similarity)] of the vocabulary words closest to word, best first."""
+        return [(term, sim) for _, term, sim in self._similar(word.lower())]
+
+    def _hits(self, word: str) -> Dict[int, float]:
+        """{row id: similarity of the row's best match for word}."""
+        sims = {term_id: sim for term_id, _, sim in self._similar(word)}
+        hits: Dict[int, float] = {}
+        if not sims:
+            return hits
+        with self._lock:
+            postings = self._db.execute(f"SELECT row_id, term_id FROM postings WHERE term_id IN "
+                                        f"({','.join('?' * len(sims))})", list(sims)).fetchall()
+        for row_id, term_id in postings:
+            if sims[term_id] > hits.get(row_id, 0):
+                hits[row_id] = sims[term_id]
+        return hits
+
+    def search(self, query: str, date_from=None, date_to=None, limit: int = 20,
+               **hierarchy) -> List[Dict[str, Any]]:
+        """Rows matching every word of query (fuzzily), best first.
+
+        date_from/date_to (dates or YYYY-MM-DD, inclusive) and state/district/complex/est/court
+        narrow the search. Each result has the row's fields, its list's selectors, date and path,
+        and a score: the mean similarity of the best match for each query word (1.0 = exact).
+        """
+        unknown = set(hierarchy) - set(HIERARCHY)
+        if unknown:
+            raise TypeError(f"unknown filter(s): {', '.join(sorted(unknown))}")
+        qwords = sorted(words(query))
+        if not qwords:
+            return []
+        # intersect the words' row sets, smallest first
+        per_word = sorted((self._hits(w) for w in qwords), key=len)
+        scores = per_word[0]
+        for hits in per_word[1:]:
+            scores = {r: s + hits[r] for r, s in scores.items() if r in hits}
+        ranked = sorted(scores, key=lambda r: (-scores[r], -r))  # ties: most recently indexed first
+
+        where, params = [], []
+        if date_from:
+            where.append('r.date >= ?')
+            params.append(str(date_from))
+        if date_to:
+            where.append('r.date <= ?')
+            params.append(str(date_to))
+        for k, v in hierarchy.items():
+            if v is not None:
+                where.append('COALESCE(r.court, s.court) = ?' if k == 'court' else f's.{k} = ?')
+                params.append(str(v))
+        sql = ("SELECT r.id, r.date, r.serial, r.case_no, r.cnr, r.text, s.source, s.path, s.state, "
+               "s.district, s.complex, s.est, COALESCE(r.court, s.court) AS court "
+               "FROM rows r JOIN sources s ON s.id = r.source_id "
+               "WHERE r.id IN ({}){}".format('{}', ''.join(' AND ' + w for w in where)))
+        out = []
+        # fetch in rank order, a chunk at a time, until the filters have let `limit` rows through
+        for i in range(0, len(ranked), 500):
+            chunk = ranked[i:i + 500]
+            with self._lock:
+                found = {r['id']: r for r in self._db.execute(sql.format(','.join('?' * len(chunk))),
+                                                              chunk + params)}
+            for row_id in chunk:
+                r = found.get(row_id)
+                if r is None:
+                    continue
+                out.append({'score': round(scores[row_id] / len(qwords), 3), 'date': r['date'],
+                            'serial': r['serial'], 'court': r['court'], 'case_no': r['case_no'],
+                            'cnr': r['cnr'], 'text': r['text'], **{k: r[k] for k in HIERARCHY[:4]},
+                            'source': r['source'], 'path': r['path']})
+                if len(out) >= limit:
+                    return out
+        return out
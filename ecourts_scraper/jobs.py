@@ -0,0 +1,237 @@
+"""Background jobs for long-running downloads and searches.
+
+A JobManager runs jobs on a thread pool (the work is upstream I/O) under the scraper's 'bulk'
+priority, so the web API keeps answering interactive requests while jobs run. Each job records
+progress events that can be polled or streamed as Server-Sent Events.
+"""
+import datetime
+import itertools
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable
+from urllib.parse import urlsplit
+
+from .pdftext import search_pdfs
+from .pipeline import run_pipeline, fetch_cause_list
+
+SELECTOR_PARAMS = ('state', 'district', 'complex_code', 'est_code', 'court_no')
+# hosts a 'pdfs' job may fetch caller-given urls from; anything else would let API clients make the
+# server request arbitrary (internal) addresses
+UPSTREAM_HOSTS = ('services.ecourts.gov.in',)
+
+
+def parse_job_date(value) -> datetime.date:
+    if value in (None, '', 'today'):
+        return datetime.date.today()
+    if value == 'tomorrow':
+        return datetime.date.today() + datetime.timedelta(days=1)
+    return datetime.date.fromisoformat(value)
+
+
+def check_upstream_urls(urls) -> list:
+    """The urls as a list, or ValueError if one is not an https URL on an eCourts host."""
+    if isinstance(urls, str):
+        urls = [urls]
+    urls = list(urls or [])
+    for url in urls:
+        parts = urlsplit(url) if isinstance(url, str) else None
+        if not parts or parts.scheme != 'https' or parts.hostname not in UPSTREAM_HOSTS:
+            raise ValueError(f'url not on an eCourts host: {url!r}')
+    return urls
+
+
+def _selectors(params):
+    # accept the web API's short names as well as the scraper's argument names
+    aliases = {'complex': 'complex_code', 'est': 'est_code', 'court': 'court_no'}
+    out = {}
+    for k, v in params.items():
+        k = aliases.get(k, k)
+        if k in SELECTOR_PARAMS and v not in (None, ''):
+            out[k] = v
+    return out
+
+
+class Job:
+    def __init__(self, kind: str, params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.params = params
+        self.status = 'queued'
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.events = []
+        self._seq = itertools.count(1)
+        self._cond = threading.Condition()
+
+    def emit(self, event: str, **data):
+        with self._cond:
+            self.events.append({'seq': next(self._seq), 'event': event, 'data': data, 'ts': time.time()})
+            if event == 'progress':
+                self.progress = data
+            elif event in ('done', 'failed'):
+                # the job only counts as done once its final event is there to be streamed
+                self.status = event
+            self._cond.notify_all()
+
+    def wait_events(self, since: int = 0, timeout: float = 15.0):
+        """Events with seq > since, waiting up to timeout for new ones."""
+        with self._cond:
+            if not any(e['seq'] > since for e in self.events) and not self.done:
+                self._cond.wait(timeout)
+            return [e for e in self.events if e['seq'] > since]
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    def to_dict(self, with_result: bool = False) -> Dict[str, Any]:
+        out = {'id': self.id, 'type': self.kind, 'params': self.params, 'status': self.status,
+               'progress': self.progress, 'created': self.created, 'started': self.started,
+               'finished': self.finished}
+        if self.error:
+            out['error'] = self.error
+        if with_result:
+            out['result'] = self.result
+        return out
+
+
+class JobManager:
+    def __init__(self, scraper, max_workers: int = 2, keep: int = 200):
+        self.scraper = scraper
+        self.keep = keep
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ecourts-job')
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self.runners: Dict[str, Callable[[Job], Any]] = {
+            'download': self._run_download,
+            'search': self._run_search,
+            'pdfs': self._run_pdfs,
+            'batch': self._run_batch,
+        }
+
+    def submit(self, kind: str, params: Optional[Dict[str, Any]]=None) -> Job:
+        if kind not in self.runners:
+            raise ValueError(f'unknown job type: {kind} (expected one of {", ".join(sorted(self.runners))})')
+        params = dict(params or {})
+        if kind == 'pdfs' and params.get('urls'):
+            params['urls'] = check_upstream_urls(params['urls'])
+        job = Job(kind, params)
+        with self._lock:
+            self.jobs[job.id] = job
+            self._prune()
+        job.emit('queued')
+        self.pool.submit(self._execute, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def list(self):
+        return sorted(self.jobs.values(), key=lambda j: j.created, reverse=True)
+
+    def _prune(self):
+        finished = sorted((j for j in self.jobs.values() if j.done), key=lambda j: j.finished)
+        for job in finished[:max(0, len(self.jobs) - self.keep)]:
+            del self.jobs[job.id]
+
+    def _execute(self, job: Job):
+        job.status = 'running'
+        job.started = time.time()
+        job.emit('started')
+        status = 'done'
+        try:
+            with self.scraper.priority('bulk'):
+                job.result = self.runners[job.kind](job)
+        except Exception as e:
+            job.error = str(e)
+            status = 'failed'
+        job.finished = time.time()
+        job.emit(status, error=job.error)
+
+    # runners
+
+    def _run_download(self, job: Job):
+        p = job.params
+        res = self.scraper.download_cause_list(parse_job_date(p.get('date')), **_selectors(p))
+        if isinstance(res, dict) and 'error' in res:
+            raise RuntimeError(res['error'])
+        return {'file': res}
+
+    def _run_search(self, job: Job):
+        p = job.params
+        query = p.get('query') or p.get('cnr')
+        if not query:
+            raise ValueError('query or cnr param required')
+        matches = []
+        rows = 0
+        for row in self.scraper.iter_cause_list_rows(parse_job_date(p.get('date')), **_selectors(p)):
+            if 'error' in row:
+                raise RuntimeError(row['error'])
+            rows += 1
+            if self.scraper._row_matches(query, row['cols']):
+                matches.append(row)
+                job.emit('match', row=row)
+            if rows % 100 == 0:
+                job.emit('progress', rows=rows, matches=len(matches))
+        job.emit('progress', rows=rows, matches=len(matches))
+        return {'found': bool(matches), 'matches': matches, 'rows': rows}
+
+    def _run_pdfs(self, job: Job):
+        p = job.params
+        urls = check_upstream_urls(p.get('urls'))
+        if not urls:
+            for row in self.scraper.iter_cause_list_rows(parse_job_date(p.get('date')), **_selectors(p)):
+                if 'error' in row:
+                    raise RuntimeError(row['error'])
+                urls.extend(u for u in row.get('links', []) if u.lower().endswith('.pdf') and u not in urls)
+            if not p.get('all_judges'):
+                urls = urls[:1]
+        saved = []
+
+        def downloaded():
+            for i, url in enumerate(urls, 1):
+                files = self.scraper.download_urls([url], compress=p.get('compress')).get('saved', [])
+                saved.extend(files)
+                job.emit('progress', done=i, total=len(urls))
+                yield from (s['path'] for s in files if 'path' in s)
+
+        if not p.get('query'):
+            for _ in downloaded():
+                pass
+            return {'saved': saved}
+        # search the PDFs' text too (extracted in the parse process pool while the later PDFs are
+        # still downloading, cached by content hash)
+        matches = []
+        for row in search_pdfs(downloaded(), p['query']):
+            matches.append(row)
+            job.emit('match', row=row)
+        return {'saved': saved, 'found': any('error' not in m for m in matches), 'matches': matches}
+
+    def _run_batch(self, job: Job):
+        """Fetch many units on threads and parse them in the process pool (see pipeline.py).
+
+        params: {'units': [{selectors..., 'date': ...}], 'query': optional, 'parse_workers': optional}
+        """
+        p = job.params
+        units = [dict(_selectors(u), date=parse_job_date(u.get('date'))) for u in p.get('units') or []]
+        query = p.get('query')
+        results = []
+        for i, (unit, rows) in enumerate(run_pipeline(units, lambda u: fetch_cause_list(self.scraper, u),
+                                                      io_workers=int(p.get('io_workers', 4)),
+                                                      parse_workers=p.get('parse_workers')), 1):
+            out = {'unit': dict(unit, date=unit['date'].isoformat())}
+            if isinstance(rows, dict):
+                out['error'] = rows.get('error')
+            else:
+                out['rows'] = len(rows)
+                if query:
+                    out['matches'] = [r for r in rows if self.scraper._row_matches(query, r['cols'])]
+            results.append(out)
+            job.emit('progress', done=i, total=len(units))
+        return {'results': results}
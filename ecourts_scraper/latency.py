@@ -0,0 +1,215 @@
+"""Per-endpoint latency tracking, adaptive timeouts and hedged requests.
+
+LatencyTracker keeps a rolling window of recent response times per endpoint. AdaptiveTimeouts
+turns them into connect/read timeouts (per endpoint and response size class, within floors and
+ceilings), so a hung fillDistrict call fails in seconds while a large PDF still gets the time it
+usually needs. Hedger uses the same numbers to send a second, identical request when the first
+has not answered within the endpoint's usual p95 latency (only for idempotent GETs); whichever
+answers first is used. The first request runs on the caller's thread and only hedges use the
+hedger's pool. Hedges are paid for out of a budget that grows by `budget` percent of the
+hedgeable requests, so the extra load on eCourts stays within that share however slow it gets.
+"""
+import collections
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Callable, Any, Tuple, Union
+from urllib.parse import urlsplit, parse_qs
+
+# response size classes: (upper bound in bytes, name)
+SIZE_CLASSES = ((64 * 1024, 'small'), (1024 * 1024, 'medium'), (None, 'large'))
+
+
+def endpoint_key(url: str, params: Optional[Dict[str, Any]]=None) -> str:
+    """Latency bucket for a request: host and path, plus the ?p= route the eCourts front
+    controller dispatches on. File names are collapsed (".../*.pdf") so every PDF of a
+    directory shares one bucket."""
+    parts = urlsplit(url)
+    head, _, last = parts.path.rpartition('/')
+    path = f'{head}/*.{last.rsplit(".", 1)[1].lower()}' if '.' in last else parts.path
+    route = params.get('p') if isinstance(params, dict) else None
+    if route is None:
+        route = parse_qs(parts.query).get('p', [None])[0]
+    return parts.netloc + path + (f'?p={route}' if route else '')
+
+
+def size_class(size: Optional[int]) -> Optional[str]:
+    if size is None:
+        return None
+    for bound, name in SIZE_CLASSES:
+        if bound is None or size < bound:
+            return name
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, collections.deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = collections.deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def count(self, endpoint: str) -> int:
+        with self._lock:
+            return len(self._samples.get(endpoint, ()))
+
+    def quantile(self, endpoint: str, q: float) -> Optional[float]:
+        """The q-quantile (0..1) of the endpoint's recent latencies; None until min_samples are seen."""
+        with self._lock:
+            samples = sorted(self._samples.get(endpoint, ()))
+        if len(samples) < max(1, self.min_samples):
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        out = {}
+        for endpoint in list(self._samples):
+            out[endpoint] = {'n': self.count(endpoint), 'p50': self.quantile(endpoint, 0.5),
+                             'p90': self.quantile(endpoint, 0.9), 'p99': self.quantile(endpoint, 0.99)}
+        return out
+
+
+def _clamp(value: float, bounds: Tuple[float, float]) -> float:
+    return min(max(value, bounds[0]), bounds[1])
+
+
+class AdaptiveTimeouts:
+    """(connect, read) timeouts learned from the latencies recorded per endpoint.
+
+    read is read_factor x the p99 latency of the endpoint's usual size class (the size class of
+    its last response), connect is connect_factor x its p90; both are clamped to the bounds below.
+    Until min_samples responses have been seen the caller's fixed default is used.
+    """
+    CONNECT_BOUNDS = (1.0, 10.0)
+    READ_BOUNDS = {'small': (2.0, 30.0), 'medium': (5.0, 60.0), 'large': (10.0, 120.0), None: (3.0, 60.0)}
+
+    def __init__(self, tracker: Optional[LatencyTracker]=None, read_factor: float = 3.0,
+                 connect_factor: float = 2.0):
+        self.tracker = tracker or LatencyTracker()
+        self.read_factor = read_factor
+        self.connect_factor = connect_factor
+        self._sizes: Dict[str, str] = {}
+
+    def record(self, endpoint: str, seconds: float, size: Optional[int]=None):
+        """Record a response time (to the headers for streamed bodies). Timeouts are recorded
+        too, at the time waited, so the learned timeout grows when upstream slows down. Samples of
+        unknown size (such as timeouts) count towards the endpoint's current size class."""
+        self.tracker.record(endpoint, seconds)
+        cls = size_class(size)
+        if cls:
+            self._sizes[endpoint] = cls
+        else:
+            cls = self._sizes.get(endpoint)
+        if cls:
+            self.tracker.record(f'{endpoint}#{cls}', seconds)
+
+    def timeout(self, endpoint: str, default: float) -> Union[float, Tuple[float, float]]:
+        cls = self._sizes.get(endpoint)
+        p99 = self.tracker.quantile(f'{endpoint}#{cls}', 0.99) if cls else None
+        if p99 is None:
+            p99 = self.tracker.quantile(endpoint, 0.99)
+        if p99 is None:
+            return default
+        connect = _clamp(self.connect_factor * self.tracker.quantile(endpoint, 0.9), self.CONNECT_BOUNDS)
+        return connect, _clamp(self.read_factor * p99, self.READ_BOUNDS[cls])
+
+
+class Hedger:
+    def __init__(self, budget: float = 5.0, quantile: float = 0.95, min_delay: float = 0.05,
+                 tracker: Optional[LatencyTracker]=None, max_workers: int = 8):
+        self.budget = budget  # percent of hedgeable requests that may be hedged
+        self.quantile = quantile
+        self.min_delay = min_delay
+        self.tracker = tracker or LatencyTracker()
+        self.max_workers = max_workers
+        self.stats = {'requests': 0, 'hedged': 0, 'hedge_wins': 0}
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def delay(self, endpoint: str) -> Optional[float]:
+        """How long to wait before hedging a request to endpoint; None if there is no history yet."""
+        q = self.tracker.quantile(endpoint, self.quantile)
+        return None if q is None else max(self.min_delay, q)
+
+    def _deposit(self):
+        with self._lock:
+            self.stats['requests'] += 1
+            # a little slack so short bursts of slowness can all be hedged, but no more
+            self._tokens = min(max(1.0, self.budget / 10.0), self._tokens + self.budget / 100.0)
+
+    def _take(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.stats['hedged'] += 1
+            return True
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix='ecourts-hedge')
+            return self._pool
+
+    def run(self, endpoint: str, attempt: Callable[[], Any], discard: Callable[[Any], None] = lambda r: None):
+        """Run attempt() on the calling thread; if it is slower than the endpoint's usual latency
+        and the budget allows, a second copy is started on the hedge pool. Returns the result of
+        the copy that succeeded first (an exception only if every copy failed); discard() is
+        called on the other copy's result. The caller's copy still runs to its end, so a winning
+        hedge replaces a slow answer and covers a failed one."""
+        self._deposit()
+        delay = self.delay(endpoint)
+        if delay is None:
+            return attempt()
+        primary_done = threading.Event()
+        backup = self._executor().submit(self._hedge, attempt, time.monotonic() + delay, primary_done)
+        try:
+            result = attempt()
+        except Exception:
+            primary_done.set()
+            if backup.cancel() or backup.result() is None:  # no hedge was sent: nothing to fall back on
+                raise
+            return self._won(backup.result()[0])
+        primary_done.set()
+        if not backup.cancel() and backup.done() and backup.exception() is None and backup.result():
+            discard(result)
+            return self._won(backup.result()[0])
+        backup.add_done_callback(lambda f: not f.cancelled() and f.exception() is None and f.result()
+                                 and discard(f.result()[0]))
+        return result
+
+    def _hedge(self, attempt, at: float, primary_done: threading.Event) -> Optional[Tuple[Any]]:
+        """(result,) of a second copy sent at `at` if the first one is still running then, else None."""
+        if primary_done.wait(max(0.0, at - time.monotonic())) or not self._take():
+            return None
+        return (attempt(),)
+
+    def _won(self, result):
+        with self._lock:
+            self.stats['hedge_wins'] += 1
+        return result
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+
+def adaptive_timeouts_from_env(tracker: Optional[LatencyTracker]=None) -> Optional[AdaptiveTimeouts]:
+    """AdaptiveTimeouts unless $ECOURTS_ADAPTIVE_TIMEOUTS is 0/false."""
+    if os.environ.get('ECOURTS_ADAPTIVE_TIMEOUTS', '1').lower() in ('0', 'false', 'no', 'off'):
+        return None
+    return AdaptiveTimeouts(tracker)
+
+
+def hedger_from_env() -> Optional[Hedger]:
+    """Hedger with $ECOURTS_HEDGE percent of extra requests (e.g. 5), or None if unset/0."""
+    budget = float(os.environ.get('ECOURTS_HEDGE') or 0)
+    return Hedger(budget=budget) if budget > 0 else None
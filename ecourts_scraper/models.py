@@ -0,0 +1,142 @@
+"""Compact record types for parsed results.
+
+Rows and options are produced in large numbers (a store can hold millions of cause-list rows),
+so these use ``__slots__`` instead of a per-object ``__dict__``, keep cells in tuples and intern
+strings that repeat across rows (court names, serials, option values).
+
+For compatibility with code written against the old dict results, records also support
+``rec['field']``, ``rec.get('field')`` and ``'field' in rec`` (true when the field is set).
+"""
+import sys
+from dataclasses import dataclass, fields
+from typing import Optional, Tuple, Any, Dict, NamedTuple
+
+
+def intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class CourtOption(NamedTuple):
+    """A select option; unpacks like the old (value, text) tuples."""
+    value: Optional[str]
+    text: str
+
+    @classmethod
+    def make(cls, value, text):
+        return cls(intern(value), intern(text or ''))
+
+
+def normalise_selects(options_map) -> Dict[str, list]:
+    """Classify get_dependent_options' 'options' by select name into CourtOption lists:
+    {'states': [...], 'districts': [...], 'complexes': [...], 'courts': [...]}.
+
+    The scraper returns keys like 'sess_state_code', 'sees_dist_code', 'court_complex_code', 'CL_court_no' etc.
+    """
+    out = {'states': [], 'districts': [], 'complexes': [], 'courts': []}
+    for k, opts in (options_map or {}).items():
+        lk = (k or '').lower()
+        if 'state' in lk:
+            out['states'] = _options(opts)
+        elif 'dist' in lk:
+            out['districts'] = _options(opts)
+        elif 'complex' in lk:
+            out['complexes'] = _options(opts)
+        elif 'court' in lk:
+            out['courts'] = _options(opts)
+        elif any('court' in (t or '').lower() for _, t in opts):
+            # fallback: classify by option text
+            out['courts'] = _options(opts)
+    return out
+
+
+def _options(opts):
+    # CourtOptions from the scraper are shared as-is; anything else (or a missing value) is coerced to str
+    return [o if isinstance(o, CourtOption) and o.value is not None else CourtOption.make(str(o[0]), str(o[1]))
+            for o in opts]
+
+
+def compact_options(pairs) -> list:
+    """[[value, text], ...] without the 'Select ...' placeholders."""
+    out = []
+    for v, t in pairs:
+        if not v or str(v).strip() in ('', '0') or 'select' in (t or '').lower():
+            continue
+        out.append([str(v), str(t)])
+    return out
+
+
+class _Record:
+    __slots__ = ()
+    # sparse records leave unset (None) fields out of keys()/to_dict(), like the optional keys
+    # of the dicts they replace
+    _sparse = False
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def __contains__(self, key):
+        return getattr(self, key, None) is not None
+
+    def keys(self):
+        return [f.name for f in fields(self) if not self._sparse or getattr(self, f.name) is not None]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the record (tuples become lists)."""
+        out = {}
+        for name in self.keys():
+            value = getattr(self, name)
+            out[name] = list(value) if isinstance(value, tuple) else value
+        return out
+
+    def pack(self) -> list:
+        """Positional form for compact storage; inverse of unpack()."""
+        return [getattr(self, f.name) for f in fields(self)]
+
+    @classmethod
+    def unpack(cls, values):
+        return cls(*values)
+
+
+@dataclass(eq=True)
+class CauseListRow(_Record):
+    __slots__ = ('cols', 'serial', 'court', 'pdf', 'links')
+    cols: Tuple[str, ...]
+    serial: Optional[str]
+    court: Optional[str]
+    pdf: Optional[str]
+    links: Tuple[str, ...]
+
+    @classmethod
+    def make(cls, cols, serial=None, court=None, pdf=None, links=()):
+        serial, court = intern(serial), intern(court)
+        # the cells holding the serial and court are the same (interned) strings as the fields
+        cols = tuple(court if c == court else serial if c == serial else c for c in cols)
+        return cls(cols, serial, court, pdf, tuple(links))
+
+    @classmethod
+    def unpack(cls, values):
+        return cls.make(*values)
+
+
+@dataclass(eq=True)
+class CaseListing(_Record):
+    """Result of a case status lookup (check_by_cnr / check_by_details)."""
+    __slots__ = ('rows', 'serial', 'court', 'pdf', 'raw', 'text_rows')
+    _sparse = True
+    rows: Optional[list]
+    serial: Optional[str]
+    court: Optional[str]
+    pdf: Optional[str]
+    raw: Any
+    text_rows: Optional[list]
+
+    @classmethod
+    def make(cls, rows=None, serial=None, court=None, pdf=None, raw=None, text_rows=None):
+        return cls(rows, intern(serial), intern(court), pdf, raw, text_rows)
@@ -0,0 +1,147 @@
+"""Parse results cached by a hash of the input, so identical pages are parsed once.
+
+Landing pages, option pages and cause lists are often parsed again with the same bytes: one
+search per query, link lookups after every form submission, get_dependent_options for every
+district. Results are keyed by a BLAKE2 hash of the kind of parse, PARSER_VERSION, any
+arguments that change the output and the input. They are kept in memory (LRU, bounded by entry
+count and total input size) and, when $ECOURTS_PARSE_CACHE names a directory, also on disk as
+gzip-compressed JSON, so later runs skip the parse too.
+
+Cached results are shared: callers get them as returned by the parser (or, for dicts, a
+shallow copy) and must not modify them in place.
+"""
+import collections
+import hashlib
+import json
+import os
+import threading
+from typing import Optional, Callable, Any
+
+from .models import CauseListRow, CourtOption
+from .utils import open_archive, read_archive
+
+# bump when a cached parser's output changes, so results of the old code are not reused
+PARSER_VERSION = 1
+_MISSING = object()
+
+
+def _encode(value):
+    """JSON-safe form of a parse result; records are tagged so _decode can rebuild them."""
+    if isinstance(value, CauseListRow):
+        return {'__row__': [_encode(v) for v in value.pack()]}
+    if isinstance(value, CourtOption):
+        return {'__option__': list(value)}
+    if isinstance(value, tuple):
+        return {'__tuple__': [_encode(v) for v in value]}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    return value
+
+
+def _decode(value):
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if isinstance(value, dict):
+        if '__row__' in value:
+            return CauseListRow.unpack(_decode(value['__row__']))
+        if '__option__' in value:
+            return CourtOption.make(*value['__option__'])
+        if '__tuple__' in value:
+            return tuple(_decode(v) for v in value['__tuple__'])
+        return {k: _decode(v) for k, v in value.items()}
+    return value
+
+
+class ParseCache:
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024, root: Optional[str]=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes  # total size of the inputs whose results are held
+        self.root = root
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0}
+        self._entries: 'collections.OrderedDict[str, tuple]' = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: str, data: bytes, *extra) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f'{kind}\0{PARSER_VERSION}\0{extra!r}\0'.encode('utf-8'))
+        h.update(data)
+        return h.hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key + '.json.gz')
+
+    def _remember(self, key: str, result, size: int):
+        if size > self.max_bytes or not self.max_entries:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self._bytes -= dropped
+
+    def _load(self, key: str):
+        try:
+            return _decode(json.loads(read_archive(self.path_for(key))))
+        except (OSError, ValueError):
+            return _MISSING
+
+    def _save(self, key: str, result):
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open_archive(path + '.part.gz', 'wb') as f:
+            f.write(json.dumps(_encode(result), ensure_ascii=False).encode('utf-8'))
+        os.replace(path + '.part.gz', path)
+
+    def parse(self, kind: str, data, parse: Callable[[Any], Any], *extra):
+        """parse(data), or the result of an earlier parse of the same kind, input and extra args."""
+        raw = data.encode('utf-8', 'surrogatepass') if isinstance(data, str) else bytes(data)
+        key = self.key(kind, raw, *extra)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[0]
+        result = self._load(key) if self.root else _MISSING
+        if result is not _MISSING:
+            self.stats['disk_hits'] += 1
+        else:
+            self.stats['misses'] += 1
+            result = parse(data)
+            if self.root:
+                self._save(key, result)
+        self._remember(key, result, len(raw))
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def parse_cache() -> ParseCache:
+    """The process-wide cache, created on first use: $ECOURTS_PARSE_CACHE_SIZE entries (default
+    256, 0 = off) in memory, plus the $ECOURTS_PARSE_CACHE directory on disk when set."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ParseCache(max_entries=int(os.environ.get('ECOURTS_PARSE_CACHE_SIZE') or 256),
+                                root=os.environ.get('ECOURTS_PARSE_CACHE') or None)
+        return _cache
+
+
+def cached_parse(kind: str, data, parse: Callable[[Any], Any], *extra) -> Any:
+    """parse(data) through the process-wide cache; dict results are returned as shallow copies."""
+    result = parse_cache().parse(kind, data, parse, *extra)
+    return dict(result) if isinstance(result, dict) else result
@@ -0,0 +1,146 @@
+"""Text extraction and search for cause lists published as PDFs.
+
+Text is extracted in worker processes (extraction is CPU-bound) with the ``pdftotext`` tool when
+it is on PATH, else with ``pypdf``. Extracted text is cached by a hash of the PDF content, so
+re-downloaded or renamed copies are not extracted again. The lines of the text are turned into
+CauseListRow records so they can be searched the same way as HTML cause lists.
+"""
+import io
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import as_completed
+from typing import Optional, Iterable, Iterator, Tuple, Any
+
+from .changes import file_hash
+from .models import CauseListRow
+from .pipeline import parse_pool
+from .scraper import row_matches
+from .utils import open_archive, read_archive, read_archive_text
+
+# line with a court heading ("Court No. 3", "In the Court of ...", "Judge: ...")
+_COURT_LINE = re.compile(r'\b(court\s*(no|room)\b|court of|judge\b)', re.I)
+_SERIAL = re.compile(r'^(\d{1,4})[.)]?(\s|$)')
+_CELL_SPLIT = re.compile(r'\s{2,}|\t')
+
+
+def pdf_bytes_to_text(data: bytes) -> str:
+    if shutil.which('pdftotext'):
+        # -layout keeps table columns apart, which text_rows splits on
+        out = subprocess.run(['pdftotext', '-layout', '-q', '-', '-'], input=data, capture_output=True, check=True)
+        return out.stdout.decode('utf-8', errors='replace')
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise RuntimeError('PDF text extraction needs the pdftotext tool (poppler-utils) or pypdf (pip install pypdf)')
+    return '\n'.join(page.extract_text() or '' for page in PdfReader(io.BytesIO(data)).pages)
+
+
+def extract_text(path: str) -> str:
+    """Text of a (possibly compressed) PDF file; runs in the worker processes."""
+    return pdf_bytes_to_text(read_archive(path))
+
+
+class PdfTextCache:
+    """Extracted text stored gzip-compressed under <root>/<hash[:2]>/<hash>.txt.gz.
+
+    The root defaults to $ECOURTS_PDF_CACHE.
+    """
+
+    def __init__(self, root: Optional[str]=None):
+        self.root = root or os.environ.get('ECOURTS_PDF_CACHE') or '.ecourts_pdftext'
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest + '.txt.gz')
+
+    def get(self, digest: str) -> Optional[str]:
+        path = self.path_for(digest)
+        return read_archive_text(path) if os.path.exists(path) else None
+
+    def put(self, digest: str, text: str):
+        path = self.path_for(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open_archive(path + '.part.gz', 'wb') as f:
+            f.write(text.encode('utf-8'))
+        os.replace(path + '.part.gz', path)
+
+
+def extract_many(paths: Iterable[str], workers: Optional[int]=None,
+                 cache: Optional[PdfTextCache]=None) -> Iterator[Tuple[str, Any]]:
+    """Yield (path, text) for each PDF, cached texts first and the rest as extraction completes.
+
+    Each PDF goes to the extraction pool as soon as paths produces it, so paths can be a generator
+    that is still downloading the later files. A PDF that cannot be read yields
+    (path, {'error': ...}). workers=0 extracts inline.
+    """
+    cache = cache or PdfTextCache()
+    pending = {}
+    pool = None
+    for path in paths:
+        yield from _extracted(pending, cache, [f for f in pending if f.done()])
+        try:
+            digest = file_hash(path)
+        except OSError as e:
+            yield path, {'error': str(e)}
+            continue
+        text = cache.get(digest)
+        if text is not None:
+            yield path, text
+            continue
+        if workers == 0:
+            try:
+                text = extract_text(path)
+            except Exception as e:
+                yield path, {'error': f'text extraction failed: {e}'}
+                continue
+            cache.put(digest, text)
+            yield path, text
+            continue
+        if pool is None:
+            pool = parse_pool(workers)
+        pending[pool.submit(extract_text, path)] = (path, digest)
+    yield from _extracted(pending, cache, as_completed(list(pending)))
+
+
+def _extracted(pending, cache, futures) -> Iterator[Tuple[str, Any]]:
+    """(path, text) for each of the finished futures, which are removed from pending."""
+    for fut in futures:
+        path, digest = pending.pop(fut)
+        try:
+            text = fut.result()
+        except Exception as e:
+            yield path, {'error': f'text extraction failed: {e}'}
+            continue
+        cache.put(digest, text)
+        yield path, text
+
+
+def text_rows(text: str, pdf: Optional[str]=None) -> Iterator[CauseListRow]:
+    """Rows of a cause list's extracted text: one per line, cells split on runs of spaces.
+
+    Court headings are not rows themselves; they set the court of the rows that follow.
+    """
+    court = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        cols = _CELL_SPLIT.split(line)
+        if len(cols) == 1 and _COURT_LINE.search(line):
+            court = line
+            continue
+        m = _SERIAL.match(line)
+        yield CauseListRow.make(cols, serial=m.group(1) if m else None, court=court, pdf=pdf)
+
+
+def search_pdfs(paths: Iterable[str], query: str, workers: Optional[int]=None,
+                cache: Optional[PdfTextCache]=None) -> Iterator[Any]:
+    """Yield the rows of the PDFs matching query (row['pdf'] is the file), or {'error', 'pdf'} dicts."""
+    for path, text in extract_many(paths, workers=workers, cache=cache):
+        if isinstance(text, dict):
+            yield dict(text, pdf=path)
+            continue
+        for row in text_rows(text, pdf=path):
+            if row_matches(query, row.cols):
+                yield row
@@ -0,0 +1,118 @@
+"""Two-stage fetch/parse pipeline for bulk cause-list work.
+
+Fetching is I/O-bound and runs on threads; parsing is CPU-bound (and holds the GIL), so it runs
+in a process pool that takes raw bytes and returns compact rows. The number of fetched bodies
+waiting for (or in) the parse stage is capped, so fast fetchers block instead of piling up
+memory when parsing falls behind.
+"""
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterable, Callable, Optional, Any, Dict, Iterator, Tuple
+
+from .scraper import parse_cause_list_rows
+from .utils import read_archive
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def parse_pool(workers: Optional[int]=None) -> ProcessPoolExecutor:
+    """Shared parse process pool, created on first use. Spawned (not forked) so it is safe to
+    start from threaded servers.
+
+    The first caller's workers sets its size for the life of the process: other callers may still
+    be submitting to it, so it is never replaced, and a later request for more workers just
+    queues its tasks on the existing ones.
+    """
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 2,
+                                              mp_context=multiprocessing.get_context('spawn'))
+        return _parse_pool
+
+
+def fetch_cause_list(scraper, unit: Dict[str, Any], priority: str = 'bulk'):
+    """I/O stage for cause-list units: download (or read from the store) and return raw bytes.
+
+    Priority is thread-local on the scraper, so it is set here, inside the fetch thread.
+    """
+    selectors = {k: unit.get(k) for k in ('state', 'district', 'complex_code', 'est_code', 'court_no')}
+    with scraper.priority(priority):
+        res = scraper.download_cause_list(unit['date'], **selectors)
+    if isinstance(res, dict) and 'error' in res:
+        return res
+    return read_archive(res)
+
+
+def run_pipeline(units: Iterable[Any], fetch: Callable[[Any], Any], parse: Callable[[bytes], Any]=parse_cause_list_rows,
+                 io_workers: int = 4, parse_workers: Optional[int]=None,
+                 max_pending: Optional[int]=None) -> Iterator[Tuple[Any, Any]]:
+    """Fetch every unit on threads and parse the bytes in worker processes.
+
+    Yields (unit, parsed) as parsing completes; if fetch returns an {'error': ...} dict or either
+    stage raises, (unit, {'error': ...}) is yielded instead. parse must be a picklable top-level
+    function. parse_workers=0 parses inline in the calling thread. max_pending bounds the number
+    of fetched bodies held in memory (default: twice the parse workers).
+    """
+    inline = parse_workers == 0
+    parse_workers = parse_workers or os.cpu_count() or 2
+    max_pending = max_pending or 2 * parse_workers
+    units = iter(units)
+    exhausted = False
+    fetching = {}
+    parsing = {}
+    ready = deque()
+    ppool = None if inline else parse_pool(parse_workers)
+
+    with ThreadPoolExecutor(max_workers=io_workers) as tpool:
+        while True:
+            # back-pressure: only start fetches while the parse backlog has room
+            while not exhausted and len(fetching) < io_workers and \
+                    len(fetching) + len(ready) + len(parsing) < max_pending + io_workers:
+                try:
+                    unit = next(units)
+                except StopIteration:
+                    exhausted = True
+                    break
+                fetching[tpool.submit(fetch, unit)] = unit
+
+            while ready and (inline or len(parsing) < max_pending):
+                unit, data = ready.popleft()
+                if inline:
+                    try:
+                        yield unit, parse(data)
+                    except Exception as e:
+                        yield unit, {'error': f'parse failed: {e}'}
+                else:
+                    parsing[ppool.submit(parse, data)] = unit
+
+            if not fetching and not parsing and not ready:
+                if exhausted:
+                    return
+                continue
+
+            if not fetching and not parsing:
+                continue
+            done, _ = wait(list(fetching) + list(parsing), return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut in fetching:
+                    unit = fetching.pop(fut)
+                    try:
+                        data = fut.result()
+                    except Exception as e:
+                        yield unit, {'error': f'fetch failed: {e}'}
+                        continue
+                    if isinstance(data, dict) and 'error' in data:
+                        yield unit, data
+                    else:
+                        ready.append((unit, data))
+                else:
+                    unit = parsing.pop(fut)
+                    try:
+                        yield unit, fut.result()
+                    except Exception as e:
+                        yield unit, {'error': f'parse failed: {e}'}
@@ -0,0 +1,155 @@
+"""Off-peak prefetching of cause lists into the local store.
+
+A Prefetcher keeps a priority queue of (due time, priority) ordered fetch jobs, runs them
+with bounded concurrency and re-queues failures with exponential back-off. ``run_forever``
+schedules the next day's lists once per day inside the configured window.
+"""
+import contextlib
+import datetime
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Dict, Any, List
+
+from .scraper import ECourtsScraper
+from .store import CauseListStore
+from .utils import load_json
+
+SELECTOR_KEYS = ('state', 'district', 'complex', 'est', 'court_no')
+
+
+def parse_window(spec: Optional[str]):
+    """Parse 'HH:MM-HH:MM' into (start, end) datetime.time; windows may wrap past midnight."""
+    if not spec:
+        return None
+    start, end = spec.split('-')
+    return (datetime.datetime.strptime(start.strip(), '%H:%M').time(),
+            datetime.datetime.strptime(end.strip(), '%H:%M').time())
+
+
+def in_window(window, now: Optional[datetime.datetime]=None) -> bool:
+    if not window:
+        return True
+    t = (now or datetime.datetime.now()).time()
+    start, end = window
+    if start <= end:
+        return start <= t < end
+    return t >= start or t < end
+
+
+class Prefetcher:
+    def __init__(self, targets: List[Dict[str, Any]], scraper: Optional[ECourtsScraper]=None,
+                 store: Optional[CauseListStore]=None, concurrency: int = 2, window=None,
+                 retry_delay: float = 300, max_attempts: int = 5, days_ahead: int = 1):
+        self.targets = targets
+        self.store = store or (scraper.store if scraper and scraper.store else CauseListStore())
+        self.scraper = scraper or ECourtsScraper(store=self.store)
+        if self.scraper.store is None:
+            self.scraper.store = self.store
+        self.concurrency = max(1, concurrency)
+        self.window = parse_window(window) if isinstance(window, str) else window
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self.days_ahead = days_ahead
+        self._queue = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._scheduled_dates = set()
+        self.stats = {'fetched': 0, 'cached': 0, 'retried': 0, 'failed': 0}
+        self.failures = []  # jobs given up on, with their last_error
+
+    @classmethod
+    def from_config(cls, path: str, **kwargs):
+        """Build from a JSON config: {"targets": [{"state": .., "district": .., "complex": .., "court_no": ..}],
+        "window": "01:00-05:00", "concurrency": 2, "store": "path", "days_ahead": 1}"""
+        cfg = load_json(path)
+        store = CauseListStore(cfg['store']) if cfg.get('store') else None
+        opts = {k: cfg[k] for k in ('window', 'concurrency', 'retry_delay', 'max_attempts', 'days_ahead') if k in cfg}
+        opts.update(kwargs)
+        return cls(cfg.get('targets', []), store=store, **opts)
+
+    def schedule(self, date: datetime.date, due: Optional[float]=None):
+        """Queue every configured target for date."""
+        due = due or time.time()
+        with self._lock:
+            for target in self.targets:
+                job = {'date': date, 'target': target, 'attempts': 0}
+                heapq.heappush(self._queue, (due, target.get('priority', 10), next(self._seq), job))
+            self._scheduled_dates.add(date)
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def _pop_due(self, now: float):
+        with self._lock:
+            if self._queue and self._queue[0][0] <= now:
+                return heapq.heappop(self._queue)[3]
+        return None
+
+    def _fetch(self, job):
+        t = job['target']
+        selectors = [t.get(k) for k in SELECTOR_KEYS]
+        if self.store.get(job['date'], *selectors):
+            return 'cached'
+        priority = getattr(self.scraper, 'priority', None)
+        with priority('prefetch') if priority else contextlib.nullcontext():
+            res = self.scraper.download_cause_list(job['date'], *selectors)
+        if isinstance(res, dict) and 'error' in res:
+            raise RuntimeError(res['error'])
+        return 'fetched'
+
+    def _done(self, job, fut):
+        try:
+            outcome = fut.result()
+            self.stats[outcome] += 1
+        except Exception as e:
+            job['attempts'] += 1
+            job['last_error'] = str(e)
+            if job['attempts'] >= self.max_attempts:
+                self.stats['failed'] += 1
+                self.failures.append(job)
+                return
+            self.stats['retried'] += 1
+            due = time.time() + self.retry_delay * (2 ** (job['attempts'] - 1))
+            with self._lock:
+                heapq.heappush(self._queue, (due, job['target'].get('priority', 10), next(self._seq), job))
+
+    def run_pending(self, stop_when_idle: bool = True, poll: float = 1.0, respect_window: bool = False):
+        """Run queued jobs (at most `concurrency` at a time) until the queue is empty."""
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while True:
+                while len(running) < self.concurrency and (not respect_window or in_window(self.window)):
+                    job = self._pop_due(time.time())
+                    if job is None:
+                        break
+                    running[pool.submit(self._fetch, job)] = job
+                if running:
+                    finished, _ = wait(list(running), timeout=poll, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        self._done(running.pop(fut), fut)
+                    continue
+                if not self._queue and stop_when_idle:
+                    return self.stats
+                time.sleep(poll)
+                if respect_window and not in_window(self.window):
+                    return self.stats
+
+    def run_once(self, date: Optional[datetime.date]=None):
+        """Prefetch every target for date (default: days_ahead from today) and return stats."""
+        date = date or datetime.date.today() + datetime.timedelta(days=self.days_ahead)
+        self.schedule(date)
+        return self.run_pending()
+
+    def run_forever(self, poll: float = 60):
+        """Each day, inside the window, prefetch the upcoming lists; retries carry over to the next window."""
+        while True:
+            if in_window(self.window):
+                date = datetime.date.today() + datetime.timedelta(days=self.days_ahead)
+                if date not in self._scheduled_dates:
+                    self.schedule(date)
+                if self._queue:
+                    self.run_pending(stop_when_idle=True, respect_window=True)
+            time.sleep(poll)
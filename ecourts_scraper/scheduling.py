@@ -0,0 +1,118 @@
+"""Priority scheduling of upstream requests.
+
+All requests made through one RequestScheduler share a token-bucket rate budget (and optionally a
+concurrency cap). Waiting requests are served in weighted-fair-queueing order across the classes
+'interactive', 'prefetch' and 'bulk'; bulk requests are held back entirely while interactive
+requests are waiting.
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Dict
+
+DEFAULT_WEIGHTS = {'interactive': 8.0, 'prefetch': 2.0, 'bulk': 1.0}
+
+
+class RequestScheduler:
+    def __init__(self, rate: float = 2.0, burst: float = 4.0, max_concurrent: Optional[int]=None,
+                 weights: Optional[Dict[str, float]]=None):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self._cond = threading.Condition()
+        self._tokens = burst
+        self._last_refill = time.monotonic()
+        self._vtime = 0.0
+        self._last_finish = {}
+        self._waiting = []
+        self._seq = itertools.count()
+        self._inflight = 0
+        self.stats = {cls: 0 for cls in self.weights}
+
+    def _refill(self, now):
+        if self.rate:
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        else:
+            self._tokens = self.burst
+        self._last_refill = now
+
+    def _head(self):
+        # interactive traffic preempts bulk: skip bulk entries while any interactive one is waiting
+        if any(e[2] == 'interactive' for e in self._waiting):
+            return min((e for e in self._waiting if e[2] != 'bulk'), default=None)
+        return self._waiting[0] if self._waiting else None
+
+    def waiting(self, cls: Optional[str]=None) -> int:
+        with self._cond:
+            return sum(1 for e in self._waiting if cls is None or e[2] == cls)
+
+    def acquire(self, cls: str = 'interactive', timeout: Optional[float]=None) -> bool:
+        """Block until this request may be sent; False if `timeout` seconds pass first."""
+        if cls not in self.weights:
+            raise ValueError(f'unknown priority class: {cls}')
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            start = max(self._vtime, self._last_finish.get(cls, 0.0))
+            finish = start + 1.0 / self.weights[cls]
+            self._last_finish[cls] = finish
+            entry = (finish, next(self._seq), cls)
+            heapq.heappush(self._waiting, entry)
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                slot_free = self.max_concurrent is None or self._inflight < self.max_concurrent
+                if self._head() is entry and slot_free and self._tokens >= 1:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self._tokens -= 1
+                    self._vtime = max(self._vtime, start)
+                    self._inflight += 1
+                    self.stats[cls] += 1
+                    self._cond.notify_all()
+                    return True
+                wait = None
+                if self._tokens < 1 and self.rate:
+                    wait = (1 - self._tokens) / self.rate
+                if end is not None:
+                    if now >= end:
+                        self._waiting.remove(entry)
+                        heapq.heapify(self._waiting)
+                        self._cond.notify_all()
+                        return False
+                    wait = end - now if wait is None else min(wait, end - now)
+                self._cond.wait(wait)
+
+    def release(self):
+        with self._cond:
+            self._inflight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, cls: str = 'interactive'):
+        self.acquire(cls)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_scheduler() -> Optional[RequestScheduler]:
+    """Process-wide scheduler configured from $ECOURTS_RATE (requests/second), or None if unset."""
+    global _shared
+    rate = os.environ.get('ECOURTS_RATE')
+    if not rate:
+        return None
+    with _shared_lock:
+        if _shared is None:
+            concurrent = os.environ.get('ECOURTS_MAX_CONCURRENT')
+            _shared = RequestScheduler(rate=float(rate), burst=max(1.0, float(rate)),
+                                       max_concurrent=int(concurrent) if concurrent else None)
+        return _shared
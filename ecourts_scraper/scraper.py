@@ -1,21 +1,65 @@
-
-import requests
-from bs4 import BeautifulSoup
+import codecs
 import datetime
+import functools
+import inspect
+import itertools
 import os
+import sys
+import threading
 import time
-from typing import Optional, Dict, Any
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.cookiejar import CookieJar
+from html.parser import HTMLParser
+from typing import Optional, Dict, Any, Iterator
+from urllib.parse import urljoin
 import atexit
+from .utils import archive_path as _archive_path, open_archive, part_path as _part_path, read_archive_text
+from .store import CauseListStore, selector_key
+from . import changes
+from .scheduling import RequestScheduler, shared_scheduler
+from .latency import Hedger, AdaptiveTimeouts, hedger_from_env, adaptive_timeouts_from_env, endpoint_key
+from .models import CauseListRow, CaseListing, CourtOption
+from .casecache import CaseCache, case_key, case_ttl
+from .parsecache import cached_parse
+from .sessionstore import SessionStore, jar_cookies, restore_cookies, form_from_json
 
 # Playwright globals for reuse to avoid relaunching the browser on every call                             
 _pw_runtime = None
 _pw_browser = None
+# Playwright's sync API only works on the thread that started it, so the shared browser lives on
+# one dedicated thread and headless work is queued onto it
+_pw_thread = None
+_pw_thread_lock = threading.Lock()
+_PW_THREAD_NAME = 'ecourts-playwright'
+
+
+def _playwright_thread() -> ThreadPoolExecutor:
+    global _pw_thread
+    with _pw_thread_lock:
+        if _pw_thread is None:
+            _pw_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix=_PW_THREAD_NAME)
+        return _pw_thread
+
+
+def _on_playwright_thread() -> bool:
+    return threading.current_thread().name.startswith(_PW_THREAD_NAME)
+
+
+def option_lookup_workers(workers: int) -> int:
+    """Threads to run get_dependent_options calls on: one when the headless fallback is enabled,
+    since its browser serves one lookup at a time anyway."""
+    return 1 if os.environ.get('USE_HEADLESS') == '1' else max(1, workers)
+
 
 def _start_playwright_browser():
-    """Start Playwright runtime and a single browser instance for reuse.
+    """Start Playwright runtime and a single browser instance for reuse, on the Playwright thread.
 
     Returns tuple (playwright_runtime, browser) or (None, None) if Playwright isn't available.
     """
+    if not _on_playwright_thread():
+        return _playwright_thread().submit(_start_playwright_browser).result()
     global _pw_runtime, _pw_browser
     if _pw_browser is not None and _pw_runtime is not None:
         return _pw_runtime, _pw_browser
@@ -44,57 +88,622 @@ def _start_playwright_browser():
         return None, None
 
 
+def _soup(markup):
+    # bs4 is imported on first use: it is slow to import and the streaming row parser doesn't need it
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(markup, 'html.parser')
+
+
+def _serial_court(headers, cols):
+    serial = None
+    court = None
+    for i, h in enumerate(headers):
+        if 'serial' in h or 's. no' in h or 's.no' in h:
+            if i < len(cols):
+                serial = cols[i]
+        if 'court' in h or 'bench' in h:
+            if i < len(cols):
+                court = cols[i]
+    return serial, court
+
+
+def _first_table_rows(html, base):
+    """CauseListRows of the first <table> in html (None if there is none), as
+    search_case_in_cause_list reads them: headers from all of the table's <th> cells, pdf from
+    a row's first link when it is a PDF."""
+    table = _soup(html).find('table')
+    if not table:
+        return None
+    headers = [th.get_text(strip=True).lower() for th in table.find_all('th')]
+    rows = []
+    for tr in table.find_all('tr'):
+        cols = [td.get_text(strip=True) for td in tr.find_all('td')]
+        if not cols:
+            continue
+        serial, court = _serial_court(headers, cols)
+        a = tr.find('a', href=True)
+        pdf = None
+        if a and a['href'].lower().endswith('.pdf'):
+            href = a['href']
+            pdf = href if href.startswith('http') else urljoin(base, href)
+        rows.append(CauseListRow.make(cols, serial, court, pdf))
+    return rows
+
+
+def _cause_list_row(headers, cols, links, base):
+    serial, court = _serial_court(headers, cols)
+    links = [href if href.startswith('http') else urljoin(base, href) for href in links]
+    pdf = links[0] if links and links[0].lower().endswith('.pdf') else None
+    return CauseListRow.make(cols, serial, court, pdf, links)
+
+
+def row_matches(query: str, cols) -> bool:
+    row_text = ' '.join(cols)
+    return query in row_text or query.lower() in row_text.lower()
+
+
+def parse_cause_list_rows(html, base='https://services.ecourts.gov.in/ecourtindia_v6/'):
+    """Parse a whole cause list (str or bytes) into CauseListRow records without a scraper instance.
+
+    Module-level so it can run in a worker process (see pipeline.py).
+    """
+    if isinstance(html, bytes):
+        html = html.decode('utf-8', errors='replace')
+    parser = _CauseListRowParser()
+    parser.feed(html)
+    parser.close()
+    return [_cause_list_row(*row, base) for row in parser.drain()]
+
+
+def _parse_selects(html) -> Dict[str, list]:
+    """Map of select name -> [CourtOption(value, text), ...] for every <select> in html."""
+    return cached_parse('selects', html, _parse_selects_uncached)
+
+
+def _parse_selects_uncached(html) -> Dict[str, list]:
+    soup = _soup(html)
+    selects = {}
+    for sel in soup.find_all('select'):
+        name = sel.get('name') or sel.get('id') or 'select'
+        selects[name] = [CourtOption.make(o.get('value'), o.get_text(strip=True)) for o in sel.find_all('option')]
+    return selects
+
+
+class _CauseListRowParser(HTMLParser):
+    """Incremental table parser used by the streaming cause-list path.
+
+    Feed decoded text chunk by chunk; every completed ``<tr>`` with ``<td>`` cells is
+    queued as (headers, cols, links) and handed out by ``drain()``. Header rows (``<th>``)
+    update the headers used for the rows that follow them.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.headers = []
+        self.rows_seen = 0
+        self._pending = []
+        self._cols = None
+        self._heads = None
+        self._links = None
+        self._cell = None
+        self._cell_tag = None
+        self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        self._end_text()
+        if tag == 'tr':
+            self._end_row()
+            self._cols, self._heads, self._links = [], [], []
+        elif tag in ('td', 'th'):
+            self._end_cell()
+            self._cell, self._cell_tag = [], tag
+        elif tag == 'a' and self._links is not None:
+            href = dict(attrs).get('href')
+            if href:
+                self._links.append(href)
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        self._end_text()
+        if tag in ('td', 'th'):
+            self._end_cell()
+        elif tag in ('tr', 'table'):
+            self._end_row()
+
+    def close(self):
+        super().close()
+        self._end_row()
+
+    def drain(self):
+        rows, self._pending = self._pending, []
+        return rows
+
+    def _end_text(self):
+        # a text node may arrive in several pieces when it spans chunks; strip it as a whole,
+        # mirroring BeautifulSoup get_text(strip=True) (strip each node, join without separator)
+        if self._text:
+            if self._cell is not None:
+                self._cell.append(''.join(self._text).strip())
+            self._text = []
+
+    def _end_cell(self):
+        self._end_text()
+        if self._cell is None:
+            return
+        text = ''.join(self._cell)
+        if self._cols is not None:
+            if self._cell_tag == 'th':
+                self._heads.append(text.lower())
+            else:
+                self._cols.append(text)
+        self._cell, self._cell_tag = None, None
+
+    def _end_row(self):
+        self._end_cell()
+        if self._cols is None:
+            return
+        if self._heads and not self._cols:
+            self.headers = self._heads
+        elif self._cols:
+            self._pending.append((self.headers, self._cols, self._links))
+            self.rows_seen += 1
+        self._cols, self._heads, self._links = None, None, None
+
+
+def _accept_encoding() -> str:
+    """Content codings we can decode; urllib3 handles br/zstd only when the codec packages exist."""
+    encodings = ['gzip', 'deflate']
+    try:
+        import brotli  # noqa: F401
+        encodings.append('br')
+    except ImportError:
+        pass
+    try:
+        import zstandard  # noqa: F401
+        import urllib3
+        if int(urllib3.__version__.split('.')[0]) >= 2:
+            encodings.append('zstd')
+    except (ImportError, ValueError):
+        pass
+    return ', '.join(encodings)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised inside the scraper when the caller's deadline has passed."""
+
+
+def deadline_error(url: Optional[str]=None) -> Dict[str, Any]:
+    """The error dict returned (or yielded) when a call runs out of its deadline."""
+    out = {'error': 'deadline exceeded', 'timeout': True}
+    if url:
+        out['url'] = url
+    return out
+
+
+def _release_on_close(r, release):
+    """Call release() when the streamed response r is closed, or when it is garbage collected
+    if nobody closes it."""
+    close = getattr(r, 'close', None)
+
+    def closing():
+        try:
+            if close is not None:
+                close()
+        finally:
+            release()
+    r.close = closing
+    weakref.finalize(r, release)
+
+
+def _budgeted(method):
+    """Let a public method take deadline=<seconds> covering everything it does, including retries,
+    fallbacks and headless waits. Running out returns (or, for generators, yields after the
+    rows produced so far) deadline_error()."""
+    if inspect.isgeneratorfunction(method):
+        @functools.wraps(method)
+        def gen(self, *args, deadline: Optional[float]=None, **kwargs):
+            end = None if deadline is None else time.monotonic() + deadline
+            it = method(self, *args, **kwargs)
+            while True:
+                # the deadline applies while the generator runs, not while the caller holds it
+                with self._deadline_at(end):
+                    try:
+                        item = next(it)
+                    except StopIteration:
+                        return
+                    except DeadlineExceeded:
+                        yield deadline_error()
+                        return
+                yield item
+        return gen
+
+    @functools.wraps(method)
+    def wrapper(self, *args, deadline: Optional[float]=None, **kwargs):
+        with self.deadline(deadline):
+            try:
+                return method(self, *args, **kwargs)
+            except DeadlineExceeded:
+                return deadline_error()
+    return wrapper
+
+
 class ECourtsScraper:
     BASE = 'https://services.ecourts.gov.in/ecourtindia_v6/'
     
     _dependent_options_cache = {}
     _cache_ttl = 300  # seconds
-
-    def __init__(self, session=None):
-        self.s = session or requests.Session()
-     
-        self.s.headers.update({
-            'User-Agent': 'ecourts-scraper/0.1 (+https://example.local)'
+    # the cause-list form's hidden tokens belong to the session; reuse them for this long at most
+    _form_ttl = 600  # seconds
+    # a POST answered like this means the form tokens were rejected (expired/rotated)
+    _FORM_REJECTED_STATUS = (400, 403, 419, 440)
+    # ...or a 200 page with one of these errors (whole phrases: result pages carry csrf fields too)
+    _FORM_REJECTED_TEXT = ('invalid token', 'csrf token mismatch', 'invalid csrf', 'session expired',
+                           'session has expired', 'session timeout')
+
+    def __init__(self, session=None, store: Optional[CauseListStore]=None,
+                 scheduler: Optional[RequestScheduler]=None, default_priority: str = 'interactive',
+                 hedger: Optional[Hedger]=None, timeouts: Optional[AdaptiveTimeouts]=None,
+                 case_cache: Optional[CaseCache]=None, session_store: Optional[SessionStore]=None):
+        # the requests session is created on first use (see the `s` property), so building a
+        # scraper (e.g. at worker or web app start) doesn't import requests
+        self._session = self._configure_session(session) if session is not None else None
+        self._session_lock = threading.Lock()
+        self._form = None  # (expires, parsed cause-list form), see _cause_list_form
+        # cookies and form tokens shared with other processes (see sessionstore.py); enabled by
+        # default when $ECOURTS_SESSION_STORE is set
+        if session_store is None and os.environ.get('ECOURTS_SESSION_STORE'):
+            session_store = SessionStore()
+        self.session_store = session_store
+        self._state_lock = threading.RLock()
+        self._session_generation = None  # generation of the snapshot this session matches
+        self._session_mark = None
+        self._session_saved = 0.0
+        if self._session is not None:
+            self._restore_session(self._session)
+        # upstream request scheduler shared by every caller of this instance (see scheduling.py);
+        # falls back to the process-wide one configured by $ECOURTS_RATE
+        self.scheduler = scheduler or shared_scheduler()
+        self.default_priority = default_priority
+        # hedged GETs for slow idempotent endpoints (see latency.py); enabled by $ECOURTS_HEDGE
+        self.hedger = hedger or hedger_from_env()
+        # connect/read timeouts learned per endpoint (see latency.py), sharing the hedger's numbers
+        self.timeouts = timeouts if timeouts is not None else \
+            adaptive_timeouts_from_env(self.hedger.tracker if self.hedger else None)
+        self._local = threading.local()
+        # local cause-list store (filled by the prefetcher); enabled by default when $ECOURTS_STORE is set
+        if store is None and os.environ.get('ECOURTS_STORE'):
+            store = CauseListStore()
+        self.store = store
+        # case status results (see casecache.py); enabled by default when $ECOURTS_CASE_CACHE is set
+        if case_cache is None and os.environ.get('ECOURTS_CASE_CACHE'):
+            case_cache = CaseCache()
+        self.case_cache = case_cache
+        self._revalidating = set()
+
+    @staticmethod
+    def _configure_session(session):
+        session.headers.update({
+            'User-Agent': 'ecourts-scraper/0.1 (+https://example.local)',
+            'Accept-Encoding': _accept_encoding(),
         })
+        return session
+
+    @property
+    def s(self):
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    session = self._configure_session(requests.Session())
+                    self._restore_session(session)
+                    self._session = session
+        return self._session
+
+    @s.setter
+    def s(self, session):
+        self._session = session
+        self._form = None
+        self._session_generation = self._session_mark = None
+
+    @staticmethod
+    def _session_fingerprint(cookies, form):
+        return tuple((c['name'], c['value'], c['domain']) for c in cookies), form[0] if form else None
+
+    def _restore_session(self, session):
+        """Start session from the shared snapshot, if there is an unexpired one."""
+        if self.session_store is None or not isinstance(getattr(session, 'cookies', None), CookieJar):
+            return
+        snap = self.session_store.load()
+        if snap:
+            self._adopt_session(session, snap)
+
+    def _adopt_session(self, session, snap):
+        with self._state_lock:
+            session.cookies.clear()
+            restore_cookies(session.cookies, snap['cookies'])
+            tokens = snap.get('tokens') or {}
+            if tokens.get('form') and tokens.get('form_expires', 0) > time.time():
+                self._form = (tokens['form_expires'], form_from_json(tokens['form']))
+            else:
+                self._form = None
+            self._session_generation = snap['generation']
+            self._session_mark = self._session_fingerprint(jar_cookies(session.cookies), self._form)
+            self._session_saved = snap['saved']
+
+    def _save_session(self):
+        """Write cookies and form tokens to the session store if they changed (or the snapshot is
+        half way to expiring, since upstream extends sessions that are in use)."""
+        store = self.session_store
+        if store is None or not isinstance(getattr(self._session, 'cookies', None), CookieJar):
+            return
+        with self._state_lock:
+            cookies, form = jar_cookies(self._session.cookies), self._form
+            mark = self._session_fingerprint(cookies, form)
+            if not cookies and not form:
+                return
+            if mark == self._session_mark and time.time() - self._session_saved < store.ttl / 2:
+                return
+            tokens = {'form': form[1], 'form_expires': form[0]} if form else {}
+            try:
+                self._session_generation = store.save(cookies, tokens)
+            except OSError:
+                return  # sharing the session is an optimisation; keep working without it
+            self._session_mark, self._session_saved = mark, time.time()
+
+    def _session_rejected(self, seen: Optional[int]) -> bool:
+        """Upstream rejected the session of snapshot generation `seen`. Adopts a newer snapshot
+        (another worker already refreshed) and returns True, or drops the form tokens (and, with a
+        session store, the snapshot and cookies) and returns False: a new session is needed."""
+        with self._state_lock:
+            if self._form is not None and self._session_generation != seen:
+                return True  # another thread of this process has moved on already
+            store = self.session_store
+            snap = store.load() if store is not None else None
+            if snap and snap['generation'] != seen and (snap.get('tokens') or {}).get('form'):
+                self._adopt_session(self.s, snap)
+                return self._form is not None
+            self._form = None
+            if store is not None:
+                store.invalidate(seen)
+                if isinstance(getattr(self._session, 'cookies', None), CookieJar):
+                    self._session.cookies.clear()
+                self._session_generation = self._session_mark = None
+            return False
 
-    def _get(self, url, params=None, timeout=15, retries=3, backoff=1.0) -> Dict[str, Any]:
+    @contextmanager
+    def priority(self, cls: str):
+        """Run the enclosed calls (in this thread) under the given priority class:
+        'interactive', 'prefetch' or 'bulk'."""
+        prev = getattr(self._local, 'priority', None)
+        self._local.priority = cls
+        try:
+            yield self
+        finally:
+            self._local.priority = prev
+
+    @contextmanager
+    def working_dir(self, path: Optional[str]):
+        """Resolve default output paths of the enclosed calls (in this thread) against path instead
+        of the process's working directory; the daemon runs each client's calls in its directory."""
+        prev = getattr(self._local, 'cwd', None)
+        self._local.cwd = path
+        try:
+            yield self
+        finally:
+            self._local.cwd = prev
+
+    def _local_path(self, path: str) -> str:
+        cwd = getattr(self._local, 'cwd', None)
+        return os.path.join(cwd, path) if cwd else path
+
+    def deadline(self, seconds: Optional[float]):
+        """Bound the enclosed calls (in this thread) to `seconds` in total. Nested deadlines can
+        only shorten the outer one; None leaves it unchanged."""
+        return self._deadline_at(None if seconds is None else time.monotonic() + seconds)
+
+    @contextmanager
+    def _deadline_at(self, end: Optional[float]):
+        prev = getattr(self._local, 'deadline', None)
+        if end is not None:
+            self._local.deadline = end if prev is None else min(prev, end)
+        try:
+            yield self
+        finally:
+            self._local.deadline = prev
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the current thread's deadline, or None without one."""
+        end = getattr(self._local, 'deadline', None)
+        return None if end is None else end - time.monotonic()
+
+    def _budget(self, timeout=None):
+        """timeout (seconds or a (connect, read) pair) cut to the remaining budget; raises
+        DeadlineExceeded when nothing is left."""
+        left = self.remaining()
+        if left is None:
+            return timeout
+        if left <= 0:
+            raise DeadlineExceeded()
+        if isinstance(timeout, tuple):
+            return tuple(min(t, left) for t in timeout)
+        return left if timeout is None else min(timeout, left)
+
+    def _timeout(self, endpoint: str, default: float):
+        """Timeout for one attempt: learned for the endpoint when possible, else default; cut to
+        the remaining budget."""
+        if self.timeouts is not None:
+            return self._budget(self.timeouts.timeout(endpoint, default))
+        return self._budget(default)
+
+    def _observe(self, endpoint: str, start: float, r=None, stream: bool = False):
+        """Record an attempt's latency (r=None for a timed-out attempt) for adaptive timeouts
+        and hedging."""
+        elapsed = time.monotonic() - start
+        size = None
+        if r is not None:
+            length = r.headers.get('content-length')
+            body = None if stream else getattr(r, 'content', None)
+            size = int(length) if length and length.isdigit() else (len(body) if body is not None else None)
+        if self.timeouts is not None:
+            self.timeouts.record(endpoint, elapsed, size)
+        if self.hedger is not None and (self.timeouts is None or self.hedger.tracker is not self.timeouts.tracker):
+            self.hedger.tracker.record(endpoint, elapsed)
+
+    def _ms(self, timeout_ms: float) -> float:
+        """Playwright timeout (milliseconds) cut to the remaining budget."""
+        return self._budget(timeout_ms / 1000.0) * 1000.0
+
+    def _sleep(self, seconds: float):
+        """Back-off sleep; gives up right away if the deadline would pass during it."""
+        left = self.remaining()
+        if left is not None and left <= seconds:
+            raise DeadlineExceeded()
+        time.sleep(seconds)
+
+    def _out_of_time(self) -> bool:
+        left = self.remaining()
+        return left is not None and left <= 0
+
+    def _within_deadline(self, chunks):
+        for chunk in chunks:
+            self._budget()
+            yield chunk
+
+    def _acquire_slot(self):
+        """Wait for a scheduler slot; returns the function that gives it back (only the first
+        call releases it)."""
+        if self.scheduler is None:
+            self._budget()
+            return lambda: None
+        cls = getattr(self._local, 'priority', None) or self.default_priority
+        if not self.scheduler.acquire(cls, timeout=self._budget()):
+            raise DeadlineExceeded()
+        calls = itertools.count()
+
+        def release():
+            if next(calls) == 0:
+                self.scheduler.release()
+        return release
+
+    @contextmanager
+    def _slot(self):
+        release = self._acquire_slot()
+        try:
+            yield
+        finally:
+            release()
+
+    def _get(self, url, params=None, timeout=15, retries=3, backoff=1.0, stream=False,
+             hedge=False) -> Dict[str, Any]:
         """GET with retries. Returns dict with either 'response' or 'error'.
 
+        With stream=True the body is left unread so callers can consume it incrementally.
         Error structure: {'error': 'HTTP 400', 'status': 400, 'url': url}
+        Under a deadline each attempt's timeout is cut to the time left, and running out returns
+        deadline_error(url). hedge=True (idempotent requests only) lets a configured hedger send
+        a second copy of a slow attempt.
         """
+        try:
+            return self._get_with_retries(url, params, timeout, retries, backoff, stream, hedge)
+        except DeadlineExceeded:
+            return deadline_error(url)
+
+    def _get_with_retries(self, url, params, timeout, retries, backoff, stream, hedge=False):
+        import requests
         attempt = 0
         while attempt <= retries:
             try:
-                r = self.s.get(url, params=params, timeout=timeout)
+                if hedge and self.hedger is not None:
+                    r = self._hedged_send(url, params, timeout, stream)
+                else:
+                    r = self._send(url, params, timeout, stream)
             except requests.RequestException as exc:
                 if attempt == retries:
-                    return {'error': str(exc)}
+                    # a timeout cut short by the deadline is reported as the deadline
+                    return deadline_error(url) if self._out_of_time() else {'error': str(exc)}
                 attempt += 1
-                time.sleep(backoff * (2 ** (attempt-1)))
+                self._sleep(backoff * (2 ** (attempt-1)))
                 continue
 
             if 200 <= r.status_code < 300:
+                self._save_session()
                 return {'response': r}
 
             if r.status_code == 429 and attempt < retries:
-                time.sleep(backoff * (2 ** attempt))
+                r.close()
+                self._sleep(backoff * (2 ** attempt))
                 attempt += 1
                 continue
 
-            return {'error': f'HTTP {r.status_code}', 'status': r.status_code, 'url': url, 'text': r.text[:200]}
-
-
-    def check_by_cnr(self, cnr, download_pdf=False):
+            try:
+                return {'error': f'HTTP {r.status_code}', 'status': r.status_code, 'url': url, 'text': r.text[:200]}
+            finally:
+                r.close()
+
+    def _send(self, url, params, timeout, stream):
+        """One GET attempt in a scheduler slot; its latency (to the response headers) is recorded.
+
+        A streamed response keeps its slot until it is closed (or garbage collected), so the
+        scheduler's concurrency cap also covers bodies that are still being read."""
+        import requests
+        endpoint = endpoint_key(url, params)
+        release = self._acquire_slot()
+        start = time.monotonic()
+        try:
+            r = self.s.get(url, params=params, timeout=self._timeout(endpoint, timeout), stream=stream)
+        except requests.Timeout:
+            release()
+            self._observe(endpoint, start)
+            raise
+        except BaseException:
+            release()
+            raise
+        if stream:
+            _release_on_close(r, release)
+        else:
+            release()
+        self._observe(endpoint, start, r, stream)
+        return r
+
+    def _hedged_send(self, url, params, timeout, stream):
+        # the hedge runs on the hedger's threads: carry this thread's priority and deadline over
+        cls = getattr(self._local, 'priority', None)
+        end = getattr(self._local, 'deadline', None)
+
+        def attempt():
+            with self.priority(cls), self._deadline_at(end):
+                return self._send(url, params, timeout, stream)
+        return self.hedger.run(endpoint_key(url, params), attempt, discard=lambda r: r.close())
+
+    @_budgeted
+    def check_by_cnr(self, cnr, download_pdf=False, max_age: Optional[float]=None):
+        """Case status by CNR. With a case cache, a cached result is returned while it is fresh:
+        younger than max_age seconds if given (0 always asks upstream), else than the TTL its
+        hearing dates imply."""
+        return self._cached_case(case_key(cnr), lambda: self._fetch_by_cnr(cnr, download_pdf),
+                                 max_age, download_pdf)
+
+    @_budgeted
+    def check_by_details(self, case_type, number, year, download_pdf=False, max_age: Optional[float]=None):
+        """Case status by type/number/year; caching as for check_by_cnr."""
+        return self._cached_case(case_key(case_type=case_type, number=number, year=year),
+                                 lambda: self._fetch_by_details(case_type, number, year, download_pdf),
+                                 max_age, download_pdf)
+
+    def _fetch_by_cnr(self, cnr, download_pdf=False):
         url = self.BASE + 'case/cnrSearch'
         params = {'cnr': cnr}
-        out = self._get(url, params=params)
+        out = self._get(url, params=params, hedge=True)
         if 'error' in out:
             return out
         r = out['response']
         data = r.json() if r.headers.get('content-type','').startswith('application/json') else r.text
         return self._parse_case_response(data, download_pdf)
 
-    def check_by_details(self, case_type, number, year, download_pdf=False):
+    def _fetch_by_details(self, case_type, number, year, download_pdf=False):
         url = self.BASE + 'case/search'
         params = {'casetype': case_type, 'cno': number, 'cyear': year}
         out = self._get(url, params=params)
@@ -104,17 +713,52 @@ class ECourtsScraper:
         data = r.json() if r.headers.get('content-type','').startswith('application/json') else r.text
         return self._parse_case_response(data, download_pdf)
 
+    def _cached_case(self, key, fetch, max_age=None, download_pdf=False):
+        # a PDF download needs the lookup itself, not a cached copy
+        if self.case_cache is None or download_pdf:
+            return fetch()
+        entry = self.case_cache.get(key)
+        if entry is not None:
+            age = time.time() - entry['fetched']
+            if age <= (entry['ttl'] if max_age is None else max_age):
+                return entry['result']
+            if max_age is None and age <= entry['ttl'] + self.case_cache.stale_window(entry['ttl']):
+                # serve the stale copy now and refresh it for the next caller
+                self._revalidate(key, fetch)
+                return entry['result']
+        return self._store_case(key, fetch())
+
+    def _store_case(self, key, res):
+        if not (isinstance(res, dict) and 'error' in res):
+            self.case_cache.put(key, res, case_ttl(res))
+        return res
+
+    def _revalidate(self, key, fetch):
+        with self._session_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def refresh():
+            try:
+                with self.priority('prefetch'):
+                    self._store_case(key, fetch())
+            finally:
+                with self._session_lock:
+                    self._revalidating.discard(key)
+        # not a daemon thread: a CLI run prints the stale result, then finishes the refresh before exiting
+        threading.Thread(target=refresh, name='ecourts-revalidate').start()
+
     def _parse_case_response(self, data, download_pdf=False):
         if isinstance(data, dict):
             listing = data.get('listing') or data.get('data') or data
             serial = listing.get('serial') if isinstance(listing, dict) else None
             court = listing.get('court') if isinstance(listing, dict) else None
-            out = {'raw': listing}
             if serial or court:
-                out.update({'serial': serial, 'court': court})
-            return out
+                return CaseListing.make(raw=listing, serial=serial, court=court)
+            return CaseListing.make(raw=listing)
 
-        soup = BeautifulSoup(data, 'html.parser')
+        soup = _soup(data)
         rows = []
         table = soup.find('table')
         if table:
@@ -122,9 +766,9 @@ class ECourtsScraper:
             for tr in table.find_all('tr'):
                 cols = [td.get_text(strip=True) for td in tr.find_all('td')]
                 if cols:
-                    rows.append(cols)
+                    rows.append(tuple(cols))
 
-            parsed = {'rows': rows}
+            parsed = CaseListing.make(rows=rows)
             if headers:
                 hmap = {i: h for i, h in enumerate(headers)}
                 serial_idx = None
@@ -138,9 +782,9 @@ class ECourtsScraper:
                 if rows:
                     first = rows[0]
                     if serial_idx is not None and serial_idx < len(first):
-                        parsed['serial'] = first[serial_idx]
+                        parsed.serial = sys.intern(first[serial_idx])
                     if court_idx is not None and court_idx < len(first):
-                        parsed['court'] = first[court_idx]
+                        parsed.court = sys.intern(first[court_idx])
 
             pdf_link = None
             a = table.find('a', href=True, string=lambda s: s and 'PDF' in s.upper()) if table else None
@@ -150,31 +794,29 @@ class ECourtsScraper:
                 pdf_link = a['href']
             if pdf_link and download_pdf:
                 fname = self._download_file(pdf_link)
-                parsed['pdf'] = fname
+                parsed.pdf = fname
             return parsed
 
         text_rows = [p.get_text(strip=True) for p in soup.find_all('p') if p.get_text(strip=True)]
-        return {'text_rows': text_rows[:20]}
+        return CaseListing.make(text_rows=text_rows[:20])
 
-    def _download_file(self, url, dest_dir='downloads'):
+    def _download_file(self, url, dest_dir='downloads', compress=None):
+        dest_dir = self._local_path(dest_dir)
         os.makedirs(dest_dir, exist_ok=True)
-        local = os.path.join(dest_dir, os.path.basename(url.split('?')[0]))
-        r = self.s.get(url, stream=True, timeout=30)
-        if r.status_code == 200:
-            with open(local, 'wb') as f:
-                for chunk in r.iter_content(1024*8):
-                    f.write(chunk)
-            return local
-        return None
-
-    def download_cause_list(self, date: datetime.date, state: Optional[str]=None, district: Optional[str]=None,
-                            complex_code: Optional[str]=None, est_code: Optional[str]=None, court_no: Optional[str]=None):
-        """Download the cause list HTML for a given date and optional selectors.
+        local = _archive_path(os.path.join(dest_dir, os.path.basename(url.split('?')[0])), compress)
+        r = self._send(url, None, 30, stream=True)
+        try:
+            if r.status_code == 200:
+                with open_archive(local, 'wb') as f:
+                    for chunk in r.iter_content(1024*8):
+                        f.write(chunk)
+                return local
+            return None
+        finally:
+            r.close()
 
-        The eCourts endpoint expects parameters for state/district/complex and date in dd-mm-YYYY.
-        Returns filename or error dict.
-        """
-        url = self.BASE + 'causeList/causelists'
+    def _cause_list_params(self, date: datetime.date, state=None, district=None, complex_code=None,
+                           est_code=None, court_no=None) -> Dict[str, str]:
         params = {}
         if state is not None:
             params['sess_state_code'] = state
@@ -187,16 +829,188 @@ class ECourtsScraper:
         if court_no is not None:
             params['CL_court_no'] = court_no
         params['CauseListDate'] = date.strftime('%d-%m-%Y')
+        return params
 
-        out = self._get(url, params=params)
+    @_budgeted
+    def download_cause_list(self, date: datetime.date, state: Optional[str]=None, district: Optional[str]=None,
+                            complex_code: Optional[str]=None, est_code: Optional[str]=None, court_no: Optional[str]=None,
+                            compress: Optional[str]=None, refresh: bool = False, dest_dir: Optional[str]=None):
+        """Download the cause list HTML for a given date and optional selectors.
+
+        The eCourts endpoint expects parameters for state/district/complex and date in dd-mm-YYYY.
+        The body is streamed to disk in chunks; compress='gz'|'zst' stores it compressed.
+        With a local store configured, stored copies are returned without a request and
+        new downloads are written into the store (refresh=True re-downloads and replaces
+        the stored copy). Without a store the file is written to dest_dir (default: the
+        current directory). Returns filename or error dict.
+        """
+        selectors = (state, district, complex_code, est_code, court_no)
+        if self.store:
+            stored = None if refresh else self.store.get(date, *selectors)
+            if stored:
+                return stored
+            fname = self.store.path_for(date, *selectors)
+            os.makedirs(os.path.dirname(fname), exist_ok=True)
+        else:
+            fname = _archive_path(os.path.join(self._local_path(dest_dir or ''), f'causelist_{date.isoformat()}.html'),
+                                  compress)
+
+        url = self.BASE + 'causeList/causelists'
+        params = self._cause_list_params(date, *selectors)
+        out = self._get(url, params=params, stream=True, hedge=True)
         if 'error' in out:
             return out
         r = out['response']
-        fname = f'causelist_{date.isoformat()}.html'
-        with open(fname, 'wb') as f:
-            f.write(r.content)
+        tmp = _part_path(fname)
+        try:
+            # write to a temporary name so readers never see a half-written file
+            with open_archive(tmp, 'wb') as f:
+                for chunk in self._within_deadline(r.iter_content(1024*16)):
+                    f.write(chunk)
+            os.replace(tmp, fname)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        finally:
+            r.close()
         return fname
 
+    def stored_cause_list(self, date: datetime.date, state=None, district=None, complex_code=None,
+                          est_code=None, court_no=None) -> Optional[str]:
+        """Path of the locally stored cause list for these selectors, or None."""
+        if not self.store:
+            return None
+        return self.store.get(date, state, district, complex_code, est_code, court_no)
+
+    def _serial_court(self, headers, cols):
+        return _serial_court(headers, cols)
+
+    def _row_matches(self, query: str, cols) -> bool:
+        return row_matches(query, cols)
+
+    @_budgeted
+    def iter_cause_list_rows(self, date: datetime.date, state: Optional[str]=None, district: Optional[str]=None,
+                             complex_code: Optional[str]=None, est_code: Optional[str]=None,
+                             court_no: Optional[str]=None, archive_path: Optional[str]=None,
+                             chunk_size: int = 1024*16) -> Iterator[Dict[str, Any]]:
+        """Stream the cause list for date and yield parsed rows while the download is in progress.
+
+        Each row is {'cols': [...], 'serial': str|None, 'court': str|None, 'pdf': url|None, 'links': [url, ...]}.
+        If archive_path is given the raw bytes are also written there as they arrive
+        (compressed when it ends in .gz/.zst). A local store copy is parsed from disk instead,
+        and a store miss is archived into the store unless archive_path says otherwise.
+        On failure a single {'error': ...} dict is yielded.
+        """
+        selectors = (state, district, complex_code, est_code, court_no)
+        stored = self.stored_cause_list(date, *selectors)
+        if stored:
+            yield from self.iter_rows_from_file(stored, chunk_size=chunk_size)
+            return
+        if self.store and not archive_path:
+            archive_path = self.store.path_for(date, *selectors)
+            os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+
+        url = self.BASE + 'causeList/causelists'
+        params = self._cause_list_params(date, *selectors)
+        out = self._get(url, params=params, stream=True, hedge=True)
+        if 'error' in out:
+            yield out
+            return
+        r = out['response']
+        yield from self._iter_rows_from_chunks(self._within_deadline(r.iter_content(chunk_size)),
+                                               self._response_encoding(r),
+                                               archive_path=archive_path, on_close=r.close)
+
+    def iter_rows_from_file(self, path: str, chunk_size: int = 1024*16) -> Iterator[Dict[str, Any]]:
+        """Yield parsed rows from a saved (optionally compressed) cause list, reading it in chunks."""
+        f = open_archive(path, 'rb')
+        yield from self._iter_rows_from_chunks(iter(lambda: f.read(chunk_size), b''), on_close=f.close)
+
+    def _response_encoding(self, r) -> str:
+        if 'charset' in r.headers.get('content-type', '').lower() and r.encoding:
+            return r.encoding
+        return 'utf-8'
+
+    def _iter_rows_from_chunks(self, chunks, encoding='utf-8', archive_path=None, on_close=None):
+        parser = _CauseListRowParser()
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        # the archive is written under a temporary name and only renamed once the stream is complete
+        tmp = _part_path(archive_path) if archive_path else None
+        archive = open_archive(tmp, 'wb') if archive_path else None
+        complete = False
+        try:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                if archive:
+                    archive.write(chunk)
+                parser.feed(decoder.decode(chunk))
+                for row in parser.drain():
+                    yield self._stream_row(*row)
+            parser.feed(decoder.decode(b'', final=True))
+            parser.close()
+            complete = True
+            for row in parser.drain():
+                yield self._stream_row(*row)
+        finally:
+            if archive:
+                archive.close()
+                if complete:
+                    os.replace(tmp, archive_path)
+                else:
+                    os.remove(tmp)
+            if on_close:
+                on_close()
+
+    def _stream_row(self, headers, cols, links):
+        return _cause_list_row(headers, cols, links, self.BASE)
+
+    @_budgeted
+    def iter_cause_list_matches(self, date: datetime.date, query: str, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Yield rows of the streamed cause list that match query, as soon as each row is parsed.
+
+        Accepts the same selectors and archive_path as iter_cause_list_rows. Errors are passed through.
+        """
+        for row in self.iter_cause_list_rows(date, **kwargs):
+            if 'error' in row or self._row_matches(query, row['cols']):
+                yield row
+
+    @_budgeted
+    def cause_list_changes(self, date: datetime.date, state: Optional[str]=None, district: Optional[str]=None,
+                           complex_code: Optional[str]=None, est_code: Optional[str]=None,
+                           court_no: Optional[str]=None, snapshot_path: Optional[str]=None) -> Dict[str, Any]:
+        """Re-fetch a cause list and report what changed since the previous call.
+
+        Returns {'unchanged': bool, 'added': [...], 'removed': [...], 'moved': [...], 'changed': [...],
+        'file': path, 'list_hash': str}. When the raw content hash matches the last snapshot the list
+        is not parsed at all. The snapshot is kept next to the store entry (or in the working directory).
+        """
+        selectors = (state, district, complex_code, est_code, court_no)
+        if snapshot_path is None:
+            name = f'{selector_key(*selectors)}.snapshot.json'
+            if self.store:
+                snapshot_path = os.path.join(self.store.root, date.isoformat(), name)
+            else:
+                snapshot_path = self._local_path(f'causelist_{date.isoformat()}_{name}')
+
+        fname = self.download_cause_list(date, *selectors, refresh=True)
+        if isinstance(fname, dict) and 'error' in fname:
+            return fname
+        list_hash = changes.file_hash(fname)
+        previous = changes.load_snapshot(snapshot_path)
+        if previous and previous.get('list_hash') == list_hash:
+            return {'unchanged': True, 'added': [], 'removed': [], 'moved': [], 'changed': [],
+                    'file': fname, 'list_hash': list_hash}
+
+        snapshot = changes.build_snapshot(self.iter_rows_from_file(fname), list_hash=list_hash)
+        diff = changes.diff_snapshots(previous, snapshot)
+        changes.save_snapshot(snapshot, snapshot_path)
+        diff.update({'unchanged': False, 'first_fetch': previous is None, 'file': fname,
+                     'list_hash': list_hash, 'rows': len(snapshot['rows'])})
+        return diff
+
+    @_budgeted
     def search_case_in_cause_list(self, date: datetime.date, query: str) -> Dict[str, Any]:
         """Download or load cause list HTML for date and search for query string.
 
@@ -209,39 +1023,25 @@ class ECourtsScraper:
         fname = fname_or_err
         if not os.path.exists(fname):
             return {'error': f'file not found {fname}'}
-        html = open(fname, 'r', encoding='utf-8').read()
-        soup = BeautifulSoup(html, 'html.parser')
-        table = soup.find('table')
-        if not table:
+        from .archivesearch import file_may_contain
+        if not file_may_contain(fname, query):
+            # byte-level prefilter: the list cannot contain query, so skip decoding and parsing it
+            return {'found': False, 'file': fname}
+        html = read_archive_text(fname)
+        # parsed once per distinct list content; later queries only match against the rows
+        rows = cached_parse('first_table', html, lambda h: _first_table_rows(h, self.BASE), self.BASE)
+        if rows is None:
             if query in html:
                 return {'found': True, 'serial': None, 'court': None, 'pdf': None, 'file': fname}
             return {'found': False, 'file': fname}
 
-        headers = [th.get_text(strip=True).lower() for th in table.find_all('th')]
-        for tr in table.find_all('tr'):
-            cols = [td.get_text(strip=True) for td in tr.find_all('td')]
-            if not cols:
-                continue
-            row_text = ' '.join(cols)
-            if query in row_text or query.lower() in row_text.lower():
-                serial = None
-                court = None
-                for i, h in enumerate(headers):
-                    if 'serial' in h or 's. no' in h or 's.no' in h:
-                        if i < len(cols):
-                            serial = cols[i]
-                    if 'court' in h or 'bench' in h:
-                        if i < len(cols):
-                            court = cols[i]
-                a = tr.find('a', href=True)
-                pdf = None
-                if a and a['href'].lower().endswith('.pdf'):
-                    href = a['href']
-                    pdf = href if href.startswith('http') else requests.compat.urljoin(self.BASE, href)
-                return {'found': True, 'serial': serial, 'court': court, 'pdf': pdf, 'file': fname}
+        for row in rows:
+            if self._row_matches(query, row.cols):
+                return {'found': True, 'serial': row.serial, 'court': row.court, 'pdf': row.pdf, 'file': fname}
 
         return {'found': False, 'file': fname}
 
+    @_budgeted
     def get_cause_list_page(self) -> Dict[str, Any]:
         """Fetch the cause_list landing page and parse available selects/options.
 
@@ -249,22 +1049,13 @@ class ECourtsScraper:
         """
         url = self.BASE
         params = {'p': 'cause_list/'}
-        out = self._get(url, params=params)
+        out = self._get(url, params=params, hedge=True)
         r = out.get('response') if isinstance(out, dict) else None
-        selects = {}
-        if r:
-            soup = BeautifulSoup(r.text, 'html.parser')
-            for sel in soup.find_all('select'):
-                name = sel.get('name') or sel.get('id') or 'select'
-                opts = []
-                for o in sel.find_all('option'):
-                    val = o.get('value')
-                    txt = o.get_text(strip=True)
-                    opts.append((val, txt))
-                selects[name] = opts
+        selects = _parse_selects(r.text) if r else {}
         html = r.text if r else ''
         return {'options': selects, 'html': html}
 
+    @_budgeted
     def get_dependent_options(self, state=None, state_text=None, district=None, complex=None, court=None, date=None):
 
         """Fetch dependent select options from the cause_list endpoint.
@@ -298,17 +1089,7 @@ class ECourtsScraper:
 
         out = self._get(url, params=params)
         r = out.get('response') if isinstance(out, dict) else None
-        selects = {}
-        if r:
-            soup = BeautifulSoup(r.text, 'html.parser')
-            for sel in soup.find_all('select'):
-                name = sel.get('name') or sel.get('id') or 'select'
-                opts = []
-                for o in sel.find_all('option'):
-                    val = o.get('value')
-                    txt = o.get_text(strip=True)
-                    opts.append((val, txt))
-                selects[name] = opts
+        selects = _parse_selects(r.text) if r else {}
 
         def _has_meaningful_options(selects_map):
             for opts in selects_map.values():
@@ -332,17 +1113,7 @@ class ECourtsScraper:
             params2['CauseListDate'] = datetime.date.today().strftime('%d-%m-%Y')
             out2 = self._get(url, params=params2)
             if 'response' in out2:
-                r2 = out2['response']
-                soup2 = BeautifulSoup(r2.text, 'html.parser')
-                selects2 = {}
-                for sel in soup2.find_all('select'):
-                    name = sel.get('name') or sel.get('id') or 'select'
-                    opts = []
-                    for o in sel.find_all('option'):
-                        val = o.get('value')
-                        txt = o.get_text(strip=True)
-                        opts.append((val, txt))
-                    selects2[name] = opts
+                selects2 = _parse_selects(out2['response'].text)
                 for k, v in selects2.items():
                     if v:
                         selects[k] = v
@@ -357,17 +1128,7 @@ class ECourtsScraper:
                 landing_params['CauseListDate'] = date.strftime('%d-%m-%Y')
             out3 = self._get(landing_url, params=landing_params)
             if 'response' in out3:
-                r3 = out3['response']
-                soup3 = BeautifulSoup(r3.text, 'html.parser')
-                selects3 = {}
-                for sel in soup3.find_all('select'):
-                    name = sel.get('name') or sel.get('id') or 'select'
-                    opts = []
-                    for o in sel.find_all('option'):
-                        val = o.get('value')
-                        txt = o.get_text(strip=True)
-                        opts.append((val, txt))
-                    selects3[name] = opts
+                selects3 = _parse_selects(out3['response'].text)
                 for k, v in selects3.items():
                     if v:
                         selects[k] = v
@@ -379,7 +1140,7 @@ class ECourtsScraper:
                     if v:
                         selects[k] = v
 
-        if not meaningful and os.environ.get('USE_HEADLESS') == '1':
+        if not meaningful and os.environ.get('USE_HEADLESS') == '1' and not self._out_of_time():
             try:
                 head_res = self._get_dependent_options_headless(state=state, district=district, date=date)
                 if head_res:
@@ -389,12 +1150,16 @@ class ECourtsScraper:
             except Exception:
                 pass
 
+        html = r.text if r else ''
+        if self._out_of_time():
+            # best effort within the deadline: return what was found, but don't cache it
+            return {'options': selects, 'html': html, 'partial': True, 'timeout': True}
+
         try:
             self._dependent_options_cache[key] = (time.time() + self._cache_ttl, selects)
         except Exception:
             pass
 
-        html = r.text if r else ''
         return {'options': selects, 'html': html}
 
     def _try_ajax_endpoints_for_options(self, state: Optional[str] = None, district: Optional[str] = None, date: Optional[datetime.date] = None):
@@ -421,8 +1186,8 @@ class ECourtsScraper:
                             j = r.json()
                             if isinstance(j, list):
                                 results["districts"] = [
-                                    (str(it.get("id") or it.get("value") or it.get("code") or ""),
-                                     str(it.get("name") or it.get("text") or ""))
+                                    CourtOption.make(str(it.get("id") or it.get("value") or it.get("code") or ""),
+                                                     str(it.get("name") or it.get("text") or ""))
                                     for it in j
                                 ]
                                 if results["districts"]:
@@ -436,9 +1201,9 @@ class ECourtsScraper:
                         body.replace("\\/", "/").replace('\\"', '"')
                         .replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
                     )
-                    soup = BeautifulSoup(clean_html, "html.parser")
+                    soup = _soup(clean_html)
                     opts = [
-                        (o.get("value"), o.get_text(strip=True))
+                        CourtOption.make(o.get("value"), o.get_text(strip=True))
                         for o in soup.find_all("option")
                         if o.get("value") and "select" not in o.get_text(strip=True).lower()
                     ]
@@ -485,9 +1250,9 @@ class ECourtsScraper:
                                             html_str.replace("\\/", "/").replace('\\"', '"')
                                             .replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
                                         )
-                                        soup = BeautifulSoup(clean_html, "html.parser")
+                                        soup = _soup(clean_html)
                                         opts = [
-                                            (o.get("value"), o.get_text(strip=True))
+                                            CourtOption.make(o.get("value"), o.get_text(strip=True))
                                             for o in soup.find_all("option")
                                             if o.get("value") and "select" not in o.get_text(strip=True).lower()
                                         ]
@@ -503,9 +1268,9 @@ class ECourtsScraper:
                                 body.replace("\\/", "/").replace('\\"', '"')
                                 .replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
                             )
-                            soup = BeautifulSoup(clean_html, "html.parser")
+                            soup = _soup(clean_html)
                             opts = [
-                                (o.get("value"), o.get_text(strip=True))
+                                CourtOption.make(o.get("value"), o.get_text(strip=True))
                                 for o in soup.find_all("option")
                                 if o.get("value") and "select" not in o.get_text(strip=True).lower()
                             ]
@@ -537,6 +1302,15 @@ class ECourtsScraper:
             except Exception:
                 return {}
 
+        if not _on_playwright_thread():
+            # the shared browser can only be driven from its thread; take this thread's deadline along
+            end = getattr(self._local, 'deadline', None)
+
+            def run():
+                with self._deadline_at(end):
+                    return self._get_dependent_options_headless(state=state, district=district, date=date)
+            return _playwright_thread().submit(run).result()
+
         # clean execution of page interactions
         page = None
         tmp_browser = None
@@ -550,7 +1324,7 @@ class ECourtsScraper:
                 try:
                     page = browser.new_page()
                     print('DEBUG: opened page on shared browser')
-                    page.goto(self.BASE + '?p=cause_list/', timeout=20000)
+                    page.goto(self.BASE + '?p=cause_list/', timeout=self._ms(20000))
                     print('DEBUG: page.goto done (shared)')
                 except Exception as e:
                     print('DEBUG: shared browser page/goto error', e)
@@ -564,7 +1338,7 @@ class ECourtsScraper:
                     tmp_playwright = sync_playwright().start()
                     tmp_browser = tmp_playwright.chromium.launch(headless=True)
                     page = tmp_browser.new_page()
-                    page.goto(self.BASE + '?p=cause_list/', timeout=20000)
+                    page.goto(self.BASE + '?p=cause_list/', timeout=self._ms(20000))
                     used_temp = True
                     print('DEBUG: temporary playwright started and page loaded')
                 except Exception as exc:
@@ -611,7 +1385,7 @@ class ECourtsScraper:
             # wait briefly for district options
             for sel in ['select[name="sees_dist_code"]', 'select[name="sess_dist_code"]', 'select[name="district"]', 'select[id="sees_dist_code"]', 'select[id="sess_dist_code"]']:
                 try:
-                    page.wait_for_selector(f"{sel} option:not([value='']), {sel} option[value]:not([value='0'])", timeout=1500)
+                    page.wait_for_selector(f"{sel} option:not([value='']), {sel} option[value]:not([value='0'])", timeout=self._ms(1500))
                     break
                 except Exception:
                     continue
@@ -637,12 +1411,12 @@ class ECourtsScraper:
 
             # wait for complex or court options to populate
             try:
-                page.wait_for_selector('select[name="court_complex_code"] option:not([value=""])', timeout=2000)
+                page.wait_for_selector('select[name="court_complex_code"] option:not([value=""])', timeout=self._ms(2000))
             except Exception:
                 try:
-                    page.wait_for_selector('select[name="CL_court_no"] option:not([value=""])', timeout=2000)
+                    page.wait_for_selector('select[name="CL_court_no"] option:not([value=""])', timeout=self._ms(2000))
                 except Exception:
-                    page.wait_for_timeout(500)
+                    page.wait_for_timeout(self._ms(500))
 
             selects = _collect_selects_from_page()
             print('DEBUG: collected selects (count)', len(selects))
@@ -684,9 +1458,9 @@ class ECourtsScraper:
                         except Exception:
                             pass
                 try:
-                    page.wait_for_selector('select[name="CL_court_no"] option:not([value=""])', timeout=2000)
+                    page.wait_for_selector('select[name="CL_court_no"] option:not([value=""])', timeout=self._ms(2000))
                 except Exception:
-                    page.wait_for_timeout(500)
+                    page.wait_for_timeout(self._ms(500))
 
             # final collection
             selects = _collect_selects_from_page()
@@ -742,7 +1516,7 @@ class ECourtsScraper:
             p = sync_playwright().start()
             browser = p.chromium.launch(headless=True)
             page = browser.new_page()
-            page.goto(self.BASE + '?p=cause_list/', timeout=30000)
+            page.goto(self.BASE + '?p=cause_list/', timeout=self._ms(30000))
 
             # select state if provided
             if state:
@@ -754,7 +1528,7 @@ class ECourtsScraper:
 
             # wait briefly for district options
             try:
-                page.wait_for_selector('select[name="sees_dist_code"] option:not([value=""]), select[name="district"] option:not([value=""])', timeout=2000)
+                page.wait_for_selector('select[name="sees_dist_code"] option:not([value=""]), select[name="district"] option:not([value=""])', timeout=self._ms(2000))
             except Exception:
                 pass
 
@@ -789,36 +1563,56 @@ class ECourtsScraper:
             return {}
 
     def _find_captcha_url(self, html: str) -> Optional[str]:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = _soup(html)
         img = soup.find('img', {'id': 'captcha_img'}) or soup.find('img', {'alt': 'captcha'})
         if img and img.get('src'):
             src = img['src']
             if src.startswith('http'):
                 return src
-            return requests.compat.urljoin(self.BASE, src)
+            return urljoin(self.BASE, src)
         for img in soup.find_all('img', src=True):
             if 'captcha' in img.get('src','').lower() or 'captcha' in img.get('alt','').lower():
                 src = img['src']
-                return requests.compat.urljoin(self.BASE, src)
+                return urljoin(self.BASE, src)
         return None
 
     def _post(self, url, data=None, timeout=15, retries=2, backoff=1.0):
+        import requests
+        endpoint = endpoint_key(url, data)
         attempt = 0
         while attempt <= retries:
+            start = time.monotonic()
             try:
-                r = self.s.post(url, data=data, timeout=timeout)
+                with self._slot():
+                    start = time.monotonic()
+                    r = self.s.post(url, data=data, timeout=self._timeout(endpoint, timeout))
+                self._observe(endpoint, start, r)
+            except DeadlineExceeded:
+                return deadline_error(url)
             except requests.RequestException as exc:
+                if isinstance(exc, requests.Timeout):
+                    self._observe(endpoint, start)
                 if attempt == retries:
                     return {'error': str(exc)}
                 attempt += 1
-                time.sleep(backoff * (2 ** (attempt-1)))
+                try:
+                    self._sleep(backoff * (2 ** (attempt-1)))
+                except DeadlineExceeded:
+                    return deadline_error(url)
                 continue
             if 200 <= r.status_code < 300:
+                self._save_session()
                 return {'response': r}
             return {'error': f'HTTP {r.status_code}', 'status': r.status_code, 'text': r.text[:200]}
 
     def parse_cause_list_form(self, html: str) -> Dict[str, Any]:
-        soup = BeautifulSoup(html, 'html.parser')
+        parsed = cached_parse('form', html, self._parse_cause_list_form, self.BASE)
+        if 'fields' in parsed:
+            parsed.update(fields=dict(parsed['fields']), hidden=dict(parsed['hidden']))
+        return parsed
+
+    def _parse_cause_list_form(self, html: str) -> Dict[str, Any]:
+        soup = _soup(html)
         form = soup.find('form')
         if not form:
             return {'error': 'no form found'}
@@ -829,21 +1623,38 @@ class ECourtsScraper:
             if not name:
                 continue
             if inp.name == 'select':
-                fields[name] = [ (o.get('value'), o.get_text(strip=True)) for o in inp.find_all('option') ]
+                fields[name] = [CourtOption.make(o.get('value'), o.get_text(strip=True)) for o in inp.find_all('option')]
             else:
                 fields[name] = inp.get('value','')
         hidden = {i.get('name'): i.get('value','') for i in form.find_all('input', {'type': 'hidden'}) if i.get('name')}
-        return {'action': requests.compat.urljoin(self.BASE, action), 'fields': fields, 'hidden': hidden}
+        return {'action': urljoin(self.BASE, action), 'fields': fields, 'hidden': hidden}
 
-    def submit_cause_list_form(self, state, district, complex_value, court_name, date, captcha) -> Dict[str, Any]:
-        page = self.get_cause_list_page()
-        if 'error' in page:
-            return page
-        html = page['html']
-        parsed = self.parse_cause_list_form(html)
-        if 'error' in parsed:
-            return parsed
-        action = parsed['action']
+    def _cause_list_form(self, refresh: bool = False) -> Dict[str, Any]:
+        """Parsed cause-list form (action, fields, hidden tokens), cached for this session.
+
+        The landing page is fetched and parsed once, then reused until _form_ttl passes or
+        refresh=True (after the server rejected a submission).
+        """
+        cached = self._form
+        if cached and not refresh and cached[0] > time.time():
+            return cached[1]
+        out = self._get(self.BASE, params={'p': 'cause_list/'})
+        if 'error' in out:
+            return out
+        parsed = self.parse_cause_list_form(out['response'].text)
+        if 'error' not in parsed:
+            self._form = (time.time() + self._form_ttl, parsed)
+            self._save_session()
+        return parsed
+
+    def _form_rejected(self, out) -> bool:
+        if 'error' in out:
+            return out.get('status') in self._FORM_REJECTED_STATUS
+        text = out['response'].text[:4096].lower()
+        return any(marker in text for marker in self._FORM_REJECTED_TEXT)
+
+    @staticmethod
+    def _cause_list_form_data(parsed, state, district, complex_value, court_name, date, captcha):
         data = {}
         data.update(parsed.get('hidden', {}))
         for k in ['state','district','complex','court','CauseListDate','cause_list_date']:
@@ -866,8 +1677,24 @@ class ECourtsScraper:
                 data[captcha_field] = captcha
         if 'captcha' not in data:
             data['captcha'] = captcha
+        return data
 
-        out = self._post(action, data=data)
+    @_budgeted
+    def submit_cause_list_form(self, state, district, complex_value, court_name, date, captcha) -> Dict[str, Any]:
+        """Submit the cause-list form. The form schema and hidden tokens are cached, so a repeat
+        submission is a single POST; if the server rejects the tokens they are replaced once, by
+        a newer shared session if another worker has saved one, else by a fresh session."""
+        refresh = False
+        for attempt in range(2):
+            parsed = self._cause_list_form(refresh=refresh)
+            if 'error' in parsed:
+                return parsed
+            seen = self._session_generation
+            data = self._cause_list_form_data(parsed, state, district, complex_value, court_name, date, captcha)
+            out = self._post(parsed['action'], data=data)
+            if not self._form_rejected(out):
+                break
+            refresh = not self._session_rejected(seen)
         if 'error' in out:
             return out
         r = out['response']
@@ -880,7 +1707,12 @@ class ECourtsScraper:
 
         Returns {'links': [url, ...]} or {'error': ...}
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        found = cached_parse('links', html, lambda h: self._find_cause_list_links(h, date),
+                             self.BASE, date.isoformat() if date else None)
+        return {'links': list(found['links'])}
+
+    def _find_cause_list_links(self, html: str, date: Optional[datetime.date]=None) -> Dict[str, Any]:
+        soup = _soup(html)
         anchors = soup.find_all('a', href=True)
         links = []
         for a in anchors:
@@ -889,7 +1721,7 @@ class ECourtsScraper:
                 if href.startswith('http'):
                     links.append(href)
                 else:
-                    links.append(requests.compat.urljoin(self.BASE, href))
+                    links.append(urljoin(self.BASE, href))
 
         if date and not links:
             date_str = date.strftime('%d-%m-%Y')
@@ -899,25 +1731,34 @@ class ECourtsScraper:
                     if href.startswith('http'):
                         links.append(href)
                     else:
-                        links.append(requests.compat.urljoin(self.BASE, href))
+                        links.append(urljoin(self.BASE, href))
 
         return {'links': links}
 
-    def download_urls(self, urls, dest_dir='downloads'):
+    @_budgeted
+    def download_urls(self, urls, dest_dir='downloads', compress=None):
+        import requests
+        dest_dir = self._local_path(dest_dir)
         os.makedirs(dest_dir, exist_ok=True)
         saved = []
         for url in urls:
             try:
-                r = self.s.get(url, stream=True, timeout=30)
+                r = self._send(url, None, 30, stream=True)
+            except DeadlineExceeded:
+                saved.append(deadline_error(url))
+                continue
             except requests.RequestException as e:
                 saved.append({'url': url, 'error': str(e)})
                 continue
-            if r.status_code == 200:
-                fname = os.path.join(dest_dir, os.path.basename(url.split('?')[0]))
-                with open(fname, 'wb') as f:
-                    for chunk in r.iter_content(1024*8):
-                        f.write(chunk)
-                saved.append({'url': url, 'path': fname})
-            else:
-                saved.append({'url': url, 'error': f'HTTP {r.status_code}'})
+            try:
+                if r.status_code == 200:
+                    fname = _archive_path(os.path.join(dest_dir, os.path.basename(url.split('?')[0])), compress)
+                    with open_archive(fname, 'wb') as f:
+                        for chunk in r.iter_content(1024*8):
+                            f.write(chunk)
+                    saved.append({'url': url, 'path': fname})
+                else:
+                    saved.append({'url': url, 'error': f'HTTP {r.status_code}'})
+            finally:
+                r.close()
         return {'saved': saved}
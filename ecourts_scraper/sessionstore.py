@@ -0,0 +1,120 @@
+"""Session snapshots (cookies and form tokens) shared by every process on a host.
+
+eCourts ties its forms to a PHP session cookie that is only set by the first landing-page hit,
+so a cold process spends a round trip (two for the form flow) before it can do real work. The
+scraper saves its cookies and the parsed cause-list form (with its hidden tokens) to a JSON file
+($ECOURTS_SESSION_STORE, default .ecourts_session.json) whenever they change, and a new process
+starts from that snapshot while it is younger than `ttl`.
+
+Writers hold an exclusive lock on <path>.lock (flock, where available) and replace the file
+atomically, so readers never see half a snapshot. Every save bumps a generation number. When
+upstream rejects a session, a worker first checks whether another one has already saved a newer
+generation and adopts it. Only if not does it invalidate the snapshot and start a new session,
+so a fleet of workers refreshes once, not once per worker.
+"""
+import contextlib
+import json
+import os
+import time
+from typing import Optional, Dict, Any, List
+
+from .models import CourtOption
+from .utils import json_default
+
+try:
+    import fcntl
+except ImportError:  # Windows: rely on the atomic replace alone
+    fcntl = None
+
+
+def jar_cookies(jar) -> List[Dict[str, Any]]:
+    """The cookies of a requests cookie jar as JSON-able dicts."""
+    return [{'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path,
+             'expires': c.expires, 'secure': c.secure} for c in jar]
+
+
+def restore_cookies(jar, cookies: List[Dict[str, Any]]) -> int:
+    """Set the unexpired cookies in jar; returns how many were set."""
+    now = time.time()
+    n = 0
+    for c in cookies:
+        if c.get('expires') and c['expires'] < now:
+            continue
+        jar.set(c['name'], c['value'], domain=c.get('domain') or '', path=c.get('path') or '/',
+                expires=c.get('expires'), secure=bool(c.get('secure')))
+        n += 1
+    return n
+
+
+def form_from_json(form: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """A saved parse_cause_list_form result, with its select fields as CourtOption lists again."""
+    if not form:
+        return form
+    fields = {k: [CourtOption.make(*o) for o in v] if isinstance(v, list) else v
+              for k, v in form.get('fields', {}).items()}
+    return dict(form, fields=fields)
+
+
+class SessionStore:
+    def __init__(self, path: Optional[str]=None, ttl: float = 1200.0):
+        self.path = path or os.environ.get('ECOURTS_SESSION_STORE') or '.ecourts_session.json'
+        self.ttl = ttl  # eCourts drops idle PHP sessions after ~20-30 minutes
+
+    @contextlib.contextmanager
+    def _locked(self, exclusive: bool):
+        if fcntl is None:
+            yield
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)) as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, snap: Dict[str, Any]):
+        tmp = f'{self.path}.{os.getpid()}.part'
+        # live session cookies: readable by the owner only
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, 'w', encoding='utf-8') as f:
+            json.dump(snap, f, default=json_default, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """The current snapshot {'generation', 'saved', 'expires', 'cookies', 'tokens'}, or None
+        if there is none or it has expired."""
+        with self._locked(exclusive=False):
+            snap = self._read()
+        if not snap or snap.get('expires', 0) <= time.time():
+            return None
+        return snap
+
+    def save(self, cookies: List[Dict[str, Any]], tokens: Optional[Dict[str, Any]]=None) -> int:
+        """Store a snapshot; returns its generation."""
+        with self._locked(exclusive=True):
+            old = self._read() or {}
+            now = time.time()
+            snap = {'generation': old.get('generation', 0) + 1, 'saved': now, 'expires': now + self.ttl,
+                    'cookies': cookies, 'tokens': tokens or {}}
+            self._write(snap)
+        return snap['generation']
+
+    def invalidate(self, generation: Optional[int]) -> bool:
+        """Expire the snapshot if it is still `generation` (a newer one is left alone)."""
+        with self._locked(exclusive=True):
+            snap = self._read()
+            if not snap or snap.get('generation') != generation:
+                return False
+            snap.update(expires=0, cookies=[], tokens={})
+            self._write(snap)
+        return True
+
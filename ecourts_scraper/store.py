@@ -0,0 +1,80 @@
+import datetime
+import os
+import time
+from typing import Optional
+
+from .utils import ARCHIVE_FORMATS, archive_path
+
+
+def selector_key(state=None, district=None, complex_code=None, est_code=None, court_no=None) -> str:
+    """Filesystem-safe key for a selector tuple, e.g. '8_26_1_-_-'."""
+    return '_'.join('-' if v in (None, '') else str(v).replace('/', '-') for v in
+                    (state, district, complex_code, est_code, court_no))
+
+
+def parse_selector_key(key: str):
+    """Inverse of selector_key: (state, district, complex_code, est_code, court_no)."""
+    parts = key.split('_')
+    if len(parts) != 5:
+        raise ValueError(f'not a selector key: {key!r}')
+    return tuple(None if p == '-' else p for p in parts)
+
+
+class CauseListStore:
+    """Local on-disk store of fetched cause lists.
+
+    Files live under <root>/<YYYY-MM-DD>/<state>_<district>_<complex>_<est>_<court>.html[.gz|.zst]
+    so a prefetcher can fill it ahead of time and lookups are answered from disk.
+    The root defaults to $ECOURTS_STORE.
+    """
+
+    def __init__(self, root: Optional[str]=None, compress: Optional[str]='gz', max_age: Optional[float]=None):
+        self.root = root or os.environ.get('ECOURTS_STORE') or '.ecourts_store'
+        self.compress = compress
+        self.max_age = max_age
+
+    def path_for(self, date: datetime.date, state=None, district=None, complex_code=None,
+                 est_code=None, court_no=None) -> str:
+        """Path a new entry for this date/selector tuple is written to."""
+        name = selector_key(state, district, complex_code, est_code, court_no) + '.html'
+        return archive_path(os.path.join(self.root, date.isoformat(), name), self.compress)
+
+    def get(self, date: datetime.date, state=None, district=None, complex_code=None,
+            est_code=None, court_no=None, max_age: Optional[float]=None) -> Optional[str]:
+        """Return the stored file for this date/selector tuple, or None if missing or too old."""
+        base = os.path.join(self.root, date.isoformat(),
+                            selector_key(state, district, complex_code, est_code, court_no) + '.html')
+        max_age = self.max_age if max_age is None else max_age
+        for suffix in ('',) + tuple(ARCHIVE_FORMATS.values()):
+            path = base + suffix
+            if os.path.exists(path):
+                if max_age is not None and time.time() - os.path.getmtime(path) > max_age:
+                    return None
+                return path
+        return None
+
+    def dates(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(d for d in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, d)))
+
+    def entries(self, dates=None):
+        """Yield (date, selectors, path) for every stored list, optionally only for some dates
+        (ISO strings)."""
+        for day in self.dates():
+            if dates is not None and day not in dates:
+                continue
+            try:
+                date = datetime.date.fromisoformat(day)
+            except ValueError:
+                continue
+            folder = os.path.join(self.root, day)
+            for name in sorted(os.listdir(folder)):
+                key, sep, _ = name.partition('.html')
+                if not sep or '.part' in name:  # being written (see utils.part_path)
+                    continue
+                try:
+                    selectors = parse_selector_key(key)
+                except ValueError:
+                    continue
+                yield date, selectors, os.path.join(folder, name)
@@ -0,0 +1,138 @@
+"""Sweeps over a subtree of the court hierarchy and a range of dates.
+
+A scope (a whole state, some of its districts, or a list of complexes) is expanded through
+get_dependent_options into targets, one per complex and establishment (or per court with
+per_court=True). Crossed with the dates they become WorkQueue units (see coordinator.py) that a
+few worker threads fetch into the local store. Re-running a sweep skips the units an earlier run
+finished and retries the ones that failed.
+"""
+import datetime
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Iterable, Callable
+
+from .coordinator import WorkQueue, Worker, fetch_unit, sweep_units
+from .models import normalise_selects, compact_options
+from .scraper import option_lookup_workers
+from .store import CauseListStore
+
+
+def date_range(start: datetime.date, end: Optional[datetime.date]=None) -> List[datetime.date]:
+    """Every date from start to end, both included."""
+    end = end or start
+    if end < start:
+        raise ValueError(f'end date {end} is before start date {start}')
+    return [start + datetime.timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def split_complex(value: str):
+    """(complex code, [establishment codes]) of a court-complex option value.
+
+    The cause-list form's complex values look like '<complex code>@<est code>,<est code>@<flag>';
+    plain codes have no establishments of their own.
+    """
+    parts = str(value).split('@')
+    ests = [e for e in parts[1].split(',') if e.strip()] if len(parts) > 1 else []
+    return parts[0], ests
+
+
+def _targets(state, district, complexes, courts):
+    out = []
+    for value in complexes or [None]:
+        code, ests = split_complex(value) if value is not None else (None, [])
+        for est in ests or [None]:
+            for court in courts or [None]:
+                out.append({'state': state, 'district': district, 'complex_code': code,
+                            'est_code': est, 'court_no': court})
+    return out
+
+
+def expand_scope(scraper, state: str, districts: Optional[Iterable[str]]=None,
+                 complexes: Optional[Iterable[str]]=None, per_court: bool = False,
+                 workers: int = 4) -> List[Dict[str, Any]]:
+    """Targets (scraper selector dicts) for a state, some of its districts or given complexes.
+
+    Districts are looked up when not given, and each district's complexes unless `complexes`
+    is given. A district whose complexes cannot be listed becomes one district-wide target.
+    With per_court=True each complex is split further into the district's courts.
+    """
+    if districts is None:
+        res = scraper.get_dependent_options(state=state)
+        districts = [v for v, _ in compact_options(normalise_selects(res.get('options', {}))['districts'])]
+    complexes = list(complexes) if complexes else None
+
+    def _district(district):
+        if complexes and not per_court:
+            return _targets(state, district, complexes, None)
+        res = scraper.get_dependent_options(state=state, district=district)
+        opts = normalise_selects(res.get('options', {}))
+        found = [v for v, _ in compact_options(opts['complexes'])]
+        courts = [v for v, _ in compact_options(opts['courts'])] if per_court else None
+        return _targets(state, district, complexes or found, courts)
+
+    with ThreadPoolExecutor(max_workers=option_lookup_workers(workers)) as pool:
+        return [t for targets in pool.map(_district, list(districts)) for t in targets]
+
+
+def run_sweep(targets: Iterable[Dict[str, Any]], dates: Iterable[datetime.date], scraper=None,
+              queue: Optional[WorkQueue]=None, name: str = 'default', workers: int = 4,
+              task: Callable[[Any, Dict[str, Any]], Any] = fetch_unit,
+              on_progress: Optional[Callable[[Dict[str, Any]], None]]=None) -> Dict[str, Any]:
+    """Fetch every (target, date) unit with `workers` threads and return a summary.
+
+    Units are tracked in `queue` (default: $ECOURTS_QUEUE or ecourts_queue.db) under `name`, so an
+    interrupted or repeated sweep only fetches what is left. on_progress(queue progress) is
+    called after each unit.
+    """
+    if scraper is None:
+        from .scraper import ECourtsScraper
+        scraper = ECourtsScraper()
+    if getattr(scraper, 'store', None) is None:
+        # units of the same date must not share a file name
+        scraper.store = CauseListStore()
+    queue = queue or WorkQueue()
+    units = sweep_units(dates, targets)
+    queue.add(units, sweep=name)
+    queue.retry_failed(name)
+    skipped = queue.progress(name)['done']
+
+    totals = {'rows': 0, 'bytes': 0}
+    lock = threading.Lock()
+
+    def counted(scraper, unit):
+        res = task(scraper, unit)
+        if isinstance(res, dict):
+            with lock:
+                totals['rows'] += res.get('rows') or 0
+                totals['bytes'] += res.get('bytes') or 0
+        return res
+
+    base = f'{socket.gethostname()}-{os.getpid()}-sweep'
+    pool = [Worker(queue, scraper, worker_id=f'{base}{i}', task=counted, sweep=name)
+            for i in range(max(1, workers))]
+
+    def work(worker):
+        while worker.run_one():
+            if on_progress:
+                on_progress(queue.progress(name))
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=work, args=(w,), daemon=True) for w in pool]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - start
+
+    p = queue.progress(name)
+    fetched = p['done'] - skipped
+    return {
+        'sweep': name, 'units': len(units), 'skipped': skipped, 'done': fetched, 'failed': p['failed'],
+        'remaining': p['pending'] + p['leased'], 'rows': totals['rows'], 'bytes': totals['bytes'],
+        'elapsed': elapsed, 'workers': len(pool),
+        'units_per_minute': fetched * 60.0 / elapsed if elapsed else 0.0,
+        'rows_per_second': totals['rows'] / elapsed if elapsed else 0.0,
+    }
@@ -1,12 +1,279 @@
+import csv
+import datetime
+import gzip
+import io
 import json
+import os
+
+
+def json_default(obj):
+    """json.dump(s) hook for the record types in models.py (and dates)."""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if isinstance(obj, tuple):
+        return list(obj)
+    if isinstance(obj, datetime.date):
+        return obj.isoformat()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
 
 
 def save_json(obj, path):
     with open(path, 'w', encoding='utf-8') as f:
-        json.dump(obj, f, ensure_ascii=False, indent=2)
+        json.dump(obj, f, ensure_ascii=False, indent=2, default=json_default)
     return path
 
 
 def load_json(path):
     with open(path, 'r', encoding='utf-8') as f:
         return json.load(f)
+
+
+# Archive helpers: cause lists and PDFs can be stored gzip (.gz) or zstd (.zst) compressed.
+# Readers sniff the magic bytes, so every consumer decompresses transparently whatever the name.
+_GZIP_MAGIC = b'\x1f\x8b'
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+ARCHIVE_FORMATS = {'gz': '.gz', 'zst': '.zst'}
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def zstd_dictionary(path=None):
+    """Load the shared zstd dictionary from path or $ECOURTS_ZSTD_DICT, or None if not configured."""
+    path = path or os.environ.get('ECOURTS_ZSTD_DICT')
+    zstd = _zstd()
+    if not path or zstd is None or not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return zstd.ZstdCompressionDict(f.read())
+
+
+def archive_path(path, compress=None):
+    """Return path with the suffix for compress ('gz', 'zst' or None) appended."""
+    if not compress:
+        return path
+    if compress not in ARCHIVE_FORMATS:
+        raise ValueError(f'unknown archive format: {compress}')
+    return path + ARCHIVE_FORMATS[compress]
+
+
+def part_path(path):
+    """Temporary name to write path under before renaming it into place. The .gz/.zst suffix
+    stays last, so open_archive writes the same format."""
+    for suffix in ARCHIVE_FORMATS.values():
+        if path.endswith(suffix):
+            return path[:-len(suffix)] + '.part' + suffix
+    return path + '.part'
+
+
+def open_archive(path, mode='rb', level=None):
+    """Open an archive file in binary mode.
+
+    Writing compresses according to the extension (.gz / .zst, anything else is raw).
+    Reading detects the format from the file content.
+    """
+    if 'r' not in mode:
+        if path.endswith('.gz'):
+            return gzip.open(path, mode, compresslevel=level or 6)
+        if path.endswith('.zst'):
+            zstd = _zstd()
+            if zstd is None:
+                raise RuntimeError('zstandard is required for .zst archives (pip install zstandard)')
+            cctx = zstd.ZstdCompressor(level=level or 10, dict_data=zstd_dictionary())
+            return cctx.stream_writer(open(path, mode), closefd=True)
+        return open(path, mode)
+
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+    if magic[:2] == _GZIP_MAGIC:
+        return gzip.open(path, 'rb')
+    if magic == _ZSTD_MAGIC:
+        zstd = _zstd()
+        if zstd is None:
+            raise RuntimeError('zstandard is required to read .zst archives (pip install zstandard)')
+        dctx = zstd.ZstdDecompressor(dict_data=zstd_dictionary())
+        # appended files hold several frames
+        return dctx.stream_reader(open(path, 'rb'), read_across_frames=True, closefd=True)
+    return open(path, 'rb')
+
+
+def read_archive(path):
+    with open_archive(path, 'rb') as f:
+        return f.read()
+
+
+def read_archive_text(path, encoding='utf-8'):
+    return read_archive(path).decode(encoding, errors='replace')
+
+
+def compress_archive(path, compress='gz', remove=False):
+    """Re-encode an existing (possibly already compressed) archive file. Returns the new path."""
+    dest = archive_path(path, compress)
+    data = read_archive(path)
+    with open_archive(dest, 'wb') as f:
+        f.write(data)
+    if remove and dest != path:
+        os.remove(path)
+    return dest
+
+
+def train_archive_dictionary(paths, out_path, size=112640):
+    """Train a shared zstd dictionary on sample cause-list files and write it to out_path."""
+    zstd = _zstd()
+    if zstd is None:
+        raise RuntimeError('zstandard is required to train a dictionary (pip install zstandard)')
+    samples = [read_archive(p) for p in paths]
+    d = zstd.train_dictionary(size, samples)
+    with open(out_path, 'wb') as f:
+        f.write(d.as_bytes())
+    return out_path
+
+
+# Streaming record output: JSON Lines, CSV or a JSON array, optionally compressed (.gz/.zst).
+RECORD_FORMATS = ('jsonl', 'json', 'csv')
+
+
+def _dumps_json():
+    """Fastest available JSON encoder returning bytes: orjson when installed, else the stdlib."""
+    try:
+        import orjson
+    except ImportError:
+        return lambda obj: json.dumps(obj, ensure_ascii=False, default=json_default).encode('utf-8')
+    opts = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+    return lambda obj: orjson.dumps(obj, default=json_default, option=opts)
+
+
+def record_format(path, fmt=None):
+    """fmt if given, else the format implied by path ('x.csv', 'x.jsonl.gz', ...); default jsonl."""
+    if fmt:
+        if fmt not in RECORD_FORMATS:
+            raise ValueError(f'unknown output format: {fmt}')
+        return fmt
+    base = path
+    for suffix in ARCHIVE_FORMATS.values():
+        if base.endswith(suffix):
+            base = base[:-len(suffix)]
+    ext = os.path.splitext(base)[1].lstrip('.')
+    return {'csv': 'csv', 'json': 'json'}.get(ext, 'jsonl')
+
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (list, tuple)):
+        return ' | '.join(str(v) for v in value)
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False, default=json_default)
+    return value
+
+
+def _csv_header(path):
+    with open_archive(path, 'rb') as f:
+        return next(csv.reader([io.TextIOWrapper(f, encoding='utf-8', newline='').readline()]))
+
+
+class RecordWriter:
+    """Write result records to path one at a time, in constant memory.
+
+    jsonl writes one JSON document per line and csv one row per record (columns from `fields`
+    or the first record; list cells are joined with ' | '). json writes a single array and
+    cannot append. With append=True new records go after the existing ones; compressed files
+    get a new gzip member / zstd frame, which readers decompress transparently. Data is
+    flushed and fsync'ed every `fsync_every` records (0: only on close).
+    """
+
+    def __init__(self, path, fmt=None, append=False, fields=None, fsync_every=100, level=None):
+        self.path = path
+        self.fmt = record_format(path, fmt)
+        if append and self.fmt == 'json':
+            raise ValueError('json output cannot be appended to; use jsonl or csv')
+        self.fields = list(fields) if fields else None
+        self.fsync_every = fsync_every
+        self.count = 0
+        self._header = not (append and os.path.exists(path) and os.path.getsize(path))
+        if self.fmt == 'csv' and not self._header and self.fields is None:
+            self.fields = _csv_header(path)  # keep appended rows in the existing column order
+        self._raw = open(path, 'ab' if append else 'wb')
+        if path.endswith('.gz'):
+            self._f = gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=level or 6)
+        elif path.endswith('.zst'):
+            zstd = _zstd()
+            if zstd is None:
+                raise RuntimeError('zstandard is required for .zst output (pip install zstandard)')
+            cctx = zstd.ZstdCompressor(level=level or 10, dict_data=zstd_dictionary())
+            self._f = cctx.stream_writer(self._raw, closefd=False)
+        else:
+            self._f = self._raw
+        self._dumps = _dumps_json()
+        self._buf = io.StringIO()
+        self._csv = csv.writer(self._buf)
+        if self.fmt == 'json':
+            self._f.write(b'[')
+
+    def write(self, record):
+        if hasattr(record, 'to_dict'):
+            record = record.to_dict()
+        if self.fmt == 'jsonl':
+            self._f.write(self._dumps(record) + b'\n')
+        elif self.fmt == 'json':
+            self._f.write((b',\n' if self.count else b'\n') + self._dumps(record))
+        else:
+            self._write_csv(record)
+        self.count += 1
+        if self.fsync_every and self.count % self.fsync_every == 0:
+            self.sync()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def _write_csv(self, record):
+        if self.fields is None:
+            self.fields = list(record)
+        if self._header:
+            self._csv.writerow(self.fields)
+            self._header = False
+        self._csv.writerow([_csv_cell(record.get(k)) for k in self.fields])
+        self._f.write(self._buf.getvalue().encode('utf-8'))
+        self._buf.seek(0)
+        self._buf.truncate()
+
+    def sync(self):
+        self._f.flush()
+        if self._f is not self._raw:
+            self._raw.flush()
+        os.fsync(self._raw.fileno())
+
+    def close(self):
+        if self._raw.closed:
+            return
+        if self.fmt == 'json':
+            self._f.write(b'\n]\n')
+        if self._f is not self._raw:
+            self._f.close()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_records(path):
+    """Read back a jsonl (or json array) output file, compressed or not."""
+    with open_archive(path, 'rb') as f:
+        if record_format(path) == 'json':
+            yield from json.load(f)
+            return
+        for line in io.TextIOWrapper(f, encoding='utf-8'):
+            if line.strip():
+                yield json.loads(line)
@@ -1,64 +1,175 @@
 
-from flask import Flask, jsonify, request, render_template, send_from_directory
+from flask import Flask, jsonify, request, render_template, send_from_directory, Response
 from flask_cors import CORS
-from .scraper import ECourtsScraper
+from .scraper import ECourtsScraper, option_lookup_workers
+from .scheduling import RequestScheduler, shared_scheduler
+from .jobs import JobManager
+from .models import normalise_selects, compact_options as _compact
+from .utils import json_default
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import functools
+import gzip
+import hashlib
+import json
 import os
+import threading
+import time
 
 app = Flask(__name__, template_folder=os.path.join(os.path.dirname(__file__), "templates"),
             static_folder=os.path.join(os.path.dirname(__file__), "static"))
 CORS(app)  # enable CORS for local testing
 
-# single scraper instance (reuses requests.Session)
-scraper = ECourtsScraper()
+# The scraper and job manager are built on first use, not on import, so importing the module
+# (tests, tooling, `flask routes`) opens no session and starts no threads.
+_scraper = None
+_jobs = None
+_init_lock = threading.Lock()
 
-def normalise_selects(options_map):
-    """
-    Convert scraper.get_dependent_options 'options' dict into a normalized structure:
-    {
-      "states": [(val, text), ...],
-      "districts": [(val, text), ...],
-      "complexes": [(val, text), ...],
-      "courts": [(val, text), ...]
-    }
-    The scraper returns keys like 'sess_state_code', 'sees_dist_code', 'court_complex_code', 'CL_court_no' etc.
+
+def get_scraper() -> ECourtsScraper:
+    """The single scraper instance (reuses requests.Session). Dropdown/UI calls are 'interactive';
+    bulk work submitted through the same instance should run under scraper.priority('bulk') so
+    that the shared scheduler holds it back while UI requests are waiting."""
+    global _scraper
+    with _init_lock:
+        if _scraper is None:
+            _scraper = ECourtsScraper(scheduler=shared_scheduler() or RequestScheduler(
+                rate=float(os.environ.get('ECOURTS_RATE_WEB', '4')), burst=8))
+        return _scraper
+
+
+def get_jobs() -> JobManager:
+    """The job manager: long-running downloads/searches run there instead of in the request handler."""
+    global _jobs
+    scraper = get_scraper()
+    with _init_lock:
+        if _jobs is None:
+            _jobs = JobManager(scraper, max_workers=int(os.environ.get("ECOURTS_JOB_WORKERS", "2")))
+        return _jobs
+
+
+def _want_debug():
+    return request.args.get("debug") in ("1", "true", "yes")
+
+
+def _with_debug(payload, html):
+    """Attach the upstream HTML only when the caller asked for it with ?debug=1."""
+    if _want_debug():
+        payload["debug_html"] = html or ""
+    return payload
+
+
+GZIP_ETAG_SUFFIX = "-gz"
+
+
+@app.after_request
+def _compress_response(resp):
+    # gzip JSON API responses when the client accepts it; small bodies aren't worth it
+    if (resp.status_code != 200 or resp.direct_passthrough or "Content-Encoding" in resp.headers
+            or not resp.mimetype == "application/json"
+            or "gzip" not in request.headers.get("Accept-Encoding", "").lower()):
+        return resp
+    data = resp.get_data()
+    if len(data) < 1024:
+        return resp
+    resp.set_data(gzip.compress(data, compresslevel=6))
+    resp.headers["Content-Encoding"] = "gzip"
+    resp.headers["Vary"] = "Accept-Encoding"
+    # the gzip bytes are a different representation: a strong validator must differ from the identity one
+    etag, weak = resp.get_etag()
+    if etag and not weak:
+        resp.set_etag(etag + GZIP_ETAG_SUFFIX)
+    return resp
+
+
+# latency bound for UI requests: upstream retries and fallbacks stop once it is used up
+API_DEADLINE = float(os.environ.get("ECOURTS_API_DEADLINE", "20"))
+
+
+def _bounded(view):
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        with get_scraper().deadline(API_DEADLINE):
+            return view(*args, **kwargs)
+    return wrapper
+
+
+HIERARCHY_TTL = int(os.environ.get("ECOURTS_HIERARCHY_TTL", "3600"))
+_hierarchy_cache = {}
+_hierarchy_lock = threading.Lock()
+
+
+def build_hierarchy(state):
+    """The whole subtree of a state: districts, each with its complexes and courts.
+
+    Upstream lists courts per district (as /api/courts does), so every complex of a district
+    gets the same court list.
     """
-    out = {"states": [], "districts": [], "complexes": [], "courts": []}
-    for k, opts in (options_map or {}).items():
-        lk = (k or "").lower()
-        if "state" in lk:
-            out["states"] = [(str(v), str(t)) for v, t in opts]
-        elif "dist" in lk:
-            out["districts"] = [(str(v), str(t)) for v, t in opts]
-        elif "complex" in lk:
-            out["complexes"] = [(str(v), str(t)) for v, t in opts]
-        elif "court" in lk or "cl_court" in lk or "cl_court_no" in lk:
-            out["courts"] = [(str(v), str(t)) for v, t in opts]
-        else:
-            # fallback: try to classify by option text
-            if any("court" in (t or "").lower() for _, t in opts):
-                out["courts"] = [(str(v), str(t)) for v, t in opts]
+    scraper = get_scraper()
+    res = scraper.get_dependent_options(state=state)
+    districts = _compact(normalise_selects(res.get("options", {}))["districts"])
+    partial = [bool(res.get("partial"))]
+    # deadlines are per thread, so the pool threads run under the caller's deadline explicitly:
+    # the same end time for every district, not a fresh budget from when each one starts
+    left = scraper.remaining()
+    end = None if left is None else time.monotonic() + left
+
+    def _district(item):
+        value, text = item
+        with scraper._deadline_at(end):
+            sub = scraper.get_dependent_options(state=state, district=value)
+        partial.append(bool(sub.get("partial")))
+        sub = normalise_selects(sub.get("options", {}))
+        return {"v": value, "t": text, "complexes": _compact(sub["complexes"]), "courts": _compact(sub["courts"])}
+
+    with ThreadPoolExecutor(max_workers=option_lookup_workers(4)) as pool:
+        out = {"state": state, "districts": list(pool.map(_district, districts))}
+    if any(partial):
+        out["partial"] = True
     return out
 
+
+def _hierarchy_entry(state):
+    now = time.time()
+    with _hierarchy_lock:
+        entry = _hierarchy_cache.get(state)
+        if entry and entry[0] > now:
+            return entry
+    tree = build_hierarchy(state)
+    body = json.dumps(tree, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    etag = hashlib.blake2b(body, digest_size=12).hexdigest()
+    if tree.get("partial"):
+        return (now, body, etag)  # cut short by the deadline: serve it, but neither cache nor store it
+    entry = (now + HIERARCHY_TTL, body, etag)
+    with _hierarchy_lock:
+        _hierarchy_cache[state] = entry
+    return entry
+
+
 @app.route("/")
 def index():
     # serve the UI (template in package templates/)
     return render_template("index.html")
 
 @app.route("/api/states", methods=["GET"])
+@_bounded
 def api_states():
     # get initial page and parse selects
-    page = scraper.get_cause_list_page()
+    page = get_scraper().get_cause_list_page()
     opts = page.get("options", {})
     normalized = normalise_selects(opts)
     # return states (if none found, send html for debugging)
     if not normalized["states"]:
-        return jsonify({"states": [], "debug_html": page.get("html","")})
+        return jsonify(_with_debug({"states": []}, page.get("html","")))
     return jsonify({"states": [{"value": v, "text": t} for v, t in normalized["states"]]})
 
 @app.route("/api/districts", methods=["GET"])
+@_bounded
 def api_districts():
     state = request.args.get("state")
     state_text = None
+    scraper = get_scraper()
 
     # Try to find the state name from cached list
     page = scraper.get_cause_list_page()
@@ -72,30 +183,30 @@ def api_districts():
     res = scraper.get_dependent_options(state=state, state_text=state_text)
     opts = res.get("options", {})
     normalized = normalise_selects(opts)
-    return jsonify({
+    return jsonify(_with_debug({
         "state": state,
         "districts": [{"value": v, "text": t} for v, t in normalized["districts"]],
-        "debug_html": res.get("html","")
-    })
+    }, res.get("html","")))
 
 
 @app.route("/api/complexes", methods=["GET"])
+@_bounded
 def api_complexes():
     state = request.args.get("state")
     district = request.args.get("district")
     if not state or not district:
         return jsonify({"error": "state and district params required"}), 400
-    res = scraper.get_dependent_options(state=state, district=district)
+    res = get_scraper().get_dependent_options(state=state, district=district)
     opts = res.get("options", {})
     normalized = normalise_selects(opts)
-    return jsonify({
+    return jsonify(_with_debug({
         "state": state,
         "district": district,
         "complexes": [{"value": v, "text": t} for v, t in normalized["complexes"]],
-        "debug_html": res.get("html","")
-    })
+    }, res.get("html","")))
 
 @app.route("/api/courts", methods=["GET"])
+@_bounded
 def api_courts():
     state = request.args.get("state")
     district = request.args.get("district")
@@ -103,31 +214,134 @@ def api_courts():
     if not state or not district or not complex_val:
         return jsonify({"error": "state, district and complex params required"}), 400
     # get dependent options; scraper may populate CL_court_no or court_est_code, etc.
-    res = scraper.get_dependent_options(state=state, district=district)
+    res = get_scraper().get_dependent_options(state=state, district=district)
     opts = res.get("options", {})
     normalized = normalise_selects(opts)
 
     # If complexes exist, we may need to POST/select complex to get courts.
     # The scraper's headless fallback can auto-select a complex, but we will attempt to
     # emulate what the site does by returning courts found in the options map.
-    # If the normalized courts list is empty, return debug_html for troubleshooting.
-    return jsonify({
+    # Pass ?debug=1 to get the upstream HTML back for troubleshooting.
+    return jsonify(_with_debug({
         "state": state,
         "district": district,
         "complex": complex_val,
         "courts": [{"value": v, "text": t} for v, t in normalized["courts"]],
-        "debug_html": res.get("html","")
-    })
+    }, res.get("html","")))
+
+
+@app.route("/api/hierarchy", methods=["GET"])
+@_bounded
+def api_hierarchy():
+    """Districts, complexes and courts of one state in a single compact, cacheable payload:
+    {"state": s, "districts": [{"v": .., "t": .., "complexes": [[v, t], ..], "courts": [[v, t], ..]}]}
+    """
+    state = request.args.get("state")
+    if not state:
+        return jsonify({"error": "state param required"}), 400
+    expires, body, etag = _hierarchy_entry(state)
+    headers = {"ETag": f'"{etag}"', "Cache-Control": f"public, max-age={max(0, int(expires - time.time()))}",
+               "Vary": "Accept-Encoding"}
+    # a client revalidates with the tag of the copy it has: the identity or the gzip one
+    for tag in (etag, etag + GZIP_ETAG_SUFFIX):
+        if request.if_none_match.contains(tag):
+            headers["ETag"] = f'"{tag}"'
+            return Response(status=304, headers=headers)
+    return Response(body, mimetype="application/json", headers=headers)
+
+@app.route("/api/causelist", methods=["GET"])
+@_bounded
+def api_causelist():
+    """Parsed cause-list rows; answered from the local store when the list was prefetched."""
+    state = request.args.get("state")
+    district = request.args.get("district")
+    if not state or not district:
+        return jsonify({"error": "state and district params required"}), 400
+    try:
+        date = datetime.date.fromisoformat(request.args.get("date") or datetime.date.today().isoformat())
+    except ValueError:
+        return jsonify({"error": "date must be YYYY-MM-DD"}), 400
+    selectors = dict(state=state, district=district, complex_code=request.args.get("complex"),
+                     est_code=request.args.get("est"), court_no=request.args.get("court"))
+    query = request.args.get("q")
+    scraper = get_scraper()
+    source = "store" if scraper.stored_cause_list(date, **selectors) else "upstream"
+    rows = []
+    for row in scraper.iter_cause_list_rows(date, **selectors):
+        if "error" in row:
+            return jsonify({"error": row["error"]}), 504 if row.get("timeout") else 502
+        if not query or scraper._row_matches(query, row["cols"]):
+            rows.append(row)
+    return jsonify({"date": date.isoformat(), "source": source, "rows": rows})
+
+@app.route("/api/jobs", methods=["POST"])
+def api_submit_job():
+    """Submit {"type": "download"|"search"|"pdfs"|"batch", "params": {...}}; returns 202 with the job id."""
+    body = request.get_json(silent=True) or {}
+    try:
+        job = get_jobs().submit(body.get("type"), body.get("params") or {})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    out = job.to_dict()
+    out["links"] = {"status": f"/api/jobs/{job.id}", "events": f"/api/jobs/{job.id}/events",
+                    "result": f"/api/jobs/{job.id}/result"}
+    return jsonify(out), 202
+
+
+@app.route("/api/jobs", methods=["GET"])
+def api_list_jobs():
+    return jsonify({"jobs": [j.to_dict() for j in get_jobs().list()]})
+
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def api_job_status(job_id):
+    job = get_jobs().get(job_id)
+    if not job:
+        return jsonify({"error": "job not found"}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route("/api/jobs/<job_id>/result", methods=["GET"])
+def api_job_result(job_id):
+    job = get_jobs().get(job_id)
+    if not job:
+        return jsonify({"error": "job not found"}), 404
+    if not job.done:
+        return jsonify(job.to_dict()), 409
+    return jsonify(job.to_dict(with_result=True))
+
+
+@app.route("/api/jobs/<job_id>/events", methods=["GET"])
+def api_job_events(job_id):
+    """Server-Sent Events stream of a job's progress; ends after the final done/failed event."""
+    job = get_jobs().get(job_id)
+    if not job:
+        return jsonify({"error": "job not found"}), 404
+    since = int(request.headers.get("Last-Event-ID") or request.args.get("since") or 0)
+
+    def stream():
+        seq = since
+        while True:
+            events = job.wait_events(seq)
+            for e in events:
+                seq = e["seq"]
+                yield f"id: {seq}\nevent: {e['event']}\ndata: {json.dumps(e['data'], ensure_ascii=False, default=json_default)}\n\n"
+            if job.done and not job.wait_events(seq, timeout=0):
+                return
+            if not events:
+                yield ": keep-alive\n\n"
+
+    return Response(stream(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 
 # Serve static files (if any) and templates folder is inside package.
 @app.route("/static/<path:filename>")
 def static_files(filename):
     return send_from_directory(app.static_folder, filename)
 
-for rule in app.url_map.iter_rules():
-    print("Registered route:", rule)
-
 
 if __name__ == "__main__":
+    for rule in app.url_map.iter_rules():
+        print("Registered route:", rule)
     # Run for development
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -1,7 +1,49 @@
 import os
 import sys
 
+import pytest
+
 # Ensure project root is on sys.path so tests can import the package
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
+
+# cause-list form fakes shared by the form and session tests
+FORM = """<form action="?p=cause_list/submitCauseList">
+<input type="hidden" name="app_token" value="{token}">
+<select name="sess_state_code"><option value="8">Bihar</option></select>
+<input name="cause_list_date"><input name="captcha">
+</form>"""
+
+
+class Resp:
+    def __init__(self, text, status=200):
+        self.text, self.status_code, self.headers = text, status, {}
+
+
+def submit_form(scraper):
+    return scraper.submit_cause_list_form('8', '26', '1', '', '20-10-2025', 'abcd')
+
+
+# cause lists and stores shared by the export, index and archive-search tests
+def cause_list_html(rows, header=('S.No', 'Case', 'Parties', 'Court'), tr='tr') -> bytes:
+    """A cause-list page: a <th> header row, then a row of <td> cells per tuple in rows."""
+    head = ''.join(f'<th>{h}</th>' for h in header)
+    body = ''.join(f'<{tr}>' + ''.join(f'<td>{c}</td>' for c in cells) + f'</{tr}>\n' for cells in rows)
+    return f'<html><h1>Cause list</h1><table><tr>{head}</tr>\n{body}</table></html>'.encode()
+
+
+def put_list(store, date, body, state='8', district='26', complex_code='1', est_code=None, court_no=None):
+    """Write body into store as the list of date and selectors; returns its path."""
+    from ecourts_scraper.utils import open_archive
+    path = store.path_for(date, state, district, complex_code, est_code, court_no)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open_archive(path, 'wb') as f:
+        f.write(body)
+    return path
+
+
+@pytest.fixture
+def store(tmp_path):
+    from ecourts_scraper.store import CauseListStore
+    return CauseListStore(str(tmp_path / 'store'))
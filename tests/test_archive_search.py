@@ -0,0 +1,92 @@
+import datetime
+import gzip
+
+import pytest
+
+from conftest import cause_list_html
+from ecourts_scraper import archivesearch, scraper as scraper_module
+from ecourts_scraper.archivesearch import archive_files, query_pieces, search_archives
+from ecourts_scraper.scraper import ECourtsScraper, parse_cause_list_rows, row_matches
+
+
+def _list(rows, tr='tr'):
+    return cause_list_html([(i, case, parties, f'Court {i % 3}') for i, (case, parties) in enumerate(rows, 1)],
+                           tr=tr)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    lists = {
+        'a/causelist_2025-10-20.html': _list([('Cr. 12/2024', 'Ramesh Kumar vs State'),
+                                              ('Cr. 13/2024', 'M/s Gupta &amp; Sons vs Union')]),
+        'a/causelist_2025-10-21.html.gz': _list([('CRL 99/2023', 'STATE vs RAMESH KUMAR')], tr='TR'),
+        'b/causelist_2025-10-22.html': _list([(f'Cr. {i}/2025', f'Party {i} vs State') for i in range(400)]),
+        'b/notice.html': b'<html><p>No sitting today. Ramesh Kumar matters adjourned.</p></html>',
+        'b/empty.html': b'',
+        'b/readme.txt': b'Ramesh Kumar',
+    }
+    for name, data in lists.items():
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(gzip.compress(data) if name.endswith('.gz') else data)
+    return tmp_path
+
+
+def test_query_pieces():
+    assert query_pieces("O'Brien & Sons  vs State") == [b'brien', b'state', b'sons', b'vs']
+    assert query_pieces('  5 ') == [b'5']
+
+
+@pytest.mark.parametrize('query', ['Ramesh Kumar', 'ramesh kumar', 'Gupta & Sons', 'Cr. 12/2024 Ramesh',
+                                   'Party 7 vs', 'State', 'Nobody'])
+def test_same_rows_as_a_full_parse(archive, monkeypatch, query):
+    monkeypatch.setattr(archivesearch, 'CHUNK', 64)  # exercise matches across chunk boundaries
+    files = list(archive_files([str(archive)]))
+    assert [f.rsplit('/', 1)[1] for f in files] == ['causelist_2025-10-20.html', 'causelist_2025-10-21.html.gz',
+                                                    'causelist_2025-10-22.html', 'empty.html', 'notice.html']
+    results = {res['path']: res for res in search_archives(files, query, workers=0)}
+    for path in files:
+        with archivesearch.mapped(path) as buf:
+            expected = [r for r in parse_cause_list_rows(buf[:]) if row_matches(query, r.cols)]
+        assert results[path]['rows'] == expected
+    notice = results[str(archive / 'b/notice.html')]
+    assert notice['text_match'] == (query.lower() == 'ramesh kumar')
+
+
+def test_only_candidate_rows_are_parsed(archive):
+    results = {res['path'].rsplit('/', 1)[1]: res for res in
+               search_archives(archive_files([str(archive)]), 'ramesh kumar', workers=0)}
+    assert {name for name, res in results.items() if res['candidate']} == \
+        {'causelist_2025-10-20.html', 'causelist_2025-10-21.html.gz', 'notice.html'}
+    assert results['causelist_2025-10-20.html']['regions'] == 1
+    assert results['causelist_2025-10-22.html']['regions'] == 0
+    # a query matching hundreds of rows parses the list once instead
+    many = next(search_archives([str(archive / 'b/causelist_2025-10-22.html')], 'vs state', workers=0))
+    assert many['regions'] == 1 and len(many['rows']) == 400
+
+
+def test_worker_processes(archive):
+    results = list(search_archives(archive_files([str(archive / 'a')]), 'ramesh kumar', workers=1))
+    assert sorted(len(res['rows']) for res in results) == [1, 1]
+
+
+def test_search_case_skips_lists_without_the_query(archive, monkeypatch):
+    scraper = ECourtsScraper()
+    scraper.download_cause_list = lambda date: str(archive / 'a/causelist_2025-10-20.html')
+
+    def no_parse(html):
+        raise AssertionError('parsed a list that cannot match')
+
+    monkeypatch.setattr(scraper_module, '_soup', no_parse)
+    assert scraper.search_case_in_cause_list(datetime.date(2025, 10, 20), 'Cr. 77/2024')['found'] is False
+    monkeypatch.undo()
+    assert scraper.search_case_in_cause_list(datetime.date(2025, 10, 20), 'Cr. 13/2024')['found'] is True
+
+
+def test_non_ascii_case_is_not_prefiltered_away():
+    data = _list([('Cr. 1/2025', 'ÉLISE vs State'), ('Cr. 2/2025', 'Party vs State')])
+    full = [r for r in parse_cause_list_rows(data) if row_matches('Élise', r.cols)]
+    assert len(full) == 1
+    assert query_pieces('Élise') == [b'lise'] and query_pieces('É') == []
+    assert archivesearch.scan(data, 'Élise')['rows'] == full
+    assert archivesearch.scan(data, 'É')['rows'] == full
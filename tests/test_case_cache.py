@@ -0,0 +1,128 @@
+import datetime
+import json
+import threading
+import time
+
+from ecourts_scraper.casecache import CaseCache, case_key, case_ttl, parse_date, DAY, HOUR, MINUTE
+from ecourts_scraper.models import CaseListing
+from ecourts_scraper.scheduling import RequestScheduler
+from ecourts_scraper.scraper import ECourtsScraper
+
+TODAY = datetime.date(2025, 10, 20)
+
+
+def test_parse_date():
+    assert parse_date('Next Date: 21-10-2025') == datetime.date(2025, 10, 21)
+    assert parse_date('2025-11-03') == datetime.date(2025, 11, 3)
+    assert parse_date('on 4th November 2025') == datetime.date(2025, 11, 4)
+    assert parse_date('31-02-2025') is None
+
+
+def test_ttl_follows_hearing_dates():
+    def ttl(**kw):
+        return case_ttl(CaseListing.make(**kw), today=TODAY)
+    assert ttl(raw={'next_hearing_date': '21-10-2025'}) == 15 * MINUTE
+    assert ttl(raw={'next_hearing_date': '19-10-2025'}) == 15 * MINUTE  # outcome pending
+    assert ttl(rows=[('Next Hearing Date', '24-10-2025')]) == 2 * HOUR
+    assert ttl(raw={'nextDate': '2025-12-01'}) == DAY
+    assert ttl(text_rows=['Case Status: Disposed']) == 7 * DAY
+    assert ttl(serial='4', court='Court 1') == HOUR
+    assert case_key('DLHC01-000123-2024') == case_key('dlhc01000123 2024') == 'cnr/DLHC010001232024'
+
+
+class Response:
+    status_code = 200
+    headers = {'content-type': 'application/json'}
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class CountingSession:
+    headers = {}
+
+    def __init__(self):
+        self.calls = 0
+        self.next_date = '21-10-2025'
+
+    def get(self, url, params=None, timeout=None, stream=False):
+        self.calls += 1
+        return Response({'listing': {'serial': str(self.calls), 'court': 'Court 1',
+                                     'next_hearing_date': self.next_date}})
+
+
+def _scraper(tmp_path, session):
+    return ECourtsScraper(session=session, scheduler=RequestScheduler(rate=0),
+                          case_cache=CaseCache(str(tmp_path / 'cases')))
+
+
+def test_fresh_results_come_from_the_cache(tmp_path):
+    session = CountingSession()
+    scraper = _scraper(tmp_path, session)
+    assert scraper.check_by_cnr('DLHC01-1-2024').serial == '1'
+    again = scraper.check_by_cnr('DLHC01-1-2024')
+    assert session.calls == 1 and again.serial == '1' and again.raw['next_hearing_date'] == '21-10-2025'
+    assert scraper.check_by_cnr('DLHC01-1-2024', max_age=0).serial == '2'
+    assert scraper.check_by_details('CRL', 5, 2024).serial == '3'
+    assert scraper.check_by_details('crl', '5', '2024').serial == '3'
+    assert session.calls == 3
+
+
+def _age(cache, key, seconds):
+    path = cache.path_for(key)
+    with open(path) as f:
+        entry = json.load(f)
+    entry['fetched'] -= seconds
+    with open(path, 'w') as f:
+        json.dump(entry, f)
+    return entry['ttl']
+
+
+def test_stale_while_revalidate(tmp_path):
+    session = CountingSession()
+    scraper = _scraper(tmp_path, session)
+    key = case_key('DLHC01-1-2024')
+    scraper.check_by_cnr('DLHC01-1-2024')
+    ttl = _age(scraper.case_cache, key, 0)
+
+    # past the TTL but within the stale window: old answer now, refreshed in the background
+    _age(scraper.case_cache, key, ttl * 1.5)
+    assert scraper.check_by_cnr('DLHC01-1-2024').serial == '1'
+    for t in threading.enumerate():
+        if t.name == 'ecourts-revalidate':
+            t.join(2)
+    assert session.calls == 2
+    assert scraper.check_by_cnr('DLHC01-1-2024').serial == '2'
+
+    # too old to serve at all: fetched synchronously
+    _age(scraper.case_cache, key, ttl * 3)
+    assert scraper.check_by_cnr('DLHC01-1-2024').serial == '3'
+    # an explicit max_age doesn't accept stale copies either
+    _age(scraper.case_cache, key, 120)
+    assert scraper.check_by_cnr('DLHC01-1-2024', max_age=60).serial == '4'
+    assert session.calls == 4
+
+
+def test_concurrent_puts_of_one_key_do_not_collide(tmp_path):
+    cache = CaseCache(str(tmp_path))
+    key = case_key('BRPT010012342024')
+    errors = []
+
+    def put(n):
+        try:
+            for _ in range(50):
+                cache.put(key, CaseListing.make(serial=str(n)), 60)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=put, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert cache.get(key)['result'].serial in {'0', '1', '2', '3'}
+    assert [p.name for p in tmp_path.rglob('*.part')] == []
@@ -0,0 +1,35 @@
+from ecourts_scraper.changes import build_snapshot, diff_snapshots
+
+
+def _row(serial, court, case, party):
+    return {'cols': [serial, court, case, party], 'serial': serial, 'court': court}
+
+
+def test_diff_reports_added_removed_and_moved():
+    old = build_snapshot([_row('1', 'Court A', 'Cr. 1/2024', 'X v Y'),
+                          _row('2', 'Court A', 'Cr. 2/2024', 'P v Q')], list_hash='a')
+    new = build_snapshot([_row('1', 'Court B', 'Cr. 2/2024', 'P v Q'),
+                          _row('2', 'Court A', 'Cr. 3/2024', 'M v N')], list_hash='b')
+    diff = diff_snapshots(old, new)
+    assert [r['cols'][2] for r in diff['added']] == ['Cr. 3/2024']
+    assert [r['cols'][2] for r in diff['removed']] == ['Cr. 1/2024']
+    assert len(diff['moved']) == 1
+    assert diff['moved'][0]['from'] == {'serial': '2', 'court': 'Court A'}
+    assert diff['moved'][0]['to'] == {'serial': '1', 'court': 'Court B'}
+
+
+def test_unchanged_list_is_not_parsed(tmp_path):
+    import datetime
+    from pathlib import Path
+    from ecourts_scraper.scraper import ECourtsScraper
+    src = tmp_path / 'causelist.html'
+    src.write_bytes((Path(__file__).parent / 'fixtures' / 'sample_case.html').read_bytes())
+    scraper = ECourtsScraper()
+    scraper.download_cause_list = lambda *a, **kw: str(src)
+    snap = str(tmp_path / 'snap.json')
+    first = scraper.cause_list_changes(datetime.date(2025, 10, 16), '8', '26', snapshot_path=snap)
+    assert first['first_fetch'] and first['rows'] == 2
+
+    scraper.iter_rows_from_file = None  # would blow up if the list were parsed again
+    second = scraper.cause_list_changes(datetime.date(2025, 10, 16), '8', '26', snapshot_path=snap)
+    assert second['unchanged']
@@ -0,0 +1,86 @@
+import datetime
+import io
+import os
+import time
+
+import requests
+
+from ecourts_scraper.coordinator import WorkQueue, Worker, sweep_units
+
+
+def _queue(tmp_path, **kwargs):
+    q = WorkQueue(str(tmp_path / 'q.db'), **kwargs)
+    units = sweep_units([datetime.date(2025, 10, 20), datetime.date(2025, 10, 21)],
+                        [{'state': '8', 'district': '26', 'complex': '1'}, {'state': '8', 'district': '27'}])
+    assert q.add(units, sweep='s1') == 4
+    assert q.add(units, sweep='s1') == 0  # re-adding is a no-op
+    return q
+
+
+def test_leases_are_exclusive_and_expire(tmp_path):
+    q = _queue(tmp_path, lease_seconds=0.2)
+    a = q.lease('a', n=3)
+    b = q.lease('b', n=3)
+    assert len(a) == 3 and len(b) == 1
+    assert a[0]['unit'] == {'state': '8', 'district': '26', 'complex_code': '1', 'est_code': None,
+                            'court_no': None, 'date': '2025-10-20'}
+    assert q.complete(a[0]['id'], 'a', {'rows': 3})
+    time.sleep(0.25)
+    # a's remaining leases expired: b takes them over and a can no longer report them
+    retaken = q.lease('b', n=5)
+    assert {u['id'] for u in retaken} >= {u['id'] for u in a[1:]}
+    assert not q.complete(a[1]['id'], 'a', {})
+    assert q.progress('s1')['done'] == 1
+
+
+def test_failures_retry_until_attempts_run_out(tmp_path):
+    q = _queue(tmp_path, max_attempts=2)
+    for _ in range(2):
+        for item in q.lease('w', n=4):
+            q.fail(item['id'], 'w', 'HTTP 500')
+    p = q.progress()
+    assert p['failed'] == 4 and p['pending'] == 0
+    assert all(r['error'] == 'HTTP 500' and r['attempts'] == 2 for r in q.results(status='failed'))
+
+
+def test_worker_drains_queue(tmp_path):
+    q = _queue(tmp_path)
+    seen = []
+
+    def task(scraper, unit):
+        seen.append(unit['date'])
+        if unit['district'] == '27':
+            raise RuntimeError('no such court')
+        return {'rows': 1}
+
+    stats = Worker(WorkQueue(q.path, max_attempts=1), scraper=object(), task=task, heartbeat=0.05).run()
+    assert stats == {'done': 2, 'failed': 2, 'lost': 0}
+    assert sorted(seen) == ['2025-10-20'] * 2 + ['2025-10-21'] * 2
+    assert [r['result'] for r in q.results('s1')] == [{'rows': 1}, {'rows': 1}]
+
+
+class ListSession:
+    """Answers every cause-list request with a one-row list naming the requested district."""
+    headers = {}
+
+    def get(self, url, params=None, timeout=None, stream=False):
+        r = requests.Response()
+        body = f"<table><tr><th>S.No</th><th>Case</th></tr><tr><td>1</td><td>{params['sees_dist_code']}</td></tr></table>"
+        r.status_code, r.raw = 200, io.BytesIO(body.encode())
+        return r
+
+
+def test_default_worker_saves_units_to_the_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    queue = WorkQueue(str(tmp_path / 'q.db'))
+    queue.add(sweep_units([datetime.date(2025, 10, 20)], [{'state': '8', 'district': '26'},
+                                                          {'state': '8', 'district': '27'}]), sweep='s1')
+    worker = Worker(queue)
+    worker.scraper.s = ListSession()
+    assert worker.run_one() and worker.run_one()
+    assert worker.stats == {'done': 2, 'failed': 0, 'lost': 0}
+    # one file per unit, not one ./causelist_<date>.html for every court of the date
+    files = [r['result']['file'] for r in queue.results('s1')]
+    assert len(set(files)) == 2 and all(os.path.exists(f) for f in files)
+    assert [r['result']['rows'] for r in queue.results('s1')] == [1, 1]
+    assert not os.path.exists(tmp_path / 'causelist_2025-10-20.html')
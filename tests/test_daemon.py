@@ -0,0 +1,137 @@
+import contextlib
+import datetime
+import os
+import threading
+
+import pytest
+
+from ecourts_scraper import daemon
+from ecourts_scraper.models import CauseListRow
+
+
+class FakeScraper:
+    store = None
+
+    def __init__(self):
+        self.calls = []
+        self.cwd = None
+
+    @contextlib.contextmanager
+    def working_dir(self, path):
+        self.cwd = path
+        yield self
+
+    def download_cause_list(self, date, state=None, district=None, complex_code=None, est_code=None,
+                            court_no=None, compress=None, refresh=False, dest_dir=None):
+        self.calls.append((date, state, dest_dir))
+        return os.path.join(self.cwd, dest_dir or '', f'causelist_{date.isoformat()}.html')
+
+    def iter_cause_list_rows(self, date, **selectors):
+        for i in range(3):
+            yield CauseListRow.make([str(i), f'Cr. {i}/2024'], serial=str(i))
+
+    def get_cause_list_page(self):
+        raise ValueError('upstream down')
+
+
+@pytest.fixture
+def server(tmp_path):
+    srv = daemon.DaemonServer(FakeScraper(), str(tmp_path / 'd.sock'))
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_client_forwards_calls(server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client = daemon.connect(server.path)
+    assert client is not None and client.info['pid'] == os.getpid()
+
+    path = client.download_cause_list(datetime.date(2025, 10, 20), state='8')
+    # dates survive the round trip and outputs default to the caller's directory
+    assert server.scraper.calls == [(datetime.date(2025, 10, 20), '8', None)]
+    assert path == str(tmp_path / 'causelist_2025-10-20.html')
+    assert os.stat(server.path).st_mode & 0o777 == 0o600
+
+    rows = list(client.iter_cause_list_rows(datetime.date(2025, 10, 20)))
+    assert [r.serial for r in rows] == ['0', '1', '2'] and isinstance(rows[0], CauseListRow)
+    assert client._row_matches('cr. 1/2024', rows[1]['cols'])
+
+
+def test_errors_and_whitelist(server):
+    client = daemon.DaemonClient(server.path)
+    with pytest.raises(daemon.DaemonError, match='upstream down'):
+        client.get_cause_list_page()
+    with pytest.raises(AttributeError):
+        client.s
+    with pytest.raises(daemon.DaemonError, match='not allowed'):
+        client._request({'method': '_get', 'args': ['http://x']})
+
+
+def test_connect_without_daemon(tmp_path, monkeypatch):
+    assert daemon.connect(str(tmp_path / 'missing.sock')) is None
+    open(tmp_path / 'stale.sock', 'w').close()
+    assert daemon.connect(str(tmp_path / 'stale.sock')) is None
+    monkeypatch.setenv('ECOURTS_NO_DAEMON', '1')
+    assert daemon.connect(str(tmp_path / 'missing.sock')) is None
+
+
+def test_default_outputs_follow_the_callers_directory(tmp_path):
+    from ecourts_scraper.scraper import ECourtsScraper
+    scraper = ECourtsScraper()
+    with scraper.working_dir(str(tmp_path)):
+        assert scraper._local_path('causelist_x.html') == str(tmp_path / 'causelist_x.html')
+        assert scraper._local_path('/abs/x.html') == '/abs/x.html'
+    assert scraper._local_path('causelist_x.html') == 'causelist_x.html'
+
+
+def test_pdf_downloads_follow_the_callers_directory(tmp_path):
+    from ecourts_scraper.scraper import ECourtsScraper
+
+    class PdfResponse:
+        status_code = 200
+
+        def iter_content(self, size):
+            yield b'%PDF-1.4'
+
+        def close(self):
+            pass
+
+    scraper = ECourtsScraper()
+    scraper._send = lambda url, params, timeout, stream: PdfResponse()
+    with scraper.working_dir(str(tmp_path)):
+        saved = scraper._download_file('https://services.ecourts.gov.in/x/order.pdf')
+    assert saved == str(tmp_path / 'downloads' / 'order.pdf') and os.path.exists(saved)
+
+
+def test_shared_browser_lives_on_one_thread(monkeypatch):
+    import sys
+    import types
+    from ecourts_scraper import scraper as scraper_module
+    started = []
+
+    class Runtime:
+        class chromium:
+            @staticmethod
+            def launch(headless=True):
+                started.append(threading.current_thread().name)
+                return object()
+
+        def stop(self):
+            pass
+
+    fake = types.ModuleType('playwright.sync_api')
+    fake.sync_playwright = lambda: types.SimpleNamespace(start=Runtime)
+    monkeypatch.setitem(sys.modules, 'playwright', types.ModuleType('playwright'))
+    monkeypatch.setitem(sys.modules, 'playwright.sync_api', fake)
+    monkeypatch.setattr(scraper_module, '_pw_runtime', None)
+    monkeypatch.setattr(scraper_module, '_pw_browser', None)
+
+    first = scraper_module._start_playwright_browser()
+    t = threading.Thread(target=lambda: started.append(scraper_module._start_playwright_browser() == first))
+    t.start()
+    t.join()
+    # launched once, on the Playwright thread, and reused from a handler thread
+    assert started[0].startswith('ecourts-playwright') and started[1:] == [True]
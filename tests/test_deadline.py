@@ -0,0 +1,85 @@
+import datetime
+import io
+import time
+
+import requests
+
+from ecourts_scraper.scheduling import RequestScheduler
+from ecourts_scraper.scraper import ECourtsScraper
+
+
+class SlowSession:
+    headers = {}
+
+    def __init__(self):
+        self.timeouts = []
+
+    def get(self, url, params=None, timeout=None, stream=False):
+        self.timeouts.append(timeout)
+        time.sleep(min(timeout, 0.05))
+        raise requests.Timeout('read timed out')
+
+
+class SlowStream:
+    status_code = 200
+    headers = {'content-type': 'text/html'}
+    encoding = None
+
+    def iter_content(self, size):
+        yield b'<table><tr><th>Sr</th><th>Case</th></tr><tr><td>1</td><td>Cr. 1/2024</td></tr>'
+        yield b'<tr><td>2</td><td>Cr. 2/2024</td></tr>'
+        time.sleep(0.3)
+        yield b'<tr><td>3</td><td>Cr. 3/2024</td></tr></table>'
+
+    def close(self):
+        pass
+
+
+def test_retries_stop_at_the_deadline():
+    session = SlowSession()
+    scraper = ECourtsScraper(session=session, scheduler=RequestScheduler(rate=0))
+    start = time.monotonic()
+    res = scraper.check_by_cnr('DLHC01-1-2024', deadline=0.5)
+    assert time.monotonic() - start < 1.0  # without a deadline: 4 attempts and 7 s of back-off
+    assert res['timeout'] and res['error'] == 'deadline exceeded'
+    assert all(t <= 0.5 for t in session.timeouts)
+    assert scraper.remaining() is None  # the deadline doesn't outlive the call
+
+
+def test_streamed_rows_before_the_deadline_are_kept():
+    scraper = ECourtsScraper(scheduler=RequestScheduler(rate=0))
+    scraper._get = lambda url, params=None, stream=False, **kw: {'response': SlowStream()}
+    rows = list(scraper.iter_cause_list_rows(datetime.date(2025, 10, 20), deadline=0.15))
+    assert [r['cols'][1] for r in rows[:-1]] == ['Cr. 1/2024', 'Cr. 2/2024']
+    assert rows[-1].get('timeout')
+
+
+def test_scheduler_wait_respects_deadline():
+    sched = RequestScheduler(rate=0, max_concurrent=1)
+    sched.acquire('bulk')
+    scraper = ECourtsScraper(session=SlowSession(), scheduler=sched)
+    with scraper.deadline(0.1):
+        assert scraper.get_cause_list_page()['options'] == {}
+    assert not sched.acquire('interactive', timeout=0.05)
+    assert sched.waiting('interactive') == 0
+
+
+def test_streamed_response_holds_its_slot_until_closed():
+    class StreamSession:
+        headers = {}
+
+        def get(self, url, params=None, timeout=None, stream=False):
+            r = requests.Response()
+            r.status_code, r.raw = 200, io.BytesIO(b'<html></html>')
+            return r
+
+    sched = RequestScheduler(rate=0, max_concurrent=1)
+    scraper = ECourtsScraper(session=StreamSession(), scheduler=sched)
+    r = scraper._send('https://services.ecourts.gov.in/x', None, 5, stream=True)
+    assert not sched.acquire('interactive', timeout=0.05)
+    r.close()
+    r.close()
+    assert sched.acquire('interactive', timeout=0.05)
+    sched.release()
+    scraper._send('https://services.ecourts.gov.in/x', None, 5, stream=False)
+    assert sched.acquire('interactive', timeout=0.05)
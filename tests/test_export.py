@@ -0,0 +1,58 @@
+import datetime
+
+import pytest
+
+from conftest import cause_list_html, put_list
+from ecourts_scraper.export import ColumnarExport, file_sources, read_export, row_fields, store_sources
+
+pa = pytest.importorskip('pyarrow')
+pc = pytest.importorskip('pyarrow.compute')
+
+
+def _list(cases, court='Court 1'):
+    return cause_list_html([(i, c, f'A vs B{i}', court) for i, c in enumerate(cases, 1)])
+
+
+def test_row_fields():
+    assert row_fields(['1', 'Cr. 124/2024 (DLHC010001232024)', 'Ramesh vs State']) == \
+        ('Cr. 124/2024', 'DLHC010001232024', 'Ramesh vs State')
+    assert row_fields(['2', 'CRL/123/2024']) == ('CRL/123/2024', None, None)
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'arrow'])
+def test_incremental_partitioned_export(tmp_path, store, fmt):
+    d1, d2 = datetime.date(2025, 10, 20), datetime.date(2025, 10, 21)
+    put_list(store, d1, _list(['Cr. 1/2024', 'Cr. 2/2024']))
+    put_list(store, d1, _list(['CS 7/2023'], court='Court 9'), complex_code='2')
+    out = str(tmp_path / 'out')
+
+    first = ColumnarExport(out, fmt).add(store_sources(store), workers=0)
+    assert (first['sources'], first['rows'], first['dates']) == (2, 3, ['2025-10-20'])
+    table = read_export(out)
+    assert table.num_rows == 3
+    assert pa.types.is_dictionary(table.schema.field('court').type)
+    assert set(table['date'].to_pylist()) == {d1}
+
+    # nothing changed: nothing is parsed again
+    assert ColumnarExport(out, fmt).add(store_sources(store), workers=0)['sources'] == 0
+
+    # a new day is appended and a re-fetched list replaces its old rows only
+    put_list(store, d2, _list(['Cr. 3/2024']))
+    put_list(store, d1, _list(['Cr. 1/2024', 'Cr. 2/2024', 'Cr. 5/2024']))
+    again = ColumnarExport(out, fmt).add(store_sources(store), workers=0)
+    assert again['sources'] == 2 and again['dates'] == ['2025-10-20', '2025-10-21']
+    table = read_export(out)
+    assert table.num_rows == 5
+    per_court = table.group_by(['date', 'court']).aggregate([('serial', 'count')]).to_pylist()
+    assert sorted((r['date'].isoformat(), r['court'], r['serial_count']) for r in per_court) == [
+        ('2025-10-20', 'Court 1', 3), ('2025-10-20', 'Court 9', 1), ('2025-10-21', 'Court 1', 1)]
+    assert table.filter(pc.equal(table['complex'], '2'))['case_no'].to_pylist() == ['CS 7/2023']
+
+
+def test_loose_files(tmp_path):
+    path = tmp_path / 'causelist_2025-10-20.html'
+    path.write_bytes(_list(['Cr. 1/2024']))
+    summary = ColumnarExport(str(tmp_path / 'out')).add(file_sources([str(path)]), workers=0)
+    assert summary['rows'] == 1
+    with pytest.raises(ValueError):
+        list(file_sources(['rows.html']))
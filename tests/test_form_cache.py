@@ -0,0 +1,48 @@
+from conftest import FORM, Resp, submit_form
+from ecourts_scraper.scheduling import RequestScheduler
+from ecourts_scraper.scraper import ECourtsScraper
+
+
+class FakeSession:
+    def __init__(self, reject_first_post=False):
+        self.headers = {}
+        self.gets, self.posts = 0, []
+        self.reject = reject_first_post
+
+    def get(self, url, params=None, timeout=None, stream=False):
+        self.gets += 1
+        return Resp(FORM.format(token=f't{self.gets}'))
+
+    def post(self, url, data=None, timeout=None):
+        self.posts.append(data)
+        if self.reject:
+            self.reject = False
+            return Resp('Invalid token', 403)
+        return Resp('<a href="cl_1.pdf">list</a>')
+
+
+def test_form_schema_is_reused_between_submissions():
+    session = FakeSession()
+    scraper = ECourtsScraper(session=session, scheduler=RequestScheduler(rate=0))
+    assert submit_form(scraper)['links'][0].endswith('cl_1.pdf')
+    submit_form(scraper)
+    assert session.gets == 1 and len(session.posts) == 2
+    assert session.posts[1]['app_token'] == 't1' and session.posts[1]['sess_state_code'] == '8'
+
+
+def test_rejected_tokens_are_refreshed_once():
+    session = FakeSession(reject_first_post=True)
+    scraper = ECourtsScraper(session=session, scheduler=RequestScheduler(rate=0))
+    assert 'links' in submit_form(scraper)
+    assert session.gets == 2 and [p['app_token'] for p in session.posts] == ['t1', 't2']
+
+
+def test_result_page_with_csrf_field_is_not_a_rejection():
+    session = FakeSession()
+    session.post = lambda url, data=None, timeout=None: (session.posts.append(data) or Resp(
+        '<meta name="csrf-token" content="x"><input type="hidden" name="csrf_token">'
+        '<a href="cl_1.pdf">list</a>'))
+    scraper = ECourtsScraper(session=session, scheduler=RequestScheduler(rate=0))
+    assert submit_form(scraper)['links'][0].endswith('cl_1.pdf')
+    assert session.gets == 1 and len(session.posts) == 1
+    assert scraper._form is not None
@@ -0,0 +1,110 @@
+import threading
+import time
+
+from ecourts_scraper.latency import Hedger, LatencyTracker, endpoint_key
+from ecourts_scraper.scheduling import RequestScheduler
+from ecourts_scraper.scraper import ECourtsScraper
+
+
+class Response:
+    status_code = 200
+    headers = {'content-type': 'application/json'}
+
+    def __init__(self, n):
+        self.n = n
+        self.closed = False
+
+    def json(self):
+        return {'listing': {'serial': str(self.n), 'court': 'Court 1'}}
+
+    def close(self):
+        self.closed = True
+
+
+class TailSession:
+    """The first request stalls (a tail-latency response); the rest answer at once."""
+    headers = {}
+
+    def __init__(self, stall=0.5):
+        self.stall = stall
+        self.responses = []
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None, stream=False):
+        with self._lock:
+            r = Response(len(self.responses))
+            self.responses.append(r)
+        if r.n == 0:
+            time.sleep(self.stall)
+        return r
+
+
+def _primed(hedger, url, seconds=0.01):
+    for _ in range(hedger.tracker.min_samples):
+        hedger.tracker.record(url, seconds)
+    return hedger
+
+
+def test_slow_request_is_hedged_and_loser_closed():
+    session = TailSession()
+    hedger = _primed(Hedger(budget=100), endpoint_key(ECourtsScraper.BASE + 'case/cnrSearch'))
+    scraper = ECourtsScraper(session=session, scheduler=RequestScheduler(rate=0), hedger=hedger)
+    listing = scraper.check_by_cnr('DLHC01-1-2024')
+    assert listing.serial == '1'  # the hedge's answer
+    assert hedger.stats == {'requests': 1, 'hedged': 1, 'hedge_wins': 1}
+    assert session.responses[0].closed and not session.responses[1].closed
+
+
+def test_primary_runs_on_the_callers_thread():
+    hedger = _primed(Hedger(budget=100), 'x', 0.001)
+    threads = []
+
+    def attempt():
+        threads.append(threading.get_ident())
+        if len(threads) == 1:
+            time.sleep(0.15)
+            return 'primary'
+        return 'hedge'
+    assert hedger.run('x', attempt) == 'hedge'
+    assert threads[0] == threading.get_ident() and threads[1] != threads[0]
+
+
+def test_no_hedging_without_history_or_budget():
+    hedger = Hedger(budget=10, min_delay=0, tracker=LatencyTracker(min_samples=5))
+    assert hedger.run('x', lambda: 'fast') == 'fast' and hedger.stats['hedged'] == 0
+    _primed(hedger, 'x', 0.001)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.01)
+        return 'slow'
+    for _ in range(20):
+        assert hedger.run('x', slow) == 'slow'
+    # every request was slower than p95, but only 10% of them may be hedged
+    assert hedger.stats['requests'] == 21
+    assert 1 <= hedger.stats['hedged'] <= 2
+    assert len(calls) == 20 + hedger.stats['hedged']
+
+
+def test_failed_copy_falls_back_to_the_other():
+    hedger = _primed(Hedger(budget=100), 'x', 0.001)
+    n = []
+
+    def attempt():
+        n.append(1)
+        if len(n) == 1:
+            time.sleep(0.15)  # fails after the hedge (sent at 0.05 s) has started
+            raise OSError('reset')
+        time.sleep(0.2)
+        return 'ok'
+    assert hedger.run('x', attempt) == 'ok'
+    assert hedger.stats['hedge_wins'] == 1
+
+
+def test_latency_quantiles():
+    t = LatencyTracker(min_samples=10)
+    for i in range(1, 101):
+        t.record('a', i / 100)
+    assert t.quantile('a', 0.5) == 0.51 and t.quantile('a', 0.95) == 0.96
+    assert t.quantile('b', 0.5) is None
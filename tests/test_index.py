@@ -0,0 +1,66 @@
+import datetime
+import os
+
+from conftest import cause_list_html, put_list
+from ecourts_scraper.export import store_sources
+from ecourts_scraper.index import CauseListIndex, similarity, trigrams
+
+D1, D2 = datetime.date(2025, 10, 20), datetime.date(2025, 10, 21)
+
+
+def _list(parties, court='Court 1'):
+    return cause_list_html([(i, f'Cr. {i}/2024', p, f'Adv. {a}', court) for i, (p, a) in enumerate(parties, 1)],
+                           header=('S.No', 'Case', 'Parties', 'Advocate', 'Court'))
+
+
+def _fill(store):
+    put_list(store, D1, _list([('Ramesh Kumar vs State', 'S. Sharma'), ('Anita Devi vs Mohan Lal', 'P. Gupta')]))
+    put_list(store, D2, _list([('Rameshwar Kumaar vs State', 'R. Verma')], court='Court 2'))
+    put_list(store, D2, _list([('State vs Ramesh Kumar', 'S. Sharma')]), district='27')
+    return store
+
+
+def test_trigram_similarity():
+    assert trigrams('ab') == {'  a', ' ab', 'ab '}
+    assert similarity('kumar', 'kumar') == 1.0
+    assert similarity('kumar', 'kumaar') > similarity('kumar', 'kapoor')
+
+
+def test_fuzzy_ranked_search_with_filters(tmp_path, store):
+    index = CauseListIndex(str(tmp_path / 'index.db'))
+    summary = index.add(store_sources(_fill(store)), workers=0)
+    assert summary == {'sources': 3, 'rows': 4, 'errors': []}
+
+    results = index.search('Rmesh Kumaar')
+    assert [(r['date'], r['district']) for r in results] == [('2025-10-21', '27'), ('2025-10-20', '26')]
+    assert results[0]['score'] == results[1]['score'] < 1
+    assert results[0]['case_no'] == 'Cr. 1/2024' and results[0]['state'] == '8'
+
+    results = index.search('ramesh kumar')
+    assert [r['score'] for r in results] == [1.0, 1.0, 0.585]
+    assert results[2]['text'] == '1 Cr. 1/2024 Rameshwar Kumaar vs State Adv. R. Verma Court 2'
+    assert index.search('sharma ramesh', date_to=D1) == index.search('sharma ramesh', district='26')[:1]
+    assert [r['court'] for r in index.search('kumar', date_from='2025-10-21', district='26')] == ['Court 2']
+    assert index.search('anita sharma') == []  # every word must match
+    assert index.search('zzzz') == [] and index.search('!') == []
+
+
+def test_incremental_updates(tmp_path, store):
+    _fill(store)
+    index = CauseListIndex(str(tmp_path / 'index.db'))
+    index.add(store_sources(store), workers=0)
+    assert index.add(store_sources(store), workers=0)['sources'] == 0
+
+    path = put_list(store, D1, _list([('Sunita Yadav vs State', 'P. Gupta')]))
+    os.utime(path, (1, 1))
+    assert index.add(store_sources(store), workers=0) == {'sources': 1, 'rows': 1, 'errors': []}
+    assert index.search('anita devi') == []
+    assert index.search('sunita yadav')[0]['date'] == '2025-10-20'
+    assert index.stats() == {'sources': 3, 'rows': 3, 'terms': index.stats()['terms']}
+
+
+def test_rows_without_a_court_cell_take_the_lists_court(tmp_path, store):
+    put_list(store, D1, cause_list_html([(1, 'Ramesh vs State')], header=('S.No', 'Parties')), court_no='5')
+    index = CauseListIndex(str(tmp_path / 'index.db'))
+    index.add(store_sources(store), workers=0)
+    assert [r['court'] for r in index.search('ramesh', court='5')] == ['5']
@@ -0,0 +1,99 @@
+import threading
+import time
+
+from ecourts_scraper import webapi
+from ecourts_scraper.jobs import JobManager
+
+
+class FakeScraper:
+    from contextlib import nullcontext as _ctx
+
+    def priority(self, cls):
+        return self._ctx()
+
+    def iter_cause_list_rows(self, date, **selectors):
+        for i in range(250):
+            yield {'cols': [str(i), f'Cr. {i}/2024'], 'serial': str(i), 'court': None, 'pdf': None, 'links': []}
+
+    def _row_matches(self, query, cols):
+        return query in ' '.join(cols)
+
+
+def _wait(job):
+    deadline = time.time() + 5
+    while not job.done and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_search_job_reports_progress_and_result():
+    manager = JobManager(FakeScraper())
+    job = manager.submit('search', {'query': 'Cr. 42/2024', 'date': '2025-10-20'})
+    _wait(job)
+    assert job.status == 'done'
+    assert job.result['rows'] == 250 and len(job.result['matches']) == 1
+    names = [e['event'] for e in job.events]
+    assert names[:2] == ['queued', 'started'] and 'match' in names and names[-1] == 'done'
+
+
+def test_job_api_roundtrip(monkeypatch):
+    monkeypatch.setattr(webapi, '_jobs', JobManager(FakeScraper()))
+    client = webapi.app.test_client()
+    res = client.post('/api/jobs', json={'type': 'search', 'params': {'query': 'Cr. 7/2024'}})
+    assert res.status_code == 202
+    job_id = res.get_json()['id']
+    _wait(webapi.get_jobs().get(job_id))
+    body = client.get(f'/api/jobs/{job_id}/result').get_json()
+    assert body['result']['found']
+    events = client.get(f'/api/jobs/{job_id}/events').get_data(as_text=True)
+    assert 'event: done' in events
+    assert client.post('/api/jobs', json={'type': 'nope'}).status_code == 400
+
+
+def test_job_is_done_only_after_its_final_event():
+    job = JobManager(FakeScraper()).submit('search', {'query': 'x'})
+    while not job.done:
+        time.sleep(0)
+    # whoever sees done can rely on finished and the final event being there
+    assert job.finished is not None and job.events[-1]['event'] == 'done'
+
+
+def test_pdf_jobs_only_fetch_ecourts_urls(monkeypatch):
+    monkeypatch.setattr(webapi, '_jobs', JobManager(FakeScraper()))
+    client = webapi.app.test_client()
+    for url in ('http://169.254.169.254/latest/meta-data/', 'file:///etc/passwd',
+                'http://services.ecourts.gov.in/x.pdf', 'https://services.ecourts.gov.in.evil.test/x.pdf'):
+        res = client.post('/api/jobs', json={'type': 'pdfs', 'params': {'urls': [url]}})
+        assert res.status_code == 400, url
+    assert webapi.get_jobs().list() == []
+    ok = {'urls': ['https://services.ecourts.gov.in/ecourtindia_v6/cl_1.pdf']}
+    assert client.post('/api/jobs', json={'type': 'pdfs', 'params': ok}).status_code == 202
+
+
+def test_pdf_text_is_extracted_while_later_pdfs_download(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    from ecourts_scraper import pdftext
+    extracted = threading.Event()
+
+    def fake_extract(data):
+        extracted.set()
+        return '1.   Cr. 9/2024   State vs Ramesh'
+
+    monkeypatch.setattr(pdftext, 'pdf_bytes_to_text', fake_extract)
+    monkeypatch.setattr(pdftext, 'parse_pool', lambda workers=None: ThreadPoolExecutor(1))
+    monkeypatch.setenv('ECOURTS_PDF_CACHE', str(tmp_path / 'cache'))
+
+    class PdfScraper(FakeScraper):
+        def download_urls(self, urls, compress=None):
+            name = urls[0].rsplit('/', 1)[1]
+            if name == 'b.pdf':
+                # the first PDF went to the extraction pool before this download started
+                assert extracted.wait(2)
+            path = tmp_path / name
+            path.write_bytes(b'%PDF-1 ' + name.encode())
+            return {'saved': [{'url': urls[0], 'path': str(path)}]}
+
+    urls = [f'https://services.ecourts.gov.in/ecourtindia_v6/{n}.pdf' for n in 'ab']
+    job = JobManager(PdfScraper()).submit('pdfs', {'urls': urls, 'query': 'Ramesh'})
+    _wait(job)
+    assert job.status == 'done', job.error
+    assert len(job.result['saved']) == 2 and len(job.result['matches']) == 2
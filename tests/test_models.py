@@ -0,0 +1,23 @@
+import json
+
+from ecourts_scraper.models import CauseListRow, CaseListing, CourtOption
+from ecourts_scraper.utils import json_default
+
+
+def test_row_record_is_dict_compatible_and_compact():
+    row = CauseListRow.make(['1', 'Court A', 'Cr. 1/2024'], serial='1', court='Court A')
+    assert row['cols'][2] == 'Cr. 1/2024' and row.get('links', []) == ()
+    assert 'error' not in row and 'court' in row
+    assert not hasattr(row, '__dict__')
+    assert CauseListRow.unpack(row.pack()) == row
+    other = CauseListRow.make(['2', ''.join(['Court ', 'A'])], court=''.join(['Court ', 'A']))
+    assert other.court is row.court and other.cols[1] is row.cols[1]  # interned, cell too
+
+
+def test_listing_serialises_like_the_old_dicts():
+    listing = CaseListing.make(rows=[('1', 'Court A')], serial='1', court='Court A')
+    assert json.loads(json.dumps(listing, default=json_default)) == {
+        'rows': [['1', 'Court A']], 'serial': '1', 'court': 'Court A'}
+    assert 'pdf' not in listing
+    value, text = CourtOption.make('8', 'Bihar')
+    assert (value, text) == ('8', 'Bihar')
@@ -0,0 +1,93 @@
+import datetime
+from pathlib import Path
+
+import pytest
+
+from ecourts_scraper import parsecache, scraper as scraper_module
+from ecourts_scraper.models import CauseListRow, CourtOption
+from ecourts_scraper.parsecache import ParseCache
+from ecourts_scraper.scraper import ECourtsScraper, _parse_selects
+
+
+class Counting:
+    def __init__(self, fn=lambda data: len(data)):
+        self.fn, self.calls = fn, 0
+
+    def __call__(self, data):
+        self.calls += 1
+        return self.fn(data)
+
+
+def test_lru_keyed_by_content_kind_and_version(monkeypatch):
+    cache = ParseCache(max_entries=2, max_bytes=10)
+    parse = Counting()
+    assert cache.parse('rows', b'abc', parse) == 3
+    assert cache.parse('rows', 'abc', parse) == 3  # str and bytes of the same content
+    cache.parse('links', b'abc', parse)
+    cache.parse('rows', b'abc', parse, 'other base')
+    assert parse.calls == 3 and cache.stats == {'hits': 1, 'disk_hits': 0, 'misses': 3}
+
+    cache.parse('rows', b'abc', parse)  # evicted by the two entries after it
+    assert parse.calls == 4
+    cache.parse('rows', b'x' * 11, parse)  # larger than max_bytes: never held
+    cache.parse('rows', b'x' * 11, parse)
+    assert parse.calls == 6
+    monkeypatch.setattr(parsecache, 'PARSER_VERSION', parsecache.PARSER_VERSION + 1)
+    cache.parse('rows', b'abc', parse)
+    assert parse.calls == 7
+
+
+def test_disk_layer_round_trips_records(tmp_path):
+    result = {'rows': [CauseListRow.make(['1', 'Cr. 5/2024'], '1', 'Court 2', 'https://x/a.pdf', ['https://x/a.pdf'])],
+              'options': [CourtOption.make('8', 'Bihar')], 'pair': ('a', None)}
+    parse = Counting(lambda data: result)
+    ParseCache(root=str(tmp_path)).parse('kind', b'<html>', parse)
+    again = ParseCache(root=str(tmp_path))
+    assert again.parse('kind', b'<html>', parse) == result
+    assert again.parse('none', b'', Counting(lambda data: None)) is None
+    fresh = ParseCache(root=str(tmp_path))
+    assert fresh.parse('none', b'', parse) is None
+    assert parse.calls == 1 and fresh.stats['disk_hits'] == 1
+    assert isinstance(again.parse('kind', b'<html>', parse)['options'][0], CourtOption)
+
+
+@pytest.fixture
+def soup_calls(monkeypatch):
+    monkeypatch.setattr(parsecache, '_cache', ParseCache())
+    calls = []
+    real = scraper_module._soup
+
+    def counting(markup):
+        calls.append(1)
+        return real(markup)
+
+    monkeypatch.setattr(scraper_module, '_soup', counting)
+    return calls
+
+
+def test_repeat_searches_parse_the_list_once(tmp_path, soup_calls):
+    dest = tmp_path / 'causelist_2025-10-16.html'
+    dest.write_bytes((Path(__file__).parent / 'fixtures' / 'sample_case.html').read_bytes())
+    scraper = ECourtsScraper()
+    scraper.download_cause_list = lambda date: str(dest)
+    day = datetime.date(2025, 10, 16)
+    assert scraper.search_case_in_cause_list(day, 'Cr. 123/2024')['serial'] == '1'
+    assert scraper.search_case_in_cause_list(day, 'Cr. 124/2024')['court'] == 'Special Court B'
+    assert scraper.search_case_in_cause_list(day, 'Special Court')['found']
+    assert len(soup_calls) == 1
+
+
+def test_cached_results_are_copies(soup_calls):
+    html = '<select name="state"><option value="8">Bihar</option></select>'
+    first = _parse_selects(html)
+    first['state'] = []
+    assert _parse_selects(html) == {'state': [('8', 'Bihar')]}
+
+    scraper = ECourtsScraper()
+    page = '<a href="cl/1.pdf">list</a><form action="?p=x"><input type="hidden" name="t" value="1"></form>'
+    assert scraper.find_cause_list_links(page)['links'] == [scraper.BASE + 'cl/1.pdf']
+    scraper.find_cause_list_links(page)['links'].append('junk')
+    assert scraper.find_cause_list_links(page)['links'] == [scraper.BASE + 'cl/1.pdf']
+    scraper.parse_cause_list_form(page)['hidden']['t'] = 'changed'
+    assert scraper.parse_cause_list_form(page)['hidden'] == {'t': '1'}
+    assert len(soup_calls) == 3
@@ -0,0 +1,38 @@
+from ecourts_scraper import pdftext
+
+TEXT = """In the Court of Addl. Sessions Judge, Patna
+Court No. 3
+1.   Cr. 124/2024      State vs Ramesh      For Hearing
+2.   Cr. 77/2023       State vs Suresh      For Orders
+"""
+
+
+def test_text_rows_track_court_and_serial():
+    rows = list(pdftext.text_rows(TEXT, pdf='a.pdf'))
+    assert [r.serial for r in rows] == ['1', '2']
+    assert rows[0].cols == ('1.', 'Cr. 124/2024', 'State vs Ramesh', 'For Hearing')
+    assert rows[1].court == 'Court No. 3' and rows[1].pdf == 'a.pdf'
+
+
+def test_search_pdfs_caches_text_by_content(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_extract(data):
+        calls.append(data)
+        if data == b'broken':
+            raise ValueError('not a PDF')
+        return TEXT
+
+    monkeypatch.setattr(pdftext, 'pdf_bytes_to_text', fake_extract)
+    a, b, bad = tmp_path / 'a.pdf', tmp_path / 'b.pdf', tmp_path / 'bad.pdf'
+    a.write_bytes(b'%PDF-1 same')
+    b.write_bytes(b'%PDF-1 same')
+    bad.write_bytes(b'broken')
+    cache = pdftext.PdfTextCache(str(tmp_path / 'cache'))
+
+    hits = list(pdftext.search_pdfs([str(a), str(bad)], 'cr. 77/2023', workers=0, cache=cache))
+    assert hits[0].serial == '2' and hits[0].pdf == str(a)
+    assert 'not a PDF' in hits[1]['error'] and hits[1]['pdf'] == str(bad)
+    # same bytes under another name: served from the cache
+    assert [r.pdf for r in pdftext.search_pdfs([str(b)], 'Ramesh', workers=0, cache=cache)] == [str(b)]
+    assert calls == [b'%PDF-1 same', b'broken']
@@ -0,0 +1,28 @@
+from ecourts_scraper.pipeline import run_pipeline
+from pathlib import Path
+
+
+def _fetch(unit):
+    if unit == 'bad':
+        return {'error': 'HTTP 500'}
+    return (Path(__file__).parent / 'fixtures' / 'sample_case.html').read_bytes()
+
+
+def test_pipeline_parses_in_worker_processes():
+    units = ['a', 'b', 'bad', 'c']
+    results = dict(run_pipeline(units, _fetch, io_workers=2, parse_workers=2, max_pending=1))
+    assert set(results) == set(units)
+    assert results['bad'] == {'error': 'HTTP 500'}
+    assert [r['court'] for r in results['a']] == ['Special Court A', 'Special Court B']
+
+
+def test_pipeline_inline_parse():
+    results = list(run_pipeline(['a'], _fetch, parse_workers=0))
+    assert results[0][1][1]['cols'][2] == 'Cr. 124/2024'
+
+
+def test_parse_pool_is_not_replaced_while_shared():
+    from ecourts_scraper.pipeline import parse_pool
+    pool = parse_pool(1)
+    assert parse_pool(8) is pool
+    assert pool.submit(len, b'abc').result(timeout=60) == 3
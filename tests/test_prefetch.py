@@ -0,0 +1,51 @@
+from ecourts_scraper.prefetch import Prefetcher, parse_window, in_window
+from ecourts_scraper.store import CauseListStore
+import datetime
+
+
+class FlakyScraper:
+    """Fails the first download of each target, then writes into the store."""
+
+    def __init__(self, store):
+        self.store = store
+        self.calls = []
+
+    def download_cause_list(self, date, *selectors):
+        self.calls.append(selectors)
+        if self.calls.count(selectors) == 1:
+            return {'error': 'HTTP 503'}
+        path = self.store.path_for(date, *selectors)
+        import os
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b'<table></table>')
+        return path
+
+
+def test_prefetch_retries_and_fills_store(tmp_path):
+    store = CauseListStore(str(tmp_path), compress=None)
+    targets = [{'state': '8', 'district': '26', 'complex': '1'}, {'state': '8', 'district': '27', 'priority': 1}]
+    scraper = FlakyScraper(store)
+    p = Prefetcher(targets, scraper=scraper, store=store, concurrency=2, retry_delay=0)
+    date = datetime.date(2025, 10, 20)
+    stats = p.run_once(date)
+    assert stats == {'fetched': 2, 'cached': 0, 'retried': 2, 'failed': 0}
+    assert store.get(date, '8', '26', '1')
+    # second run is served from the store without touching upstream
+    assert p.run_once(date)['cached'] == 2
+    assert len(scraper.calls) == 4
+
+
+def test_window_wraps_midnight():
+    w = parse_window('22:00-05:00')
+    assert in_window(w, datetime.datetime(2025, 1, 1, 23, 30))
+    assert in_window(w, datetime.datetime(2025, 1, 1, 4, 59))
+    assert not in_window(w, datetime.datetime(2025, 1, 1, 12, 0))
+
+
+def test_failures_are_recorded(tmp_path):
+    store = CauseListStore(str(tmp_path), compress=None)
+    p = Prefetcher([{'state': '8', 'district': '26'}], scraper=FlakyScraper(store), store=store,
+                   retry_delay=0, max_attempts=1)
+    assert p.run_once(datetime.date(2025, 10, 20))['failed'] == 1
+    assert p.failures[0]['last_error'] == 'HTTP 503' and p.failures[0]['target']['district'] == '26'
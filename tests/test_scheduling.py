@@ -0,0 +1,39 @@
+from ecourts_scraper.scheduling import RequestScheduler
+import threading
+import time
+
+
+def test_interactive_overtakes_waiting_bulk():
+    sched = RequestScheduler(rate=0, max_concurrent=1)
+    order = []
+
+    def worker(cls, tag):
+        with sched.slot(cls):
+            order.append(tag)
+
+    sched.acquire('bulk')  # occupy the only slot
+    threads = [threading.Thread(target=worker, args=('bulk', f'b{i}')) for i in range(3)]
+    for t in threads:
+        t.start()
+    while sched.waiting('bulk') < 3:
+        time.sleep(0.01)
+    late = threading.Thread(target=worker, args=('interactive', 'i0'))
+    late.start()
+    while sched.waiting('interactive') < 1:
+        time.sleep(0.01)
+    sched.release()
+    for t in threads + [late]:
+        t.join(2)
+    assert order[0] == 'i0'
+    assert sorted(order[1:]) == ['b0', 'b1', 'b2']
+
+
+def test_rate_budget_is_shared():
+    sched = RequestScheduler(rate=50, burst=1)
+    start = time.monotonic()
+    for cls in ('interactive', 'bulk', 'prefetch', 'interactive'):
+        with sched.slot(cls):
+            pass
+    # one token up front, the remaining three at 50/s
+    assert time.monotonic() - start >= 0.05
+    assert sched.stats['interactive'] == 2
@@ -19,3 +19,16 @@ def test_search_fixture(tmp_path):
     assert res['found']
     assert res['serial'] == '1'
     assert 'Special Court A' in res['court']
+
+
+def test_search_compressed_fixture(tmp_path):
+    import gzip
+    fixture = Path(__file__).parent / 'fixtures' / 'sample_case.html'
+    dest = tmp_path / 'causelist_2025-10-16.html.gz'
+    dest.write_bytes(gzip.compress(fixture.read_bytes()))
+
+    scraper = ECourtsScraper()
+    scraper.download_cause_list = lambda date: str(dest)
+    res = scraper.search_case_in_cause_list(datetime.date(2025,10,16), 'Cr. 124/2024')
+    assert res['found']
+    assert res['court'] == 'Special Court B'
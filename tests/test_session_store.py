@@ -0,0 +1,85 @@
+import os
+import time
+
+from requests.cookies import RequestsCookieJar
+
+from conftest import FORM, Resp, submit_form
+from ecourts_scraper.scheduling import RequestScheduler
+from ecourts_scraper.scraper import ECourtsScraper
+from ecourts_scraper.sessionstore import SessionStore
+
+
+class FakeSession:
+    """Issues session cookie and token <name><n> on the n-th landing page; accepts only token
+    `valid` (any token when None)."""
+
+    def __init__(self, name, valid=None):
+        self.name, self.valid = name, valid
+        self.headers = {}
+        self.cookies = RequestsCookieJar()
+        self.gets, self.posts = 0, []
+
+    def get(self, url, params=None, timeout=None, stream=False):
+        self.gets += 1
+        self.cookies.set('PHPSESSID', f'{self.name}{self.gets}', domain='services.ecourts.gov.in')
+        return Resp(FORM.format(token=f'{self.name}{self.gets}'))
+
+    def post(self, url, data=None, timeout=None):
+        self.posts.append((self.cookies.get('PHPSESSID'), data['app_token']))
+        if self.valid is not None and data['app_token'] != self.valid:
+            return Resp('Invalid token', 403)
+        return Resp('<a href="cl_1.pdf">list</a>')
+
+
+def _scraper(session, store):
+    return ECourtsScraper(session=session, scheduler=RequestScheduler(rate=0), session_store=store)
+
+
+def test_new_process_starts_from_the_saved_session(tmp_path):
+    store = SessionStore(str(tmp_path / 'session.json'))
+    first = FakeSession('a')
+    assert 'links' in submit_form(_scraper(first, store))
+    assert store.load()['cookies'][0]['value'] == 'a1'
+    assert os.stat(store.path).st_mode & 0o777 == 0o600
+
+    second = FakeSession('b')
+    assert 'links' in submit_form(_scraper(second, store))
+    # no landing page: the cookie and form tokens came from the store
+    assert second.gets == 0 and second.posts == [('a1', 'a1')]
+
+
+def test_rejected_session_adopts_a_newer_snapshot(tmp_path):
+    store = SessionStore(str(tmp_path / 'session.json'))
+    submit_form(_scraper(FakeSession('a'), store))
+    lagging = FakeSession('b', valid='c1')
+    worker = _scraper(lagging, store)
+    # meanwhile another worker refreshes the session
+    submit_form(_scraper(FakeSession('c', valid='c1'), store))
+
+    assert 'links' in submit_form(worker)
+    assert lagging.gets == 0 and lagging.posts == [('a1', 'a1'), ('c1', 'c1')]
+
+
+def test_rejected_session_without_a_newer_one_is_refreshed(tmp_path):
+    store = SessionStore(str(tmp_path / 'session.json'))
+    submit_form(_scraper(FakeSession('a'), store))
+    session = FakeSession('b', valid='b1')
+    assert 'links' in submit_form(_scraper(session, store))
+    assert session.gets == 1 and session.posts == [('a1', 'a1'), ('b1', 'b1')]
+    assert store.load()['tokens']['form']['hidden'] == {'app_token': 'b1'}
+
+
+def test_snapshots_expire_and_invalidate_only_their_generation(tmp_path):
+    store = SessionStore(str(tmp_path / 'session.json'), ttl=60)
+    assert store.load() is None
+    gen = store.save([{'name': 'PHPSESSID', 'value': 'x', 'domain': '', 'path': '/'}])
+    newer = store.save([{'name': 'PHPSESSID', 'value': 'y', 'domain': '', 'path': '/'}])
+    assert newer == gen + 1
+    assert not store.invalidate(gen) and store.load()['generation'] == newer
+    assert store.invalidate(newer) and store.load() is None
+    assert store.save([]) == newer + 1
+
+    short = SessionStore(str(tmp_path / 'short.json'), ttl=0.01)
+    short.save([])
+    time.sleep(0.02)
+    assert short.load() is None
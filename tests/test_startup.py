@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _loaded(code):
+    out = subprocess.run([sys.executable, '-c', code + '\nimport sys\n'
+                          'print(" ".join(m for m in ("bs4", "requests", "playwright") if m in sys.modules))'],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    return out.stdout.split()
+
+
+def test_cli_import_defers_heavy_dependencies():
+    assert _loaded('import ecourts_scraper.cli') == []
+
+
+def test_scraper_construction_defers_requests():
+    assert _loaded('from ecourts_scraper.scraper import ECourtsScraper, parse_cause_list_rows\n'
+                   'ECourtsScraper(); parse_cause_list_rows("<table><tr><td>1</td></tr></table>")') == []
+
+
+def test_webapi_import_builds_no_scraper():
+    out = subprocess.run([sys.executable, '-c', 'import ecourts_scraper.webapi as w\n'
+                          'print(w._scraper is None and w._jobs is None)'],
+                         cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == 'True'
@@ -0,0 +1,52 @@
+from ecourts_scraper.scraper import ECourtsScraper
+from pathlib import Path
+import datetime
+
+
+class FakeStreamResponse:
+    status_code = 200
+    headers = {'content-type': 'text/html'}
+    encoding = None
+
+    def __init__(self, body, chunk=7):
+        self.body = body
+        self.chunk = chunk
+        self.closed = False
+
+    def iter_content(self, size):
+        for i in range(0, len(self.body), self.chunk):
+            yield self.body[i:i+self.chunk]
+
+    def close(self):
+        self.closed = True
+
+
+def test_stream_rows_and_archive(tmp_path):
+    body = (Path(__file__).parent / 'fixtures' / 'sample_case.html').read_bytes()
+    resp = FakeStreamResponse(body)
+    scraper = ECourtsScraper()
+    scraper._get = lambda url, params=None, stream=False, **kw: {'response': resp}
+
+    archive = tmp_path / 'causelist.html'
+    rows = list(scraper.iter_cause_list_rows(datetime.date(2025, 10, 16), archive_path=str(archive)))
+    assert [r['cols'][2] for r in rows] == ['Cr. 123/2024', 'Cr. 124/2024']
+    assert rows[0]['court'] == 'Special Court A'
+    assert archive.read_bytes() == body
+    assert resp.closed
+
+    matches = list(scraper.iter_cause_list_matches(datetime.date(2025, 10, 16), 'cr. 124'))
+    assert len(matches) == 1 and matches[0]['court'] == 'Special Court B'
+
+
+def test_compressed_outputs_are_compressed(tmp_path):
+    body = (Path(__file__).parent / 'fixtures' / 'sample_case.html').read_bytes()
+    scraper = ECourtsScraper()
+    scraper._get = lambda url, params=None, stream=False, **kw: {'response': FakeStreamResponse(body)}
+
+    saved = scraper.download_cause_list(datetime.date(2025, 10, 16), compress='gz', dest_dir=str(tmp_path))
+    assert saved.endswith('.html.gz') and Path(saved).read_bytes()[:2] == b'\x1f\x8b'
+
+    archive = tmp_path / 'streamed.html.gz'
+    list(scraper.iter_cause_list_rows(datetime.date(2025, 10, 16), archive_path=str(archive)))
+    assert archive.read_bytes()[:2] == b'\x1f\x8b'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['causelist_2025-10-16.html.gz', 'streamed.html.gz']
@@ -0,0 +1,74 @@
+import datetime
+import threading
+
+from ecourts_scraper.coordinator import WorkQueue
+from ecourts_scraper.sweep import date_range, expand_scope, run_sweep, split_complex
+
+OPTIONS = {
+    None: {'sess_dist_code': [('0', 'Select District'), ('26', 'Patna'), ('28', 'Gaya')]},
+    '26': {'court_complex_code': [('0', 'Select Complex'), ('101@1,2@N', 'Civil Court Patna')],
+           'CL_court_no': [('5', 'Court 5'), ('6', 'Court 6')]},
+    '28': {'court_complex_code': [('201', 'Civil Court Gaya')]},
+}
+
+
+class FakeScraper:
+    store = object()
+
+    def __init__(self):
+        self.lookups = []
+
+    def get_dependent_options(self, state=None, district=None, **kw):
+        self.lookups.append(district)
+        return {'options': OPTIONS[district], 'html': ''}
+
+
+def test_scope_expansion():
+    scraper = FakeScraper()
+    targets = expand_scope(scraper, '8')
+    assert [(t['district'], t['complex_code'], t['est_code'], t['court_no']) for t in targets] == \
+        [('26', '101', '1', None), ('26', '101', '2', None), ('28', '201', None, None)]
+    assert len(expand_scope(scraper, '8', ['26'], per_court=True)) == 4
+    # given complexes need no lookups
+    scraper.lookups.clear()
+    assert expand_scope(scraper, '8', ['26'], ['101', '102'])[1]['complex_code'] == '102'
+    assert scraper.lookups == []
+    assert split_complex('101') == ('101', [])
+
+
+def test_reruns_skip_finished_units(tmp_path):
+    queue = WorkQueue(str(tmp_path / 'q.db'), max_attempts=1)
+    dates = date_range(datetime.date(2025, 10, 20), datetime.date(2025, 10, 22))
+    targets = [{'state': '8', 'district': '26', 'complex_code': c} for c in ('1', '2')]
+    calls = []
+    flaky = {'2025-10-21'}
+
+    def task(scraper, unit):
+        calls.append((unit['date'], unit['complex_code']))
+        if unit['date'] in flaky:
+            raise RuntimeError('HTTP 503')
+        return {'rows': 10, 'bytes': 1000}
+
+    first = run_sweep(targets, dates, scraper=FakeScraper(), queue=queue, name='s', workers=3, task=task)
+    assert (first['units'], first['done'], first['failed'], first['skipped']) == (6, 4, 2, 0)
+    assert first['rows'] == 40 and first['bytes'] == 4000 and first['units_per_minute'] > 0
+
+    flaky.clear()
+    calls.clear()
+    second = run_sweep(targets, dates, scraper=FakeScraper(), queue=queue, name='s', workers=3, task=task)
+    assert sorted(calls) == [('2025-10-21', '1'), ('2025-10-21', '2')]  # only the failed units again
+    assert (second['done'], second['failed'], second['skipped'], second['remaining']) == (2, 0, 4, 0)
+
+
+def test_scope_lookups_stay_on_one_thread_when_headless(monkeypatch):
+    monkeypatch.setenv('USE_HEADLESS', '1')
+    threads = set()
+
+    class Recording(FakeScraper):
+        def get_dependent_options(self, state=None, district=None, **kw):
+            if district is not None:
+                threads.add(threading.get_ident())
+            return super().get_dependent_options(state, district, **kw)
+
+    assert len(expand_scope(Recording(), '8', workers=8)) == 3
+    assert len(threads) == 1
@@ -0,0 +1,78 @@
+from ecourts_scraper.latency import AdaptiveTimeouts, endpoint_key, size_class
+from ecourts_scraper.scheduling import RequestScheduler
+from ecourts_scraper.scraper import ECourtsScraper
+
+
+class Response:
+    status_code = 200
+    text = '<html></html>'
+
+    def __init__(self, size):
+        self.headers = {'content-length': str(size)}
+
+
+class RecordingSession:
+    headers = {}
+
+    def __init__(self, size=2000):
+        self.size = size
+        self.timeouts = []
+
+    def get(self, url, params=None, timeout=None, stream=False):
+        self.timeouts.append(timeout)
+        return Response(self.size)
+
+    post = get
+
+
+def test_endpoint_keys():
+    base = 'https://services.ecourts.gov.in/ecourtindia_v6/'
+    assert endpoint_key(base, {'p': 'cause_list/'}) == 'services.ecourts.gov.in/ecourtindia_v6/?p=cause_list/'
+    assert endpoint_key(base + '?p=casestatus/fillDistrict') == \
+        'services.ecourts.gov.in/ecourtindia_v6/?p=casestatus/fillDistrict'
+    assert endpoint_key('https://h/cl/2025/judge_7.PDF') == endpoint_key('https://h/cl/2025/judge_1.pdf') == 'h/cl/2025/*.pdf'
+    assert [size_class(n) for n in (None, 10, 100_000, 5_000_000)] == [None, 'small', 'medium', 'large']
+
+
+def test_timeouts_follow_latency_within_bounds():
+    t = AdaptiveTimeouts()
+    assert t.timeout('a', 15) == 15  # nothing learned yet
+    for _ in range(50):
+        t.record('a', 0.05, size=3000)
+        t.record('pdf', 90.0, size=8_000_000)
+        t.record('slow', 4.0)
+    assert t.timeout('a', 15) == (1.0, 2.0)  # floors: fail fast when a tiny endpoint hangs
+    assert t.timeout('pdf', 30) == (10.0, 120.0)  # ceilings
+    assert t.timeout('slow', 15) == (8.0, 12.0)
+
+
+def test_timeouts_grow_when_a_small_endpoint_slows():
+    t = AdaptiveTimeouts()
+    for _ in range(50):
+        t.record('a', 0.05, size=3000)
+    assert t.timeout('a', 15)[1] == 2.0
+    for _ in range(200):
+        t.record('a', 2.0)  # timed out: no size
+    assert t.timeout('a', 15)[1] == 6.0
+
+
+def test_scraper_uses_learned_timeouts():
+    session = RecordingSession()
+    scraper = ECourtsScraper(session=session, scheduler=RequestScheduler(rate=0))
+    for _ in range(25):
+        scraper.get_cause_list_page()
+    assert session.timeouts[0] == 15
+    assert session.timeouts[-1] == (1.0, 2.0)
+    # the deadline still wins over a learned timeout
+    with scraper.deadline(0.5):
+        scraper.get_cause_list_page()
+    assert max(session.timeouts[-1]) <= 0.5
+
+
+def test_adaptive_timeouts_can_be_disabled(monkeypatch):
+    monkeypatch.setenv('ECOURTS_ADAPTIVE_TIMEOUTS', '0')
+    session = RecordingSession()
+    scraper = ECourtsScraper(session=session, scheduler=RequestScheduler(rate=0))
+    for _ in range(25):
+        scraper.get_cause_list_page()
+    assert set(session.timeouts) == {15}
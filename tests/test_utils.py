@@ -8,3 +8,45 @@ def test_save_and_load(tmp_path):
     save_json(data, str(p))
     got = load_json(str(p))
     assert got == data
+
+
+def test_archive_roundtrip_is_transparent(tmp_path):
+    from ecourts_scraper.utils import open_archive, read_archive_text, compress_archive
+    raw = tmp_path / 'causelist.html'
+    raw.write_text('<table><tr><td>1</td></tr></table>' * 50, encoding='utf-8')
+    gz = compress_archive(str(raw), 'gz')
+    assert gz.endswith('.gz')
+    assert os.path.getsize(gz) < os.path.getsize(raw)
+    assert read_archive_text(gz) == raw.read_text(encoding='utf-8')
+    # plain files read through the same helper unchanged
+    with open_archive(str(raw)) as f:
+        assert f.read() == raw.read_bytes()
+
+
+def test_record_writer_streams_and_appends(tmp_path):
+    import pytest
+    from ecourts_scraper.utils import RecordWriter, iter_records, read_archive_text
+    from ecourts_scraper.models import CauseListRow
+    out = str(tmp_path / 'rows.jsonl.gz')
+    with RecordWriter(out, fsync_every=1) as w:
+        w.write(CauseListRow.make(['1', 'Cr. 1/2024'], serial='1'))
+    with RecordWriter(out, append=True) as w:
+        w.write_many({'cols': [str(i)], 'serial': str(i)} for i in range(2, 4))
+    assert [r['serial'] for r in iter_records(out)] == ['1', '2', '3']
+
+    csv_path = str(tmp_path / 'rows.csv')
+    with RecordWriter(csv_path) as w:
+        w.write({'serial': '1', 'cols': ['1', 'Cr. 1/2024']})
+    with RecordWriter(csv_path, append=True) as w:
+        w.write({'cols': ['2'], 'serial': '2'})
+    assert read_archive_text(csv_path).splitlines() == ['serial,cols', '1,1 | Cr. 1/2024', '2,2']
+
+    with pytest.raises(ValueError):
+        RecordWriter(str(tmp_path / 'rows.json'), append=True)
+
+
+def test_part_path_keeps_the_archive_suffix():
+    from ecourts_scraper.utils import part_path
+    assert part_path('a/causelist.html.gz') == 'a/causelist.html.part.gz'
+    assert part_path('a/causelist.html.zst') == 'a/causelist.html.part.zst'
+    assert part_path('a/causelist.html') == 'a/causelist.html.part'
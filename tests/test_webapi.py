@@ -0,0 +1,79 @@
+import gzip
+import json
+
+from ecourts_scraper import webapi
+
+
+def test_hierarchy_bundle_etag_and_gzip(monkeypatch):
+    def fake_options(state=None, district=None, **kw):
+        if district is None:
+            return {'options': {'sees_dist_code': [('', 'Select District'), ('26', 'Patna')]}, 'html': 'x' * 5000}
+        return {'options': {'court_complex_code': [('0', 'Select'), ('1', 'Civil Court ' + 'x' * 2000)],
+                            'CL_court_no': [('3', 'Court 3')]}, 'html': 'y' * 5000}
+
+    monkeypatch.setattr(webapi.get_scraper(), 'get_dependent_options', fake_options)
+    webapi._hierarchy_cache.clear()
+    client = webapi.app.test_client()
+
+    res = client.get('/api/hierarchy?state=8')
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data['districts'] == [{'v': '26', 't': 'Patna', 'complexes': [['1', 'Civil Court ' + 'x' * 2000]],
+                                  'courts': [['3', 'Court 3']]}]
+    assert 'debug_html' not in res.get_data(as_text=True)
+
+    etag = res.headers['ETag']
+    assert client.get('/api/hierarchy?state=8', headers={'If-None-Match': etag}).status_code == 304
+
+    zipped = client.get('/api/hierarchy?state=8', headers={'Accept-Encoding': 'gzip'})
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(zipped.get_data())) == data
+    # each content-coding has its own strong validator, and both revalidate
+    gz_etag = zipped.headers['ETag']
+    assert gz_etag == etag[:-1] + '-gz"'
+    revalidated = client.get('/api/hierarchy?state=8', headers={'If-None-Match': gz_etag, 'Accept-Encoding': 'gzip'})
+    assert revalidated.status_code == 304 and revalidated.headers['ETag'] == gz_etag
+
+
+def test_debug_html_only_on_request(monkeypatch):
+    monkeypatch.setattr(webapi.get_scraper(), 'get_dependent_options',
+                        lambda **kw: {'options': {}, 'html': '<html>upstream</html>'})
+    client = webapi.app.test_client()
+    assert 'debug_html' not in client.get('/api/complexes?state=8&district=26').get_json()
+    assert client.get('/api/complexes?state=8&district=26&debug=1').get_json()['debug_html'] == '<html>upstream</html>'
+
+
+def test_hierarchy_lookups_stay_on_one_thread_when_headless(monkeypatch):
+    import threading
+    threads = set()
+
+    def fake_options(state=None, district=None, **kw):
+        if district is not None:
+            threads.add(threading.get_ident())
+        if district is None:
+            return {'options': {'sees_dist_code': [('26', 'Patna'), ('27', 'Gaya'), ('28', 'Nalanda')]}}
+        return {'options': {}}
+
+    monkeypatch.setenv('USE_HEADLESS', '1')
+    monkeypatch.setattr(webapi.get_scraper(), 'get_dependent_options', fake_options)
+    assert len(webapi.build_hierarchy('8')['districts']) == 3
+    assert len(threads) == 1
+
+
+def test_hierarchy_districts_share_the_callers_deadline(monkeypatch):
+    import time
+    seen = []
+
+    def fake_options(state=None, district=None, **kw):
+        if district is None:
+            return {'options': {'sees_dist_code': [(str(i), f'D{i}') for i in range(1, 9)]}}
+        seen.append(webapi.get_scraper().remaining())
+        time.sleep(0.05)
+        return {'options': {}}
+
+    monkeypatch.delenv('USE_HEADLESS', raising=False)
+    monkeypatch.setattr(webapi.get_scraper(), 'get_dependent_options', fake_options)
+    with webapi.get_scraper().deadline(1.0):
+        webapi.build_hierarchy('8')
+    # later districts get what is left of the same budget, not a fresh one
+    assert len(seen) == 8 and None not in seen and min(seen) < 0.96